@@ -0,0 +1,67 @@
+"""Admission control for API routes: per-client rate limits and DB-load shedding.
+
+Runs as router dependencies rather than ASGI middleware: the matched route
+template is known there, and rejected requests never open a session.
+"""
+import math
+import random
+import secrets
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.ratelimit import Limit, load_backend
+from app.db.pool import pool_wait
+
+RATE_LIMITED = Counter("rate_limited_requests_total", "Requests rejected with 429.", ["route_class"])
+LOAD_SHED = Counter("load_shed_requests_total", "Requests rejected with 503 because the DB pool is saturated.")
+
+_backend = load_backend(settings.rate_limit_backend)
+_limits = {name: Limit(rate, burst) for name, (rate, burst) in settings.rate_limits.items()}
+
+
+def _route_class(request: Request) -> str:
+    route = request.scope.get("route")
+    route_class = settings.rate_limit_routes.get(f"{request.method} {route.path if route else request.url.path}")
+    if route_class:
+        return route_class
+    return "read" if request.method in ("GET", "HEAD", "OPTIONS") else "write"
+
+
+def _client_key(request: Request) -> str:
+    # Only configured keys: an unchecked header would let a client reset its bucket with every new value.
+    api_key = request.headers.get("x-api-key", "").encode()
+    if api_key and any(secrets.compare_digest(api_key, known.encode()) for known in settings.rate_limit_api_keys):
+        return f"key:{api_key.decode()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def rate_limit(request: Request) -> None:
+    route_class = _route_class(request)
+    limit = _limits.get(route_class)
+    if limit is None:
+        return
+    retry_after = await _backend.acquire(f"{_client_key(request)}:{route_class}", limit)
+    if retry_after > 0:
+        RATE_LIMITED.labels(route_class).inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def shed_load(request: Request) -> None:
+    threshold = settings.load_shed_pool_wait_ms / 1000
+    wait = pool_wait.current()
+    if not threshold or wait <= threshold:
+        return
+    # Shed proportionally to the overload so admission ramps instead of flapping on/off.
+    if random.random() < min(1.0, (wait - threshold) / threshold):
+        LOAD_SHED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service overloaded, retry later",
+            headers={"Retry-After": str(settings.load_shed_retry_after)},
+        )
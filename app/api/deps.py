@@ -1,17 +1,40 @@
 """FastAPI dependencies: session and service factories."""
+import secrets
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_async_session
+from app.core.config import settings
+from app.db.session import session_scope
+from app.services.archive_service import ArchiveService
 from app.services.category_service import CategoryService
 from app.services.client_service import ClientService
+from app.services.event_service import EventService
+from app.services.job_service import JobService
 from app.services.order_service import OrderService
 from app.services.product_service import ProductService
+from app.services.warehouse_service import WarehouseService
 
 
-SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_request_session(
+    request: Request, x_tenant_id: Annotated[int | None, Header()] = None
+) -> AsyncGenerator[AsyncSession]:
+    """Safe methods get an autocommit read-only session; others a committing one.
+
+    X-Tenant-Id selects the tenant's shard and is stamped on orders created in the session.
+    """
+    async with session_scope(
+        read_only=request.method in READ_ONLY_METHODS, tenant_id=x_tenant_id
+    ) as session:
+        yield session
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_request_session)]
 
 
 def get_category_service(db: SessionDep) -> CategoryService:
@@ -28,3 +51,30 @@ def get_client_service(db: SessionDep) -> ClientService:
 
 def get_order_service(db: SessionDep) -> OrderService:
     return OrderService(db)
+
+
+def get_event_service(db: SessionDep) -> EventService:
+    return EventService(db)
+
+
+def get_job_service(db: SessionDep) -> JobService:
+    return JobService(db)
+
+
+def get_warehouse_service(db: SessionDep) -> WarehouseService:
+    return WarehouseService(db)
+
+
+def get_archive_service(db: SessionDep) -> ArchiveService:
+    return ArchiveService(db)
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    # Bytes: compare_digest rejects non-ASCII str, and headers can carry any latin-1 text.
+    if not settings.admin_token or not secrets.compare_digest(
+        (x_admin_token or "").encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.lifecycle import lifecycle
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving the event loop."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness():
+    """Warm and accepting traffic; 503 while starting up or draining for shutdown."""
+    return JSONResponse(
+        {"status": lifecycle.status},
+        status_code=200 if lifecycle.status == "ready" else 503,
+    )
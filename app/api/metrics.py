@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics, multiprocess
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint (all workers' values when several share the port)."""
+    data = metrics.merge(d["metrics"] for d in multiprocess.collect()) if multiprocess.enabled() else None
+    return PlainTextResponse(metrics.render(data), media_type="text/plain; version=0.0.4")
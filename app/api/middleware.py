@@ -0,0 +1,71 @@
+"""ASGI middleware."""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.db import query_stats
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {route.path if route else scope['path']}"
+
+
+class MetricsMiddleware:
+    """Request latency per route template and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up cardinality.
+            metrics.HTTP_REQUEST_DURATION.labels(
+                scope["method"], route.path if route else "<unmatched>", str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements per request and reports them in a `Server-Timing` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with query_stats.track(f"{scope['method']} {scope['path']}") as stats:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                stats.label = _route_label(scope)
+                query_stats.finish(stats)
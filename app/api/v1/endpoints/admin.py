@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+
+from app.api.deps import get_archive_service, require_admin
+from app.core import multiprocess
+from app.core.enums import ArchivedEntity
+from app.db import slow_queries
+from app.schemas.admin import RestoreResponse, SlowQueryResponse
+from app.schemas.job import JobResponse
+from app.services.archive_service import ArchiveService
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    with_plan: bool = Query(False, description="Only statements with a captured plan"),
+):
+    """Most recent statements over the slow-query threshold (of every worker), newest first."""
+    if multiprocess.enabled():
+        entries = [entry for data in multiprocess.collect() for entry in data.get("slow_queries", ())]
+    else:
+        entries = slow_queries.snapshot()
+    entries.sort(key=lambda entry: entry["captured_at"], reverse=True)
+    return [entry for entry in entries if entry["plan"] or not with_plan][:limit]
+
+
+@router.post("/archive", response_model=JobResponse, status_code=202)
+async def archive_soft_deleted(
+    request: Request,
+    response: Response,
+    service: ArchiveService = Depends(get_archive_service)
+):
+    """Start moving rows soft-deleted longer than ARCHIVE_RETENTION_DAYS to the archive tables."""
+    job = await service.enqueue_archival()
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return job
+
+
+@router.post("/archive/{entity}/{item_id}/restore", response_model=RestoreResponse)
+async def restore_archived(
+    entity: ArchivedEntity,
+    item_id: int,
+    service: ArchiveService = Depends(get_archive_service)
+):
+    """Move an archived row back to its table and undelete it."""
+    return RestoreResponse(restored=await service.restore(entity, item_id))
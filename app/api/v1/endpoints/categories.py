@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from app.api.deps import get_category_service
 from app.schemas.category import CategoryCreate, CategoryResponse, CategoryTreeResponse
@@ -48,13 +48,23 @@ async def get_category_children(
     return await service.get_category_children(category_id)
 
 
-@router.patch("/{category_id}", response_model=CategoryResponse)
+@router.patch(
+    "/{category_id}",
+    response_model=CategoryResponse,
+    responses={202: {"description": "Moved; descendants are re-rooted by the job in the Location header"}},
+)
 async def update_category(
     category_id: int,
     data: CategoryCreate,
+    request: Request,
+    response: Response,
     service: CategoryService = Depends(get_category_service)
 ):
-    return await service.update_category(category_id, data)
+    category, job = await service.update_category(category_id, data)
+    if job is not None:
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return category
 
 
 @router.delete("/{category_id}", status_code=204)
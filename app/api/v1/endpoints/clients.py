@@ -1,7 +1,14 @@
 from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_client_service
-from app.schemas.client import ClientCreate, ClientResponse, ClientUpdate
+from app.schemas.client import (
+    ClientCreate,
+    ClientFilters,
+    ClientResponse,
+    ClientSummaryResponse,
+    ClientUpdate,
+)
+from app.schemas.order import OrderResponse
 from app.services.client_service import ClientService
 
 
@@ -20,9 +27,16 @@ async def create_client(
 async def get_clients(
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    filters: ClientFilters = Depends(),
+    sort: str | None = Query(None, description="Comma-separated keys, \"-\" for descending, e.g. -created_at"),
+    ids: list[int] | None = Query(
+        None, max_length=100, description="Fetch these ids in one call (other list parameters are ignored)"
+    ),
     service: ClientService = Depends(get_client_service)
 ):
-    return await service.get_clients(offset, limit)
+    if ids:
+        return await service.get_clients_by_ids(ids)
+    return await service.get_clients(offset, limit, filters, sort)
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
@@ -33,6 +47,27 @@ async def get_client(
     return await service.get_client(client_id)
 
 
+@router.get("/{client_id}/orders", response_model=list[OrderResponse])
+async def get_client_orders(
+    client_id: int,
+    after_id: int | None = Query(None, description="Last order id of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    service: ClientService = Depends(get_client_service)
+):
+    """Client's order history, newest first."""
+    orders = await service.get_client_orders(client_id, after_id, limit)
+    return [OrderResponse.from_order(order) for order in orders]
+
+
+@router.get("/{client_id}/summary", response_model=ClientSummaryResponse)
+async def get_client_summary(
+    client_id: int,
+    service: ClientService = Depends(get_client_service)
+):
+    """Order count, lifetime spend and last order date."""
+    return await service.get_client_summary(client_id)
+
+
 @router.patch("/{client_id}", response_model=ClientResponse)
 async def update_client(
     client_id: int,
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Query
+
+from app.core import multiprocess
+from app.db import query_stats
+from app.schemas.debug import QueryStatsResponse
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/queries", response_model=list[QueryStatsResponse])
+async def get_recent_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    n_plus_one: bool = Query(False, description="Only requests with repeated statements"),
+):
+    """SQL statistics of the most recent requests (of every worker), newest first."""
+    if multiprocess.enabled():
+        entries = [entry for data in multiprocess.collect() for entry in data.get("queries", ())]
+    else:
+        entries = query_stats.snapshot()
+    entries.sort(key=lambda entry: entry["finished_at"], reverse=True)
+    return [entry for entry in entries if entry["repeated"] or not n_plus_one][:limit]
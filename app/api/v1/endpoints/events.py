@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_event_service
+from app.core.config import settings
+from app.schemas.event import EventResponse
+from app.services.event_service import EventService
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@router.get("/", response_model=list[EventResponse])
+async def get_events(
+    after: int = Query(0, ge=0, description="Return events with a position greater than this"),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=settings.events_max_wait, description="Long-poll timeout, seconds"),
+    service: EventService = Depends(get_event_service)
+):
+    """Tail order and stock change events incrementally."""
+    return await service.get_events(after, limit, wait)
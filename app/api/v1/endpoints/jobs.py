@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_job_service
+from app.schemas.job import JobResponse
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    service: JobService = Depends(get_job_service)
+):
+    return await service.get_job(job_id)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_order_service
 from app.core.enums import OrderStatus
-from app.schemas.order import OrderProductAdd, OrderProductAddBatch, OrderResponse
+from app.schemas.order import OrderFilters, OrderProductAdd, OrderProductAddBatch, OrderResponse
 from app.services.order_service import OrderService
 
 
@@ -22,9 +22,17 @@ async def create_order(
 async def get_orders(
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    filters: OrderFilters = Depends(),
+    sort: str | None = Query(None, description="Comma-separated keys, \"-\" for descending, e.g. -created_at"),
+    ids: list[int] | None = Query(
+        None, max_length=100, description="Fetch these ids in one call (other list parameters are ignored)"
+    ),
     service: OrderService = Depends(get_order_service)
 ):
-    orders = await service.get_orders(offset, limit)
+    if ids:
+        orders = await service.get_orders_by_ids(ids)
+    else:
+        orders = await service.get_orders(offset, limit, filters, sort)
     return [OrderResponse.from_order(order) for order in orders]
 
 
@@ -1,7 +1,20 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_product_service
-from app.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from app.schemas.product import (
+    PriceImportResult,
+    PriceListImport,
+    ProductCreate,
+    ProductFilters,
+    ProductPricePage,
+    ProductPriceResponse,
+    ProductResponse,
+    ProductSearchPage,
+    ProductUpdate,
+)
+from app.schemas.stock import StockLevelResponse, StockLevelUpdate
 from app.services.product_service import ProductService
 
 
@@ -20,9 +33,86 @@ async def create_product(
 async def get_products(
     offset: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    filters: ProductFilters = Depends(),
+    sort: str | None = Query(None, description="Comma-separated keys, \"-\" for descending, e.g. -created_at"),
+    ids: list[int] | None = Query(
+        None, max_length=100, description="Fetch these ids in one call (other list parameters are ignored)"
+    ),
+    service: ProductService = Depends(get_product_service)
+):
+    if ids:
+        return await service.get_products_by_ids(ids)
+    return await service.get_products(offset, limit, filters, sort)
+
+
+@router.get("/search", response_model=ProductSearchPage)
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Words of the name, or SKU prefix"),
+    category_id: int | None = Query(None, description="Only this category"),
+    root_category_id: int | None = Query(None, description="Any category under this top-level category"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    service: ProductService = Depends(get_product_service)
+):
+    """Ranked product search by name or SKU."""
+    return await service.search_products(q, category_id, root_category_id, cursor, limit)
+
+
+@router.post("/prices/import", response_model=PriceImportResult)
+async def import_prices(
+    data: PriceListImport,
+    service: ProductService = Depends(get_product_service)
+):
+    """Bulk price list by SKU; each price applies from valid_from until the product's next price."""
+    return await service.import_prices(data)
+
+
+@router.get("/prices/scheduled", response_model=ProductPricePage)
+async def get_price_changes(
+    until: datetime | None = Query(None, description="Only changes taking effect up to this time"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    service: ProductService = Depends(get_product_service)
+):
+    """Upcoming price changes of all products, soonest first."""
+    return await service.get_price_changes(until, cursor, limit)
+
+
+@router.get("/{product_id}/price", response_model=ProductPriceResponse)
+async def get_product_price(
+    product_id: int,
+    at: datetime | None = Query(None, description="Point in time (UTC if no offset); now if omitted"),
+    service: ProductService = Depends(get_product_service)
+):
+    return await service.get_price_at(product_id, at)
+
+
+@router.get("/{product_id}/prices/scheduled", response_model=list[ProductPriceResponse])
+async def get_scheduled_prices(
+    product_id: int,
+    service: ProductService = Depends(get_product_service)
+):
+    return await service.get_scheduled_prices(product_id)
+
+
+@router.get("/{product_id}/stock", response_model=list[StockLevelResponse])
+async def get_stock_levels(
+    product_id: int,
+    service: ProductService = Depends(get_product_service)
+):
+    """Stock of the product per warehouse."""
+    return await service.get_stock_levels(product_id)
+
+
+@router.put("/{product_id}/stock/{warehouse_id}", response_model=StockLevelResponse)
+async def set_stock_level(
+    product_id: int,
+    warehouse_id: int,
+    data: StockLevelUpdate,
     service: ProductService = Depends(get_product_service)
 ):
-    return await service.get_products(offset, limit)
+    """Set units on hand at a warehouse; 409 if fewer than open orders have reserved there."""
+    return await service.set_stock_level(product_id, warehouse_id, data)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
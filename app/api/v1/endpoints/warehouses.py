@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_warehouse_service
+from app.schemas.stock import WarehouseCreate, WarehouseResponse, WarehouseUpdate
+from app.services.warehouse_service import WarehouseService
+
+router = APIRouter(prefix="/warehouses", tags=["Warehouses"])
+
+
+@router.get("/", response_model=list[WarehouseResponse])
+async def get_warehouses(
+    service: WarehouseService = Depends(get_warehouse_service)
+):
+    return await service.get_warehouses()
+
+
+@router.post("/", response_model=WarehouseResponse, status_code=201)
+async def create_warehouse(
+    data: WarehouseCreate,
+    service: WarehouseService = Depends(get_warehouse_service)
+):
+    return await service.create_warehouse(data)
+
+
+@router.patch("/{warehouse_id}", response_model=WarehouseResponse)
+async def update_warehouse(
+    warehouse_id: int,
+    data: WarehouseUpdate,
+    service: WarehouseService = Depends(get_warehouse_service)
+):
+    return await service.update_warehouse(warehouse_id, data)
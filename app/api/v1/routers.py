@@ -1,14 +1,34 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.admission import rate_limit, shed_load
+from app.api.v1.endpoints.admin import router as admin_router
 from app.api.v1.endpoints.categories import router as categories_router
 from app.api.v1.endpoints.clients import router as clients_router
+from app.api.v1.endpoints.debug import router as debug_router
+from app.api.v1.endpoints.events import router as events_router
+from app.api.v1.endpoints.jobs import router as jobs_router
 from app.api.v1.endpoints.orders import router as orders_router
 from app.api.v1.endpoints.products import router as products_router
+from app.api.v1.endpoints.warehouses import router as warehouses_router
+from app.core.config import settings
 
 
-api_v1_router = APIRouter()
+admission = [Depends(shed_load)]
+if settings.rate_limit_enabled:
+    admission.append(Depends(rate_limit))
+
+api_v1_router = APIRouter(dependencies=admission)
 
 api_v1_router.include_router(categories_router)
 api_v1_router.include_router(clients_router)
+api_v1_router.include_router(events_router)
+api_v1_router.include_router(jobs_router)
 api_v1_router.include_router(orders_router)
 api_v1_router.include_router(products_router)
+api_v1_router.include_router(warehouses_router)
+
+if settings.admin_token:
+    api_v1_router.include_router(admin_router)
+
+if settings.debug and settings.query_stats_enabled:
+    api_v1_router.include_router(debug_router)
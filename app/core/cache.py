@@ -0,0 +1,115 @@
+"""Per-process caches for hot, rarely changing reads."""
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+from app.core.metrics import CACHE_REQUESTS
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+MISSING: Final = object()
+
+_caches: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """Small LRU cache with per-entry expiry. Values must not be tied to a session.
+
+    Entries are shared by every request in the worker; mutations clear the
+    affected keys after commit, the TTL bounds staleness across workers.
+
+    stale_ttl: how long past its TTL an entry may still be served by get_or_load
+    while one request reloads it.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024, stale_ttl: float = 0.0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        # key -> (expires, stale until, value), monotonic times
+        self._data: OrderedDict[Any, tuple[float, float, Any]] = OrderedDict()
+        self._loads = SingleFlight(name)
+        # Bumped by pop/clear: a load started before an invalidation must not store its result.
+        self._generation = 0
+        self._hits = CACHE_REQUESTS.labels(name, "hit")
+        self._stale_hits = CACHE_REQUESTS.labels(name, "stale")
+        self._misses = CACHE_REQUESTS.labels(name, "miss")
+        _caches[name] = self
+
+    def get(self, key: Any) -> Any:
+        """Cached value, or MISSING."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._misses.inc()
+            return MISSING
+        self._data.move_to_end(key)
+        self._hits.inc()
+        return entry[2]
+
+    async def get_or_load(
+        self, key: Any, load: Callable[[], Awaitable[Any]], timeout: float | None = None
+    ) -> Any:
+        """Cached value, loading it on a miss. Concurrent misses for a key share one load.
+
+        Within stale_ttl after expiry, the first caller reloads while the others get the
+        stale value at once; if the reload fails, the stale value is served. Exceptions
+        from a load without a stale value reach every waiting caller and nothing is cached.
+        timeout: how long to wait for another caller's load (then TimeoutError).
+        """
+        entry = self._data.get(key)
+        now = time.monotonic()
+        if entry is not None and now <= entry[0]:
+            self._data.move_to_end(key)
+            self._hits.inc()
+            return entry[2]
+        if entry is not None and now <= entry[1]:
+            self._stale_hits.inc()
+            if self._loads.in_flight(key):
+                return entry[2]
+            try:
+                return await self._loads.do(key, lambda: self._load(key, load))
+            except Exception:
+                logger.exception("Reloading %s[%r] failed; serving the stale value", self.name, key)
+                return entry[2]
+        self._misses.inc()
+        return await self._loads.do(key, lambda: self._load(key, load), timeout)
+
+    async def _load(self, key: Any, load: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        value = await load()
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        expires = time.monotonic() + self.ttl
+        self._data[key] = (expires, expires + self.stale_ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._data.pop(key, None)
+        self._loads.forget(key)
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._loads.forget()
+        self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def get_cache(name: str) -> TTLCache | None:
+    return _caches.get(name)
+
+
+def clear_all() -> None:
+    for cache in _caches.values():
+        cache.clear()
@@ -1,9 +1,8 @@
 """Application configuration settings."""
-from dotenv import load_dotenv
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
+import os
 
-load_dotenv(override=True)
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -19,6 +18,182 @@ class Settings(BaseSettings):
     db_password: str
     db_port: int = 5435
     db_username: str
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    # Connections one instance (all its workers) may open to each database: split evenly into
+    # per-worker pools without overflow, after each worker's side connections (db_side_connections).
+    # 0 = unbounded: db_pool_size + db_max_overflow per worker, however many workers there are.
+    db_max_connections: int = 40
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+
+    # SHARDING / IDS:
+    # Generate order and order line ids in-app (time-ordered 64-bit) instead of from sequences.
+    snowflake_ids: bool = False
+    # Node id leases (app.db.ids) expire this many seconds after their last renewal.
+    snowflake_node_lease_ttl: float = 60.0
+    # Additional databases by shard name; the "default" shard is the DB_* database above.
+    db_shards: dict[str, str] = {}
+    # Tenant id (X-Tenant-Id header) -> shard name; unlisted tenants live on the default shard.
+    tenant_shards: dict[int, str] = {}
+    default_tenant_id: int = 0
+
+    # SERVER (python -m app.server):
+    web_host: str = "0.0.0.0"
+    web_port: int = 8000
+    # 0 = one worker per available CPU.
+    web_workers: int = 0
+    web_keepalive_timeout: int = 5
+    web_backlog: int = 2048
+    # Seconds to finish in-flight requests after the drain delay, before tasks are cancelled.
+    web_graceful_timeout: int = 30
+    # Recycle a worker after this many requests (0 = never); bounds slow memory growth.
+    web_max_requests: int = 0
+    web_access_log: bool = False
+
+    # LIFESPAN:
+    # Connections opened at startup so first requests skip connect + type introspection.
+    db_pool_warm_connections: int = 5
+    # Startup waits this long for warm-up; past it the app serves cold and keeps retrying.
+    startup_warm_up_timeout: float = 30.0
+    # After SIGTERM, readiness reports 503 this long before the server stops accepting,
+    # so the load balancer drains the pod first.
+    shutdown_drain_delay: float = 5.0
+
+    # CACHES:
+    category_tree_cache_ttl: float = 60.0
+    # After the TTL, an entry is served this much longer while one request reloads it.
+    category_tree_cache_stale_ttl: float = 300.0
+    # GET /products/{id}; available quantity is included, so keep the TTL short.
+    product_cache_ttl: float = 5.0
+    product_cache_stale_ttl: float = 30.0
+    product_cache_size: int = 10_000
+    client_cache_ttl: float = 30.0
+    client_cache_stale_ttl: float = 60.0
+    client_cache_size: int = 10_000
+    # Longest a request waits for a load another request started (then 503).
+    cache_load_timeout: float = 5.0
+    # Evict cache keys in every worker on commit (Postgres LISTEN/NOTIFY); TTLs then only bound listener outages.
+    cache_invalidation_enabled: bool = True
+    cache_invalidation_keepalive: float = 30.0
+    cache_invalidation_reconnect_interval: float = 2.0
+
+    # OUTBOX / EVENTS:
+    outbox_relay_batch_size: int = 500
+    outbox_relay_poll_interval: float = 1.0
+    # Dotted paths of EventSink classes the relay publishes to.
+    outbox_sinks: list[str] = ["app.events.sinks.LoggingSink"]
+    events_poll_interval: float = 0.5
+    events_max_wait: float = 30.0
+
+    # JOBS:
+    # Run a job worker inside each API process; otherwise run `python -m app.jobs.worker`.
+    jobs_worker_in_process: bool = False
+    # Jobs one worker runs concurrently (each holds a pooled connection while running).
+    jobs_concurrency: int = 2
+    jobs_poll_interval: float = 1.0
+    jobs_max_attempts: int = 5
+    # Retry delay: jobs_retry_backoff * 2 ** (attempt - 1), capped, with jitter.
+    jobs_retry_backoff: float = 5.0
+    jobs_retry_backoff_max: float = 600.0
+    # A running job not finished within this many seconds is presumed abandoned and claimed again.
+    jobs_lock_timeout: float = 900.0
+    category_subtree_batch_size: int = 1000
+
+    # STOCK:
+    # Warehouse that ProductCreate/ProductUpdate.quantity refers to (created by migration 12).
+    default_warehouse_id: int = 1
+    # Seconds between passes evening out striped products' stock (products.stock_stripes > 1); 0: off.
+    # Every process runs the loop; an advisory lock lets one pass through at a time.
+    stock_rebalance_interval: float = 10.0
+
+    # ARCHIVE:
+    # Soft-deleted clients, products and categories older than this move to *_archive tables.
+    archive_retention_days: int = 90
+    # Rows moved per transaction by the archival job.
+    archive_batch_size: int = 1000
+
+    # ADMIN:
+    # Shared secret for /api/v1/admin (X-Admin-Token header); admin API is off when unset.
+    admin_token: str | None = None
+
+    # ADMISSION CONTROL:
+    rate_limit_enabled: bool = True
+    # Dotted path of a RateLimitBackend; the default keeps buckets per worker process.
+    rate_limit_backend: str = "app.core.ratelimit.InMemoryBackend"
+    # API keys that get their own buckets (X-API-Key header); any other request is limited by client IP.
+    rate_limit_api_keys: list[str] = []
+    # Route class -> [requests per second, burst], per client (known API key, else IP).
+    rate_limits: dict[str, tuple[float, int]] = {
+        "read": (50, 100),
+        "write": (20, 40),
+        "heavy": (2, 5),
+        "batch": (2, 5),
+    }
+    # "METHOD /route/template" -> route class; unlisted routes are "read" (safe methods) or "write".
+    rate_limit_routes: dict[str, str] = {
+        "GET /api/v1/categories/roots": "heavy",
+        "GET /api/v1/products/search": "heavy",
+        "POST /api/v1/orders/{order_id}/items/batch": "batch",
+    }
+    # Shed requests with 503 while the average pool checkout wait is above this (0 = off).
+    load_shed_pool_wait_ms: float = 250.0
+    load_shed_retry_after: int = 2
+
+    # METRICS:
+    # Prometheus endpoint at /metrics plus request/service latency histograms.
+    metrics_enabled: bool = True
+    # Directory where each worker writes its metrics and debug buffers for the others to merge.
+    # app.server creates a fresh one when running several workers and none is set.
+    metrics_multiprocess_dir: str = ""
+    metrics_flush_interval: float = 5.0
+
+    # QUERY STATS:
+    # Per-request statement count / DB time (Server-Timing header, N+1 warnings).
+    query_stats_enabled: bool = True
+    query_stats_history: int = 200
+    # Same statement this many times in one request is reported as N+1.
+    query_n_plus_one_threshold: int = 5
+
+    # SLOW QUERIES:
+    slow_query_threshold_ms: float = 200.0
+    slow_query_history: int = 100
+    # Parameters may carry personal data (emails, names); enable for debugging only.
+    slow_query_log_parameters: bool = False
+    # Share of slow SELECTs explained in the background; ANALYZE only for side-effect-free ones.
+    slow_query_explain_sample_rate: float = 0.1
+    slow_query_explain_timeout_ms: int = 10_000
+
+    @model_validator(mode="after")
+    def _check_shards(self) -> "Settings":
+        if self.db_shards and not self.snowflake_ids:
+            raise ValueError("DB_SHARDS requires SNOWFLAKE_IDS=true: sequence ids repeat across shards")
+        unknown = set(self.tenant_shards.values()) - {"default", *self.db_shards}
+        if unknown:
+            raise ValueError(f"TENANT_SHARDS names shards missing from DB_SHARDS: {', '.join(sorted(unknown))}")
+        return self
+
+    @property
+    def worker_count(self) -> int:
+        if self.web_workers > 0:
+            return self.web_workers
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except AttributeError:
+            return os.cpu_count() or 1
+
+    @property
+    def db_side_connections(self) -> int:
+        """Connections a worker holds outside its pool: the cache invalidation LISTEN connection."""
+        return 1 if self.cache_invalidation_enabled else 0
+
+    @property
+    def db_pool_limits(self) -> tuple[int, int]:
+        """(pool_size, max_overflow) for this worker process."""
+        if self.db_max_connections > 0:
+            share = self.db_max_connections // self.worker_count - self.db_side_connections
+            return max(1, share), 0
+        return self.db_pool_size, self.db_max_overflow
 
     @property
     def database_url(self) -> str:
@@ -9,3 +9,49 @@ class OrderStatus(StrEnum):
     PAID = "paid"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+
+
+class EventType(StrEnum):
+    """Change events written to the transactional outbox.
+
+    Value prefix (before the dot) is the aggregate type.
+    """
+
+    ORDER_CREATED = "order.created"
+    ORDER_ITEM_ADDED = "order.item_added"
+    ORDER_STATUS_CHANGED = "order.status_changed"
+    ORDER_DELETED = "order.deleted"
+    PRODUCT_CREATED = "product.created"
+    PRODUCT_UPDATED = "product.updated"
+    PRODUCT_DELETED = "product.deleted"
+    PRODUCT_STOCK_CHANGED = "product.stock_changed"
+    PRODUCT_PRICE_SCHEDULED = "product.price_scheduled"
+
+    @property
+    def aggregate_type(self) -> str:
+        return self.value.split(".", 1)[0]
+
+
+class JobStatus(StrEnum):
+    """Background job lifecycle status."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobKind(StrEnum):
+    """Background job types; each has a handler in app.jobs.handlers."""
+
+    CATEGORY_SUBTREE_ROOT = "category.update_subtree_root"
+    ARCHIVE_SOFT_DELETED = "archive.soft_deleted"
+    PRODUCT_PRICES_DUE = "product.apply_due_prices"
+
+
+class ArchivedEntity(StrEnum):
+    """Soft-deletable tables moved to `<table>_archive` after the retention window."""
+
+    CLIENTS = "clients"
+    PRODUCTS = "products"
+    CATEGORIES = "categories"
@@ -0,0 +1,19 @@
+"""Process lifecycle state shared by the lifespan, health checks and long-running handlers."""
+from dataclasses import dataclass
+
+
+@dataclass
+class Lifecycle:
+    # Warm-up finished: pool connections open, caches primed.
+    ready: bool = False
+    # Shutdown requested: stop taking new work, finish what is in flight.
+    draining: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.draining:
+            return "draining"
+        return "ready" if self.ready else "starting"
+
+
+lifecycle = Lifecycle()
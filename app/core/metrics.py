@@ -0,0 +1,300 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Deliberately minimal (no client library): label children are resolved once with
+`labels()` and then updated with plain attribute arithmetic, so hot paths pay a
+dict lookup at most. Values live in the worker process that recorded them. With
+several workers behind one port, each one also writes `snapshot()` to a shared
+directory and the scraped worker merges them (`app.core.multiprocess`).
+"""
+import functools
+import inspect
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+LabelValues = tuple[str, ...]
+# {metric name: [[label values, state], ...]}: JSON-serializable metric values of one or more processes.
+Snapshot = dict[str, list]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    type = ""
+    # Computed from other metrics at render time, never snapshotted.
+    derived = False
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[LabelValues, object] = {}
+        if not self.labelnames:
+            self.labels()
+        _registry.append(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A child holding the values of one label combination."""
+
+    @abstractmethod
+    def state(self) -> dict[LabelValues, Any]:
+        """Current value of each child, JSON-serializable."""
+
+    @staticmethod
+    def merge(a: Any, b: Any) -> Any:
+        """Two processes' states of the same child, combined."""
+        return a + b
+
+    @abstractmethod
+    def _samples(self, children: Mapping[LabelValues, Any]) -> Iterable[str]:
+        """Exposition lines for the given states."""
+
+    def render(self, children: Mapping[LabelValues, Any]) -> str:
+        return "\n".join([
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self._samples(children),
+        ])
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def value(self, *values: str) -> float:
+        child = self._children.get(values)
+        return child.value if child else 0.0
+
+    def state(self):
+        return {values: child.value for values, child in self._children.items()}
+
+    def _samples(self, children):
+        for values, value in children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_number(value)}"
+
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time by `collect` ({label values: value}).
+
+    Values of several processes are summed. `derive` instead computes the values from
+    the merged values of other metrics ({name: {label values: state}}).
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        collect: Callable[[], dict] | None = None,
+        derive: Callable[[Mapping[str, Mapping[LabelValues, Any]]], dict] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+        self.derive = derive
+        self.derived = derive is not None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def state(self):
+        if self.collect:
+            return dict(self.collect())
+        return {values: child.value for values, child in self._children.items()}
+
+    def _samples(self, children):
+        for values, value in children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_number(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def state(self):
+        """[bucket counts, sum, count] per child."""
+        return {values: [list(child.counts), child.sum, child.count] for values, child in self._children.items()}
+
+    @staticmethod
+    def merge(a, b):
+        return [[x + y for x, y in zip(a[0], b[0], strict=True)], a[1] + b[1], a[2] + b[2]]
+
+    def _samples(self, children):
+        for values, (counts, total, count) in children.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, values, f'le="{_format_number(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_number(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def snapshot() -> Snapshot:
+    """This process's metric values."""
+    return {
+        metric.name: [[list(values), state] for values, state in metric.state().items()]
+        for metric in _registry
+        if not metric.derived
+    }
+
+
+def merge(snapshots: Iterable[Snapshot], gauges: bool = True) -> Snapshot:
+    """Metric values of several processes combined; `gauges=False` leaves gauges out (exited processes)."""
+    merged: dict[str, dict[LabelValues, Any]] = {}
+    for data in snapshots:
+        for metric in _registry:
+            if metric.derived or (metric.type == "gauge" and not gauges):
+                continue
+            children = merged.setdefault(metric.name, {})
+            for values, state in data.get(metric.name, ()):
+                key = tuple(values)
+                children[key] = metric.merge(children[key], state) if key in children else state
+    return {name: [[list(values), state] for values, state in children.items()] for name, children in merged.items()}
+
+
+def render(data: Snapshot | None = None) -> str:
+    """Exposition text of `data` (default: this process's values)."""
+    children = {name: {tuple(values): state for values, state in items} for name, items in (data or snapshot()).items()}
+    return "\n".join(
+        metric.render(metric.derive(children) if metric.derived else children.get(metric.name, {}))
+        for metric in _registry
+    ) + "\n"
+
+
+# Application metrics.
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+SERVICE_METHOD_DURATION = Histogram(
+    "service_method_duration_seconds", "Service-layer method latency.", ["service", "method"]
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by result (hit/stale/miss).", ["cache", "result"]
+)
+STOCK_CONFLICTS = Counter(
+    "stock_reservation_conflicts_total", "Order lines rejected because stock could not be reserved.", ["reason"]
+)
+
+
+def _cache_hit_ratios(children: Mapping[str, Mapping[LabelValues, Any]]) -> dict[LabelValues, float]:
+    totals: dict[str, list[float]] = {}
+    for (cache, result), value in children.get(CACHE_REQUESTS.name, {}).items():
+        counts = totals.setdefault(cache, [0.0, 0.0])
+        counts[1] += value
+        if result in ("hit", "stale"):
+            counts[0] += value
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Lifetime hit ratio per cache (hits / lookups).", ["cache"], derive=_cache_hit_ratios
+)
+
+
+def timed_methods(cls: type) -> type:
+    """Class decorator: record latency of every public async method in SERVICE_METHOD_DURATION."""
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(member):
+            continue
+        setattr(cls, name, _timed(member, SERVICE_METHOD_DURATION.labels(cls.__name__, name)))
+    return cls
+
+
+def _timed(fn, histogram: _HistogramChild):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - started)
+    return wrapper
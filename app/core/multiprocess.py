@@ -0,0 +1,136 @@
+"""Metrics and debug buffers shared between the worker processes of one server.
+
+Each worker periodically writes its metric values and its recent query stats / slow
+statements to `<pid>.json` in `metrics_multiprocess_dir`. Whichever worker serves
+/metrics or a debug endpoint merges its own live values with the other workers' files.
+Files of exited workers (recycled after `web_max_requests`, crashed) are folded into
+`dead.json` so their counters and histograms keep counting; their gauges and buffers
+are dropped.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core import metrics
+from app.core.config import settings
+from app.db import query_stats, slow_queries
+
+logger = logging.getLogger(__name__)
+
+_DEAD = "dead.json"
+_LOCK = ".lock"
+
+
+def enabled() -> bool:
+    return bool(settings.metrics_multiprocess_dir)
+
+
+def _directory() -> Path:
+    return Path(settings.metrics_multiprocess_dir)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_json(path: Path, data: dict) -> None:
+    # Readers must never see a half-written file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    with open(_directory() / _LOCK, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def local() -> dict:
+    """This worker's current values."""
+    return {
+        "metrics": metrics.snapshot(),
+        "queries": query_stats.snapshot(),
+        "slow_queries": slow_queries.snapshot(),
+    }
+
+
+def write() -> None:
+    _write_json(_directory() / f"{os.getpid()}.json", local())
+
+
+def _fold_dead(paths: list[Path]) -> dict:
+    """Merge the counters of exited workers into dead.json and remove their files."""
+    dead = _read_json(_directory() / _DEAD) or {"metrics": {}}
+    snapshots = [dead["metrics"]]
+    for path in paths:
+        data = _read_json(path)
+        if data is not None:
+            snapshots.append(data["metrics"])
+    dead = {"metrics": metrics.merge(snapshots, gauges=False)}
+    _write_json(_directory() / _DEAD, dead)
+    for path in paths:
+        path.unlink(missing_ok=True)
+    return dead
+
+
+def collect() -> list[dict]:
+    """Values of every worker: this one's live values, the other live workers' last
+    writes and the folded values of exited workers (metrics only)."""
+    own = os.getpid()
+    result = [local()]
+    dead = []
+    # Locked so that an exited worker's file is never counted both as itself and in dead.json.
+    with _locked():
+        for path in _directory().glob("*.json"):
+            if not path.stem.isdigit() or int(path.stem) == own:
+                continue
+            if not _alive(int(path.stem)):
+                dead.append(path)
+            elif (data := _read_json(path)) is not None:
+                result.append(data)
+        folded = _fold_dead(dead) if dead else _read_json(_directory() / _DEAD)
+    if folded is not None:
+        result.append(folded)
+    return result
+
+
+def prepare(directory: str) -> None:
+    """Remove the files of a previous server run (counters restart with the server)."""
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    for stale in path.glob("*.json"):
+        stale.unlink()
+
+
+async def write_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.metrics_flush_interval)
+        try:
+            write()
+        except OSError:
+            logger.exception("Writing metrics to %s failed", settings.metrics_multiprocess_dir)
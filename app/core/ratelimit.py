@@ -0,0 +1,52 @@
+"""Token-bucket rate limiting with a pluggable state backend."""
+import importlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float  # tokens refilled per second
+    burst: int  # bucket capacity
+
+
+class RateLimitBackend(ABC):
+    """Stores buckets. The in-memory backend limits per worker process; a shared
+    backend (e.g. Redis with an atomic script) makes limits global across instances.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: Limit, cost: float = 1) -> float:
+        """Take `cost` tokens. Returns 0 when allowed, else seconds until enough tokens refill."""
+
+
+class InMemoryBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, monotonic time of last refill)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, limit: Limit, cost: float = 1) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            retry_after = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = (cost - tokens) / limit.rate
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            # Least recently seen clients; a forgotten bucket restarts full, which is harmless.
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+def load_backend(path: str) -> RateLimitBackend:
+    """Instantiate a backend from a dotted path, e.g. "app.core.ratelimit.InMemoryBackend"."""
+    module_name, _, class_name = path.rpartition(".")
+    backend_cls = getattr(importlib.import_module(module_name), class_name)
+    return backend_cls()
@@ -0,0 +1,76 @@
+"""Coalescing of concurrent identical loads within one process (single-flight)."""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.metrics import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "Coalesced loads by role: leader ran the load, follower awaited the leader's result.",
+    ["group", "role"],
+)
+
+
+class _LeaderCancelled(Exception):
+    """The leading request was cancelled (e.g. client disconnect); a follower takes over."""
+
+
+class SingleFlight:
+    """The first caller for a key runs the load; callers arriving meanwhile await its result.
+
+    The load runs in the leader's own task (with the leader's session), so nothing outlives
+    the request that started it. Errors reach every waiter; nothing is remembered after
+    the call completes. If the leader is cancelled, one of its followers runs the load.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._leaders = SINGLEFLIGHT_CALLS.labels(name, "leader")
+        self._followers = SINGLEFLIGHT_CALLS.labels(name, "follower")
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]], timeout: float | None = None) -> Any:
+        """Result of load(), shared with concurrent callers of the same key.
+
+        timeout bounds how long a follower waits for the leader (TimeoutError); the
+        leader itself is not interrupted.
+        """
+        while (future := self._calls.get(key)) is not None:
+            self._followers.inc()
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except _LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._leaders.inc()
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if future.done() and not future.cancelled():
+                future.exception()  # retrieved: no "never retrieved" warning without followers
+
+    def forget(self, key: Hashable | None = None) -> None:
+        """Make later callers start a new load instead of joining the current one
+        (e.g. after a write the current load may not see). None forgets every key.
+        """
+        if key is None:
+            self._calls.clear()
+        else:
+            self._calls.pop(key, None)
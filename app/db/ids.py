@@ -0,0 +1,166 @@
+"""Time-ordered 64-bit ids generated in-app (snowflake layout).
+
+    | 41 bits: ms since EPOCH | 10 bits: node id | 12 bits: sequence |
+
+Ids from different processes never collide as long as their node ids differ, so
+inserts need no shared sequence and rows can move between shards keeping their ids.
+Each process leases a node id in `id_node_leases` on the default database: a lease
+runs for `snowflake_node_lease_ttl` seconds, is renewed well before that and is only
+taken over once it has expired. A process whose lease may have lapsed stops issuing
+ids until it holds one again, so two live processes never share a node id.
+They sort by creation time, so "newest first" by id keeps working.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EPOCH_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    def __init__(self, node_id: int):
+        if not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"node_id must be in 0..{MAX_NODE_ID}")
+        self.node_id = node_id
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms <= self._last_ms:
+                # Same millisecond, or the clock stepped back: continue from the last
+                # timestamp, borrowing the next millisecond when the sequence wraps.
+                now_ms = self._last_ms
+                self._sequence = (self._sequence + 1) & SEQUENCE_MASK
+                if self._sequence == 0:
+                    now_ms += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            timestamp = (now_ms - EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS)
+            return timestamp | (self.node_id << SEQUENCE_BITS) | self._sequence
+
+
+class NodeIdUnavailableError(RuntimeError):
+    """This process holds no valid node id lease."""
+
+
+# Claims are serialized on this advisory lock, so two processes never pick the same free node.
+_CLAIM_LOCK = 0x1D_0DE
+_CLAIM = text("""
+    INSERT INTO id_node_leases (id, holder, expires_at)
+    SELECT node, :holder, now() + make_interval(secs => :ttl)
+    FROM generate_series(0, :max_node) AS node
+    WHERE NOT EXISTS (SELECT 1 FROM id_node_leases l WHERE l.id = node AND l.expires_at > now())
+    ORDER BY node
+    LIMIT 1
+    ON CONFLICT (id) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+    WHERE id_node_leases.expires_at <= now()
+    RETURNING id
+""")
+_RENEW = text("""
+    UPDATE id_node_leases SET expires_at = now() + make_interval(secs => :ttl)
+    WHERE id = :node AND holder = :holder AND expires_at > now()
+    RETURNING id
+""")
+_RELEASE = text("DELETE FROM id_node_leases WHERE id = :node AND holder = :holder")
+
+
+class NodeLease:
+    """This process's node id lease and the generator that issues ids under it."""
+
+    def __init__(self):
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._generator: SnowflakeGenerator | None = None
+        # Monotonic time until which the lease surely holds (measured from before the request).
+        self._valid_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def generator(self) -> SnowflakeGenerator:
+        if self._generator is None or time.monotonic() >= self._valid_until:
+            raise NodeIdUnavailableError("No valid node id lease; snowflake ids are not issued")
+        return self._generator
+
+    async def ensure(self, engine: AsyncEngine) -> None:
+        """Renew the lease once half of it has run out, or claim one if there is none."""
+        ttl = settings.snowflake_node_lease_ttl
+        if self._valid_until - time.monotonic() > ttl / 2:
+            return
+        async with self._lock:
+            if self._valid_until - time.monotonic() > ttl / 2:
+                return
+            started = time.monotonic()
+            node = await self._renew(engine) if self._generator else None
+            if node is None:
+                node = await self._claim(engine)
+                self._generator = SnowflakeGenerator(node)
+                logger.info("Leased snowflake node id %d", node)
+            self._valid_until = started + ttl
+
+    async def _renew(self, engine: AsyncEngine) -> int | None:
+        params = {"node": self._generator.node_id, "holder": self.holder, "ttl": settings.snowflake_node_lease_ttl}
+        async with engine.begin() as conn:
+            node = (await conn.execute(_RENEW, params)).scalar_one_or_none()
+        if node is None:
+            logger.warning("Lease of snowflake node id %d was lost", self._generator.node_id)
+            self._generator = None
+        return node
+
+    async def _claim(self, engine: AsyncEngine) -> int:
+        params = {"holder": self.holder, "ttl": settings.snowflake_node_lease_ttl, "max_node": MAX_NODE_ID}
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CLAIM_LOCK})
+            node = (await conn.execute(_CLAIM, params)).scalar_one_or_none()
+        if node is None:
+            raise NodeIdUnavailableError(f"All {MAX_NODE_ID + 1} node ids are leased")
+        return node
+
+    async def renew_periodically(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.ensure(engine)
+            except Exception:
+                logger.exception("Renewing the snowflake node id lease failed")
+            await asyncio.sleep(settings.snowflake_node_lease_ttl / 4)
+
+    async def release(self, engine: AsyncEngine) -> None:
+        if self._generator is None:
+            return
+        node, self._generator, self._valid_until = self._generator.node_id, None, 0.0
+        async with engine.begin() as conn:
+            await conn.execute(_RELEASE, {"node": node, "holder": self.holder})
+
+
+lease = NodeLease()
+
+
+def _reset_after_fork() -> None:
+    # The child must not issue ids under its parent's node id.
+    global lease
+    lease = NodeLease()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def assign_snowflake_id(mapper, connection, target) -> None:
+    """before_insert hook: give the row a snowflake id (when SNOWFLAKE_IDS is on and none is set)."""
+    if settings.snowflake_ids and target.id is None:
+        target.id = lease.generator().next_id()
@@ -0,0 +1,122 @@
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+Writers queue a notification in their transaction (publish); Postgres delivers it to
+every listening connection on commit and drops it on rollback. Each worker runs one
+InvalidationListener on a dedicated connection and evicts the named cache key.
+Notifications sent while a listener is disconnected are lost, so it flushes every
+cache whenever it (re)connects.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import Hashable
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.config import settings
+from app.core.metrics import Counter
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+
+INVALIDATIONS = Counter(
+    "cache_invalidations_received_total", "Invalidation notifications applied, by cache.", ["cache"]
+)
+LISTENER_CONNECTS = Counter(
+    "cache_invalidation_listener_connects_total", "Listener (re)connections; each one flushes all caches."
+)
+
+
+async def publish(session: AsyncSession, target: cache.TTLCache, key: Hashable | None = None) -> None:
+    """Invalidate `key` (None: the whole cache) in every worker once the session commits.
+
+    Keys travel as JSON, so only str and int keys round-trip.
+    """
+    if not settings.cache_invalidation_enabled:
+        return
+    payload = json.dumps({"cache": target.name, "key": key})
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def _apply(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        target = cache.get_cache(message["cache"])
+        key = message["key"]
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed cache invalidation: %r", payload)
+        return
+    if target is None:
+        return
+    if key is None:
+        target.clear()
+    else:
+        target.pop(key)
+    INVALIDATIONS.labels(target.name).inc()
+
+
+async def _connect() -> "asyncpg.Connection":
+    # Imported here: the driver is only needed once the listener starts, not to import the app.
+    import asyncpg
+
+    return await asyncpg.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_username,
+        password=settings.db_password,
+        database=settings.db_name,
+    )
+
+
+class InvalidationListener:
+    """LISTENs on a dedicated connection (not from the pool) until cancelled.
+
+    An idle LISTEN connection may die without an error; a keepalive query every
+    `keepalive` seconds detects it and triggers a reconnect.
+    """
+
+    def __init__(
+        self,
+        keepalive: float = settings.cache_invalidation_keepalive,
+        reconnect_interval: float = settings.cache_invalidation_reconnect_interval,
+    ):
+        self.keepalive = keepalive
+        self.reconnect_interval = reconnect_interval
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(
+                    "Cache invalidation listener disconnected; reconnecting in %.0fs", self.reconnect_interval
+                )
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def _listen(self) -> None:
+        conn = await _connect()
+        try:
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _: lost.set())
+            await conn.add_listener(CHANNEL, lambda _conn, _pid, _channel, payload: _apply(payload))
+            cache.clear_all()
+            LISTENER_CONNECTS.inc()
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), self.keepalive)
+                except TimeoutError:
+                    await asyncio.wait_for(conn.fetchval("SELECT 1"), self.keepalive)
+            raise ConnectionError("Listener connection closed")
+        finally:
+            if not conn.is_closed():
+                conn.terminate()
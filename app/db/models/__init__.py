@@ -1,15 +1,33 @@
 from app.db.base import Base # noqa: F401
+from app.db.models.archive import categories_archive, clients_archive, products_archive  # noqa: F401
 from app.db.models.category import Category  # noqa: F401
 from app.db.models.client import Client  # noqa: F401
+from app.db.models.client_stats import ClientStats  # noqa: F401
+from app.db.models.id_node_lease import IdNodeLease  # noqa: F401
+from app.db.models.job import Job  # noqa: F401
 from app.db.models.product import Product  # noqa: F401
+from app.db.models.product_price import ProductPrice  # noqa: F401
 from app.db.models.order import Order, OrderProduct  # noqa: F401
+from app.db.models.outbox import OutboxEvent  # noqa: F401
+from app.db.models.stock import StockLevel, StockReservation, Warehouse  # noqa: F401
 
 
 __all__ = (
     "Base",
     "Category",
     "Client",
+    "ClientStats",
+    "IdNodeLease",
+    "Job",
     "Order",
     "OrderProduct",
-    "Product"
+    "OutboxEvent",
+    "Product",
+    "ProductPrice",
+    "StockLevel",
+    "StockReservation",
+    "Warehouse",
+    "categories_archive",
+    "clients_archive",
+    "products_archive",
 )
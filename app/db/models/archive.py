@@ -0,0 +1,41 @@
+"""Archive tables for soft-deleted rows past the retention window.
+
+Same columns as the hot table plus archived_at. There are no foreign keys,
+unique constraints or secondary indexes: archived rows are only read back by id
+on restore. Generated columns (products.search_vector) are left out; Postgres
+recomputes them when a row is restored.
+"""
+from sqlalchemy import Column, DateTime, Table, func
+
+from app.db.base import Base
+from app.db.models.category import Category
+from app.db.models.client import Client
+from app.db.models.product import Product
+
+
+def archive_columns(source: Table) -> list[Column]:
+    """Columns shared by a hot table and its archive, in table order."""
+    return [column for column in source.columns if column.computed is None]
+
+
+def _archive_table(source: Table) -> Table:
+    return Table(
+        f"{source.name}_archive",
+        Base.metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                autoincrement=False,
+                nullable=column.nullable,
+            )
+            for column in archive_columns(source)
+        ),
+        Column("archived_at", DateTime, server_default=func.now(), nullable=False),
+    )
+
+
+clients_archive = _archive_table(Client.__table__)
+products_archive = _archive_table(Product.__table__)
+categories_archive = _archive_table(Category.__table__)
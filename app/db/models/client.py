@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,4 +12,10 @@ class Client(TimestampMixin, SoftDeleteMixin, Base):
     address: Mapped[str] = mapped_column(String(500), nullable=True)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
 
-    orders: Mapped[list["Order"]] = relationship("Order", back_populates="client")
+    orders: Mapped[list["Order"]] = relationship(
+        "Order", back_populates="client", primaryjoin="Client.id == foreign(Order.client_id)"
+    )
+
+    __table_args__ = (
+        Index("ix_clients_full_name", "full_name"),
+    )
@@ -0,0 +1,30 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ClientStats(Base):
+    """Per-client order aggregates, maintained incrementally by OrderService."""
+
+    __tablename__ = "client_stats"
+
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False
+    )
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    lifetime_spend: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, server_default="0"
+    )
+    last_order_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class IdNodeLease(Base):
+    """Snowflake node id held by one process until expires_at (see app.db.ids)."""
+
+    __tablename__ = "id_node_leases"
+
+    # The node id itself, 0..1023.
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    holder: Mapped[str] = mapped_column(String(255), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
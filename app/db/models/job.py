@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.enums import JobStatus
+from app.db.base import Base
+
+
+class Job(Base):
+    """Background job, claimed by workers with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    status: Mapped[JobStatus] = mapped_column(
+        SQLEnum(
+            JobStatus,
+            name="job_status",
+            values_callable=lambda enum: [e.value for e in enum],
+        ),
+        nullable=False,
+        default=JobStatus.QUEUED,
+        server_default=JobStatus.QUEUED.value,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Not claimed before this time; pushed back by the retry backoff.
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.clock_timestamp(), nullable=False
+    )
+    # Claim time of the current attempt; a running job whose claim is older than
+    # jobs_lock_timeout is considered abandoned (worker died) and claimed again.
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.clock_timestamp(), nullable=False
+    )
+
+    __table_args__ = (
+        # Workers scan only claimable rows; finished jobs stay out of both indexes.
+        Index("ix_jobs_queued_run_after", "run_after", postgresql_where=text("status = 'queued'")),
+        Index("ix_jobs_running_locked_at", "locked_at", postgresql_where=text("status = 'running'")),
+    )
@@ -1,21 +1,25 @@
 from decimal import Decimal
 
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint, event
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Integer, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.enums import OrderStatus
 from app.db.base import Base
+from app.db.ids import assign_snowflake_id
 from app.db.models.mixins import TimestampMixin
 
 
 class Order(TimestampMixin, Base):
     __tablename__ = "orders"
 
-    client_id: Mapped[int] = mapped_column(
-        ForeignKey("clients.id", ondelete="RESTRICT"),
-        index=True
-    )
+    # 64-bit: serial by default, snowflake ids with SNOWFLAKE_IDS (see app.db.ids).
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # Partition / shard key; orders of one tenant (region, warehouse) live on one shard.
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # No foreign key: clients live on the default shard only (see app.db.session).
+    # Archival keeps clients with orders through client_stats instead.
+    client_id: Mapped[int] = mapped_column(Integer, index=True)
     status: Mapped[OrderStatus] = mapped_column(
         SQLEnum(
             OrderStatus,
@@ -26,33 +30,69 @@ class Order(TimestampMixin, Base):
         default=OrderStatus.NEW,
         server_default=OrderStatus.NEW.value,
     )
+    # Denormalized from order_products: SUM(quantity) and SUM(quantity * price_at_order).
+    # Changed only through OrderRepository.add_totals (atomic increments that also bump updated_at).
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=Decimal(0), server_default="0"
+    )
 
-    client: Mapped["Client"] = relationship("Client", back_populates="orders")
+    client: Mapped["Client"] = relationship(
+        "Client",
+        back_populates="orders",
+        primaryjoin="foreign(Order.client_id) == Client.id",
+    )
     order_products: Mapped[list["OrderProduct"]] = relationship(
         "OrderProduct",
         back_populates="order",
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # List filters/sorts (OrderRepository.list_query).
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_client_id_created_at", "client_id", "created_at"),
+        Index("ix_orders_tenant_id_created_at", "tenant_id", "created_at"),
+        # "Orders over X" filters/sorts.
+        Index("ix_orders_total_amount", "total_amount"),
+        # Revenue by period as an index-only scan: SUM(total_amount) WHERE created_at in range.
+        Index("ix_orders_created_at_total_amount", "created_at", "total_amount"),
+    )
+
 
 class OrderProduct(Base):
     __tablename__ = "order_products"
 
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     order_id: Mapped[int] = mapped_column(
+        BigInteger,
         ForeignKey("orders.id", ondelete="CASCADE")
     )
-    product_id: Mapped[int] = mapped_column(
-        ForeignKey("products.id", ondelete="RESTRICT")
-    )
+    # Copied from the order so lines can be partitioned / sharded together with it.
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # No foreign key: the line snapshots everything it shows (price, name, SKU), so the
+    # product may be moved to products_archive while its order history stays.
+    product_id: Mapped[int] = mapped_column(Integer)
 
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     # Price changes, therefore "price_at_order" field refers to 
     # price at the time of order to preserve historical data.
     price_at_order: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    # Same for the product's name and SKU: order reads never need to load products.
+    product_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    sku: Mapped[str] = mapped_column(String(50), nullable=False)
 
     order: Mapped["Order"] = relationship("Order", back_populates="order_products")
-    product: Mapped["Product"] = relationship("Product", back_populates="order_products")
+    product: Mapped["Product"] = relationship(
+        "Product",
+        back_populates="order_products",
+        primaryjoin="foreign(OrderProduct.product_id) == Product.id",
+    )
 
     __table_args__ = (
         UniqueConstraint("order_id", "product_id", name="uq_order_product"),
     )
+
+
+event.listen(Order, "before_insert", assign_snowflake_id)
+event.listen(OrderProduct, "before_insert", assign_snowflake_id)
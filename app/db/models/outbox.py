@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    """Change event written in the same transaction as the mutation it describes."""
+
+    __tablename__ = "outbox"
+
+    # Insert order; the relay publishes unpublished events in this order.
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # clock_timestamp(), not now(): time of the insert, not of transaction start.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.clock_timestamp(),
+        nullable=False
+    )
+    published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Stream position, assigned by the relay (outbox_position_seq) when it publishes the event;
+    # consumers tail the stream by it. Ids are drawn at insert but become visible in commit
+    # order, so a slow transaction can commit an id below one a consumer has already seen.
+    # Positions are assigned to committed rows only, by one relay at a time, so they never do.
+    position: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        # Relay scans only the unpublished tail.
+        Index("ix_outbox_unpublished", "id", postgresql_where=text("published_at IS NULL")),
+        Index("ix_outbox_position", "position", unique=True),
+    )
@@ -1,10 +1,12 @@
 from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, Numeric, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import CheckConstraint, Computed, ForeignKey, Index, Numeric, SmallInteger, String, func, select, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.db.base import Base
 from app.db.models.mixins import TimestampMixin, SoftDeleteMixin
+from app.db.models.stock import product_stock
 
 
 class Product(TimestampMixin, SoftDeleteMixin, Base):
@@ -12,16 +14,57 @@ class Product(TimestampMixin, SoftDeleteMixin, Base):
 
     sku: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    quantity: Mapped[int] = mapped_column(Integer, default=0)
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
     category_id: Mapped[int] = mapped_column(
         ForeignKey("categories.id", ondelete="RESTRICT"),
         index=True
     )
+    # Stock rows per warehouse; > 1 for hot products, so concurrent checkouts update different rows.
+    stock_stripes: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=1, server_default="1")
+    # Maintained by Postgres on every insert/update; "simple" config since names are mixed-language.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, ''))", persisted=True),
+        deferred=True,
+    )
 
     category: Mapped["Category"] = relationship("Category", back_populates="products")
-    order_products: Mapped[list["OrderProduct"]] = relationship("OrderProduct", back_populates="product")
+    order_products: Mapped[list["OrderProduct"]] = relationship(
+        "OrderProduct",
+        back_populates="product",
+        primaryjoin="Product.id == foreign(OrderProduct.product_id)",
+    )
 
     __table_args__ = (
-        CheckConstraint("quantity >= 0", name="check_product_quantity_positive"),
+        CheckConstraint("stock_stripes >= 1", name="check_product_stock_stripes_positive"),
+        # Striped products, for the stock rebalancer.
+        Index("ix_products_striped", "id", postgresql_where=text("stock_stripes > 1")),
+        # List filters/sorts (ProductRepository.list_query).
+        Index("ix_products_name", "name"),
+        Index("ix_products_price", "price"),
+        Index("ix_products_category_id_name", "category_id", "name"),
+        Index("ix_products_category_id_price", "category_id", "price"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # pg_trgm: fuzzy name matching and SKU prefix / ILIKE lookups.
+        Index(
+            "ix_products_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_products_sku_trgm", "sku",
+            postgresql_using="gin", postgresql_ops={"sku": "gin_trgm_ops"}
+        ),
+    )
+
+
+# Available units over all active warehouses, read with the row from the product_stock view
+# (stock itself lives in stock_levels). Read-only: change stock through StockRepository.
+Product.quantity = column_property(
+    func.coalesce(
+        select(product_stock.c.available)
+        .where(product_stock.c.product_id == Product.id)
+        .correlate_except(product_stock)
+        .scalar_subquery(),
+        0,
     )
+)
@@ -0,0 +1,42 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Index, Integer, Numeric, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ProductPrice(Base):
+    """One period of a product's price. Periods of a product never overlap and leave no gaps:
+    each ends where the next begins (valid_to is NULL for the last one).
+
+    products.price caches the period covering now.
+    """
+
+    __tablename__ = "product_prices"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # No foreign key, like order_products.product_id: price history outlives archiving.
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    valid_from: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    valid_to: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("price > 0", name="check_product_price_positive"),
+        CheckConstraint("valid_to IS NULL OR valid_to > valid_from", name="check_product_price_period"),
+        # Point-in-time lookup: latest valid_from <= t for a product (backward index scan).
+        Index("ix_product_prices_product_id_valid_from", "product_id", "valid_from", unique=True),
+        # Upcoming changes across all products (scheduled price feed, due-price job).
+        Index("ix_product_prices_valid_from", "valid_from"),
+        # btree_gist: integer equality and range overlap in one GiST index.
+        ExcludeConstraint(
+            ("product_id", "="),
+            (text("tsrange(valid_from, valid_to)"), "&&"),
+            name="excl_product_prices_overlap",
+            using="gist",
+        ),
+    )
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+    column,
+    func,
+    table,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class Warehouse(Base):
+    """A stock location. Inactive warehouses keep their stock but take no new reservations."""
+
+    __tablename__ = "warehouses"
+
+    code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    is_active: Mapped[bool] = mapped_column(default=True, server_default="true", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+
+class StockLevel(Base):
+    """Stock of one product at one warehouse, or one stripe of it.
+
+    quantity is on hand; reserved is held by open orders (stock_reservations) until they
+    complete (shipped: both drop) or are cancelled/deleted (reserved drops). Checkouts of
+    a product spread over its locations, so one hot SKU is several rows, not one.
+    Products with stock_stripes > 1 also split each location's stock over that many
+    stripes (rows); StockRepository.rebalance keeps them even.
+
+    product_id has no foreign key, like order_products.product_id: archiving a product
+    moves it to products_archive, and its stock (reserved units included) must stay
+    for the open orders that hold it and for a restore.
+    """
+
+    __tablename__ = "stock_levels"
+
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    warehouse_id: Mapped[int] = mapped_column(
+        ForeignKey("warehouses.id", ondelete="RESTRICT"), index=True, nullable=False
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    reserved: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    stripe: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Also the per-product lookup: every read and reservation filters by product_id.
+        UniqueConstraint("product_id", "warehouse_id", "stripe", name="uq_stock_level_product_warehouse_stripe"),
+        CheckConstraint("reserved >= 0 AND reserved <= quantity", name="check_stock_level_reserved"),
+        # Rebalancer: products with stripes left over after stock_stripes was lowered.
+        Index("ix_stock_levels_striped", "product_id", postgresql_where=text("stripe > 0")),
+    )
+
+    @property
+    def available(self) -> int:
+        return self.quantity - self.reserved
+
+
+class StockReservation(Base):
+    """Units of an order line held at one warehouse stripe (a line may be split over several)."""
+
+    __tablename__ = "stock_reservations"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    order_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
+    # Copied from the order, like order_products.tenant_id.
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # No foreign keys to stock_levels: released by OrderService.
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    warehouse_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    stripe: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default="0")
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("order_id", "product_id", "warehouse_id", "stripe", name="uq_stock_reservation"),
+        CheckConstraint("quantity > 0", name="check_stock_reservation_quantity_positive"),
+    )
+
+
+# View over stock_levels of active warehouses, one row per stocked product (migration 12).
+# Not part of Base.metadata: Alembic must not mistake it for a table.
+product_stock = table(
+    "product_stock",
+    column("product_id", Integer),
+    column("quantity", Integer),
+    column("reserved", Integer),
+    column("available", Integer),
+)
@@ -0,0 +1,47 @@
+"""Connection pool with checkout wait tracking, used for load shedding."""
+import time
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to obtain a pooled connection (queueing plus connect when the pool grows).",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+).labels()
+
+
+class PoolWaitTracker:
+    """Moving average of checkout wait that also decays with time.
+
+    Decay matters for shedding: while requests are rejected nothing checks out,
+    and the average must still fall so traffic is let back in.
+    """
+
+    def __init__(self, alpha: float = 0.2, half_life: float = 1.0):
+        self.alpha = alpha
+        self.half_life = half_life
+        self._value = 0.0
+        self._updated = time.monotonic()
+
+    def record(self, seconds: float) -> None:
+        self._value = self.current() * (1 - self.alpha) + seconds * self.alpha
+        self._updated = time.monotonic()
+
+    def current(self) -> float:
+        return self._value * 0.5 ** ((time.monotonic() - self._updated) / self.half_life)
+
+
+pool_wait = PoolWaitTracker()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            elapsed = time.perf_counter() - started
+            POOL_WAIT.observe(elapsed)
+            pool_wait.record(elapsed)
@@ -0,0 +1,125 @@
+"""Per-request SQL statistics collected from engine events.
+
+Statements are attributed to every active `track()` scope of the current task,
+so a test can wrap a whole request while the request middleware tracks its own.
+"""
+import logging
+import re
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Execution option marking diagnostic statements (e.g. EXPLAIN runs) that are not counted.
+DIAGNOSTIC_OPTION = "diagnostic"
+
+_active: ContextVar[tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+# Most recent finished requests, newest last (served by the debug endpoint).
+recent: deque["QueryStats"] = deque(maxlen=settings.query_stats_history)
+
+_PARAM = re.compile(r"(\$\d+|\?|%\(\w+\)s)(::[\w\[\]]+)?")
+_PARAM_LIST = re.compile(r"\?(\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Statement text with bind parameters and expanded IN lists collapsed."""
+    text = _PARAM.sub("?", statement)
+    text = _PARAM_LIST.sub("?, ...", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+@dataclass
+class QueryStats:
+    label: str = ""
+    count: int = 0
+    db_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    finished_at: datetime | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.db_time += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int | None = None) -> dict[str, int]:
+        """Statements executed at least `threshold` times: likely N+1 loops."""
+        threshold = threshold or settings.query_n_plus_one_threshold
+        return {sql: n for sql, n in self.fingerprints.most_common() if n >= threshold}
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.count} queries", '
+            f"app;dur={max(total - self.db_time, 0) * 1000:.1f}"
+        )
+
+
+@contextmanager
+def track(label: str = "") -> Iterator[QueryStats]:
+    stats = QueryStats(label)
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+def current() -> QueryStats | None:
+    """Innermost active scope (the request, when called while serving one)."""
+    active = _active.get()
+    return active[-1] if active else None
+
+
+def finish(stats: QueryStats) -> None:
+    """Keep request stats for the debug endpoint and warn on N+1 patterns."""
+    stats.finished_at = datetime.now(UTC).replace(tzinfo=None)
+    recent.append(stats)
+    repeated = stats.repeated()
+    if repeated:
+        sql, n = next(iter(repeated.items()))
+        logger.warning("Possible N+1 in %s: statement ran %d times: %s", stats.label, n, sql[:200])
+
+
+def snapshot() -> list[dict]:
+    """Finished requests of this process, oldest first, JSON-serializable."""
+    return [
+        {
+            "label": stats.label,
+            "count": stats.count,
+            "db_time_ms": round(stats.db_time * 1000, 2),
+            "repeated": stats.repeated(),
+            "finished_at": stats.finished_at.isoformat(),
+        }
+        for stats in recent
+    ]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active.get()
+    if active and not context.execution_options.get(DIAGNOSTIC_OPTION):
+        elapsed = time.perf_counter() - context._query_started
+        for stats in active:
+            stats.record(statement, elapsed)
+
+
+def instrument(engine: Engine) -> None:
+    """Attach the statement hooks to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,47 @@
+"""Schema revision check, so container start can skip `alembic upgrade head` when nothing is pending.
+
+    python -m app.db.revision    # exit status 0 if every database (DB_*, DB_SHARDS) is at head, 1 otherwise
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import asyncpg
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.core.config import settings
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def head_revisions() -> set[str]:
+    return set(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+async def current_revisions(url: str) -> set[str]:
+    conn = await asyncpg.connect(url.replace("postgresql+asyncpg://", "postgresql://", 1))
+    try:
+        rows = await conn.fetch("SELECT version_num FROM alembic_version")
+    except asyncpg.UndefinedTableError:
+        return set()
+    finally:
+        await conn.close()
+    return {row["version_num"] for row in rows}
+
+
+def main() -> None:
+    heads = head_revisions()
+    behind = False
+    for shard, url in {"default": settings.database_url, **settings.db_shards}.items():
+        current = asyncio.run(current_revisions(url))
+        if current == heads:
+            print(f"Database {shard} is at head ({', '.join(sorted(heads))}).")
+            continue
+        behind = True
+        print(f"Database {shard} at {', '.join(sorted(current)) or 'no revision'}, head is {', '.join(sorted(heads))}.")
+    sys.exit(1 if behind else 0)
+
+
+if __name__ == "__main__":
+    main()
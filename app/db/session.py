@@ -1,27 +1,198 @@
-"""Async database session configuration."""
-from typing import AsyncGenerator
+"""Async database session configuration.
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+Orders, their lines and stock reservations live on the tenant's shard; every other table
+(clients, products, stock levels, outbox, jobs...) lives on the default database only.
+A session binds those three mappers to its shard and everything else to the default
+engine; a write session spanning both commits them with two-phase commit.
+"""
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core import metrics
 from app.core.config import settings
+from app.db import ids, query_stats, slow_queries
+from app.db.models.order import Order, OrderProduct
+from app.db.models.stock import StockReservation
+from app.db.pool import TimedQueuePool
 
 
+DEFAULT_SHARD = "default"
+SHARDED_MODELS = (Order, OrderProduct, StockReservation)
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+_engines: dict[str, AsyncEngine] = {}
+_read_engines: dict[str, AsyncEngine] = {}
 
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+def shard_for_tenant(tenant_id: int | None) -> str:
+    """Shard holding a tenant's orders; unmapped tenants live on the default shard."""
+    if tenant_id is None:
+        return DEFAULT_SHARD
+    return settings.tenant_shards.get(tenant_id, DEFAULT_SHARD)
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency for database session.
-    Commits on successful request completion; rolls back on exception.
+
+def shard_names() -> list[str]:
+    return [DEFAULT_SHARD, *settings.db_shards]
+
+
+def get_engine(shard: str = DEFAULT_SHARD) -> AsyncEngine:
+    """Process-wide engine per shard, created on first use.
+
+    Not at import: keeps the dialect/driver setup off the import path and gives
+    each forked worker its own pool.
+    """
+    engine = _engines.get(shard)
+    if engine is None:
+        url = settings.database_url if shard == DEFAULT_SHARD else settings.db_shards[shard]
+        pool_size, max_overflow = settings.db_pool_limits
+        engine = _engines[shard] = create_async_engine(
+            url,
+            echo=settings.debug,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            poolclass=TimedQueuePool,
+        )
+        if settings.query_stats_enabled:
+            query_stats.instrument(engine.sync_engine)
+        slow_queries.instrument(engine)
+    return engine
+
+
+def get_read_engine(shard: str = DEFAULT_SHARD) -> AsyncEngine:
+    """Same pool, AUTOCOMMIT: statements run without BEGIN/COMMIT round trips.
+
+    Under READ COMMITTED each statement sees its own snapshot either way,
+    so reads lose nothing by not being wrapped in a transaction.
+    """
+    engine = _read_engines.get(shard)
+    if engine is None:
+        engine = _read_engines[shard] = get_engine(shard).execution_options(isolation_level="AUTOCOMMIT")
+    return engine
+
+
+async def ensure_id_lease() -> None:
+    """Hold a snowflake node id lease (no-op unless SNOWFLAKE_IDS) before inserting orders."""
+    if settings.snowflake_ids:
+        await ids.lease.ensure(get_engine())
+
+
+async def dispose_engine() -> None:
+    for engine in _engines.values():
+        await engine.dispose()
+    _engines.clear()
+    _read_engines.clear()
+
+
+class _LazyBoundSessionMaker(async_sessionmaker):
+    def __call__(self, **local_kw) -> AsyncSession:
+        if "bind" not in local_kw:
+            local_kw["bind"] = get_engine()
+        return super().__call__(**local_kw)
+
+
+AsyncSessionLocal = _LazyBoundSessionMaker(expire_on_commit=False)
+
+
+def _pool_connections() -> dict:
+    values = {}
+    for shard, engine in _engines.items():
+        pool = engine.pool
+        values[(shard, "size")] = pool.size()
+        values[(shard, "checked_out")] = pool.checkedout()
+        values[(shard, "checked_in")] = pool.checkedin()
+        values[(shard, "overflow")] = pool.overflow()
+    return values
+
+
+metrics.Gauge(
+    "db_pool_connections",
+    "Connections of the SQLAlchemy pool by shard and state.",
+    ["shard", "state"],
+    collect=_pool_connections,
+)
+
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _reject_writes_in_read_only_session(state: ORMExecuteState) -> None:
+    if state.session.info.get("read_only") and not state.is_select:
+        raise ReadOnlySessionError("Write statement in a read-only (autocommit) session")
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_flush_in_read_only_session(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("Flush in a read-only (autocommit) session")
+
+
+@asynccontextmanager
+async def session_scope(
+    read_only: bool = False, tenant_id: int | None = None, shard: str | None = None
+) -> AsyncIterator[AsyncSession]:
+    """Session for one unit of work. A connection is checked out on the first query only.
+
+    read_only: autocommit session for safe requests; no BEGIN/COMMIT, writes are rejected.
+    tenant_id: binds SHARDED_MODELS to the tenant's shard; services read it from session.info
+    (None: no tenant given, the default shard).
+    shard: binds SHARDED_MODELS to this shard instead (reads across shards).
     """
-    async with AsyncSessionLocal() as async_session:
+    shard = shard or shard_for_tenant(tenant_id)
+    info = {"tenant_id": tenant_id, "shard": shard}
+    binds = {}
+    if shard != DEFAULT_SHARD:
+        engine = get_read_engine(shard) if read_only else get_engine(shard)
+        binds = {model: engine for model in SHARDED_MODELS}
+    if read_only:
+        info["read_only"] = True
+        async with AsyncSessionLocal(bind=get_read_engine(), binds=binds, info=info) as async_session:
+            yield async_session
+        return
+    await ensure_id_lease()
+    # Prepared on every database it touched before any of them commits.
+    async with AsyncSessionLocal(
+        bind=get_engine(), binds=binds, info=info, twophase=bool(binds)
+    ) as async_session:
         try:
             yield async_session
             await async_session.commit()
         except Exception:
             await async_session.rollback()
             raise
-        finally:
-            await async_session.close()
+
+
+def searches_all_shards(session: AsyncSession) -> bool:
+    """No tenant was given, so an order read may need every shard."""
+    return bool(settings.db_shards) and session.info.get("tenant_id") is None
+
+
+async def read_other_shards(
+    session: AsyncSession, read: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[Any]:
+    """read() on every shard except `session`'s, concurrently, each in its own read-only session.
+
+    What it returns is detached: load everything needed (selectinload) inside read().
+    """
+    async def read_shard(shard: str) -> Any:
+        async with session_scope(read_only=True, shard=shard) as shard_session:
+            return await read(shard_session)
+
+    own = session.info.get("shard", DEFAULT_SHARD)
+    return list(await asyncio.gather(*(read_shard(shard) for shard in shard_names() if shard != own)))
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for database session.
+    Commits on successful request completion; rolls back on exception.
+    """
+    async with session_scope() as async_session:
+        yield async_session
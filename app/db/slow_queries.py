@@ -0,0 +1,176 @@
+"""Slow statement capture with sampled EXPLAIN (ANALYZE, BUFFERS) plans.
+
+Statements slower than `slow_query_threshold_ms` are logged with the repository method
+that issued them (and their parameters, if enabled), and kept in a ring buffer. A sample of
+the slow SELECTs is explained in a background task, on its own read-only connection,
+so the request that was slow is not delayed any further. Only statements that call
+nothing but side-effect-free functions are re-run (EXPLAIN ANALYZE); a read-only
+transaction does not stop e.g. pg_try_advisory_xact_lock() or nextval(), so the rest
+get a plain EXPLAIN.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import random
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+
+from greenlet import getcurrent
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db import query_stats
+
+logger = logging.getLogger(__name__)
+
+_ids = itertools.count(1)
+_explain_tasks: set[asyncio.Task] = set()
+_explain_slots = asyncio.Semaphore(1)
+
+# Most recent slow statements, newest last (served by the admin endpoint).
+recent: deque["SlowQuery"] = deque(maxlen=settings.slow_query_history)
+
+_LOCKING = re.compile(r"\bFOR\s+(UPDATE|NO\s+KEY\s+UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+# Function calls as SQLAlchemy renders them (no space before the parenthesis, unlike IN / ANY / EXISTS).
+_CALL = re.compile(r"([A-Za-z_][\w.]*)\(")
+# Functions that are safe to execute again: no side effects, no locks, no sequence or session state.
+_ANALYZE_SAFE = frozenset({
+    "abs", "array_agg", "avg", "cast", "coalesce", "count", "date_trunc", "greatest", "least", "length",
+    "lower", "max", "min", "now", "nullif", "round", "similarity", "sum", "ts_rank_cd", "tsrange", "upper",
+    "websearch_to_tsquery",
+})
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: list[str]
+    duration_ms: float
+    origin: str
+    request: str
+    captured_at: datetime = field(default_factory=lambda: datetime.now(UTC).replace(tzinfo=None))
+    plan: str | None = None
+    id: int = field(default_factory=lambda: next(_ids))
+    worker: int = field(default_factory=os.getpid)
+
+
+def snapshot() -> list[dict]:
+    """Slow statements of this process, oldest first, JSON-serializable."""
+    return [{**asdict(entry), "captured_at": entry.captured_at.isoformat()} for entry in recent]
+
+
+def _origin() -> str:
+    """Innermost repository (else any app) function on the calling stack.
+
+    Engine events run in a greenlet spawned by the async adapter; the awaiting
+    coroutine frames are found through the parent greenlet.
+    """
+    fallback = "unknown"
+    glet = getcurrent()
+    frame = sys._getframe(2)
+    while frame is not None or glet is not None:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("app.repositories"):
+                return f"{module}.{frame.f_code.co_qualname}"
+            if fallback == "unknown" and module.startswith("app.") and not module.startswith("app.db"):
+                fallback = f"{module}.{frame.f_code.co_qualname}"
+            frame = frame.f_back
+        glet = glet.parent if glet is not None else None
+        frame = glet.gr_frame if glet is not None else None
+    return fallback
+
+
+def _format_parameters(parameters) -> list[str]:
+    if not settings.slow_query_log_parameters:
+        return []
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    elif not isinstance(parameters, (list, tuple)):
+        parameters = [parameters]
+    return [repr(value)[:200] for value in parameters]
+
+
+def _explainable(statement: str) -> bool:
+    return statement.lstrip().upper().startswith("SELECT") and not _LOCKING.search(statement)
+
+
+def _analyzable(statement: str) -> bool:
+    """Whether re-running the statement under EXPLAIN ANALYZE can have no effect of its own."""
+    return all(name.lower() in _ANALYZE_SAFE for name in _CALL.findall(statement))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_started = time.perf_counter()
+
+
+def _make_after_cursor_execute(engine: AsyncEngine):
+    threshold = settings.slow_query_threshold_ms / 1000
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_started
+        if elapsed < threshold or context.execution_options.get(query_stats.DIAGNOSTIC_OPTION):
+            return
+        active = query_stats.current()
+        entry = SlowQuery(
+            statement=statement,
+            parameters=_format_parameters(parameters),
+            duration_ms=round(elapsed * 1000, 2),
+            origin=_origin(),
+            request=active.label if active else "",
+        )
+        recent.append(entry)
+        logger.warning(
+            "Slow query %.1f ms in %s (%s): %s params=%s",
+            entry.duration_ms, entry.origin, entry.request or "-", statement, entry.parameters,
+        )
+        if (
+            not executemany
+            and _explainable(statement)
+            and random.random() < settings.slow_query_explain_sample_rate
+        ):
+            _schedule_explain(engine, entry, parameters)
+
+    return after_cursor_execute
+
+
+def _schedule_explain(engine: AsyncEngine, entry: SlowQuery, parameters) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_explain(engine, entry, parameters))
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(engine: AsyncEngine, entry: SlowQuery, parameters) -> None:
+    if _explain_slots.locked():
+        return  # one plan at a time; drop the sample rather than queue behind it
+    async with _explain_slots:
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(**{query_stats.DIAGNOSTIC_OPTION: True})
+                await conn.execute(text("SET TRANSACTION READ ONLY"))
+                await conn.execute(
+                    text(f"SET LOCAL statement_timeout = {int(settings.slow_query_explain_timeout_ms)}")
+                )
+                options = "ANALYZE, BUFFERS" if _analyzable(entry.statement) else "COSTS"
+                result = await conn.exec_driver_sql(f"EXPLAIN ({options}) {entry.statement}", parameters)
+                entry.plan = "\n".join(row[0] for row in result)
+                await conn.rollback()
+        except Exception as exc:
+            entry.plan = f"EXPLAIN failed: {exc}"
+    logger.warning("Plan for slow query #%d in %s:\n%s", entry.id, entry.origin, entry.plan)
+
+
+def instrument(engine: AsyncEngine) -> None:
+    """Attach the slow statement hooks to an async engine."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _make_after_cursor_execute(engine))
@@ -0,0 +1,74 @@
+"""Outbox relay: drains unpublished events to sinks in batches.
+
+Run as a separate process: ``python -m app.events.relay``.
+Publishing also gives events their stream positions, in commit order: a batch only
+sees committed events, and an advisory lock lets one relay publish at a time, so
+positions become visible in the order they were assigned. Several relays may run
+at once for availability; the others stand by.
+"""
+import asyncio
+import logging
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.events.sinks import EventSink, load_sink
+from app.repositories.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        sinks: Sequence[EventSink],
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        batch_size: int = settings.outbox_relay_batch_size,
+        poll_interval: float = settings.outbox_relay_poll_interval,
+    ):
+        self.sinks = list(sinks)
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+    async def drain_once(self) -> int:
+        """Publish one batch. Returns number of events published."""
+        async with self.session_factory() as session:
+            repository = OutboxRepository(session)
+            if not await repository.try_lock_relay():
+                return 0
+            events = await repository.get_unpublished(self.batch_size)
+            if not events:
+                return 0
+            await repository.mark_published(events, await repository.next_positions(len(events)))
+            for sink in self.sinks:
+                await sink.publish(events)
+            await session.commit()
+            return len(events)
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Drain until stopped; sleeps only when the outbox is empty."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                published = await self.drain_once()
+            except Exception:
+                logger.exception("Outbox relay batch failed; will retry")
+                published = 0
+            if published < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    relay = OutboxRelay([load_sink(path) for path in settings.outbox_sinks])
+    asyncio.run(relay.run())
+
+
+if __name__ == "__main__":
+    main()
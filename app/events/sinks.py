@@ -0,0 +1,47 @@
+"""Destinations the outbox relay publishes change events to."""
+import importlib
+import json
+import logging
+from abc import ABC, abstractmethod
+
+from app.db.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventSink(ABC):
+    """Pluggable event destination (message broker, search indexer, webhook, ...).
+
+    publish() must raise on failure: the batch is then left unpublished and retried,
+    so sinks see events at least once and should be idempotent on event id.
+    """
+
+    @abstractmethod
+    async def publish(self, events: list[OutboxEvent]) -> None: ...
+
+
+class LoggingSink(EventSink):
+    """Writes each event as a JSON line to the application log."""
+
+    async def publish(self, events: list[OutboxEvent]) -> None:
+        for event in events:
+            logger.info(
+                json.dumps(
+                    {
+                        "id": event.id,
+                        "position": event.position,
+                        "event_type": event.event_type,
+                        "aggregate_type": event.aggregate_type,
+                        "aggregate_id": event.aggregate_id,
+                        "payload": event.payload,
+                    },
+                    default=str,
+                )
+            )
+
+
+def load_sink(path: str) -> EventSink:
+    """Instantiate a sink from a dotted path, e.g. "app.events.sinks.LoggingSink"."""
+    module_name, _, class_name = path.rpartition(".")
+    sink_cls = getattr(importlib.import_module(module_name), class_name)
+    return sink_cls()
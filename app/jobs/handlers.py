@@ -0,0 +1,43 @@
+"""Job handlers by kind.
+
+A handler gets its own session and the job payload, commits its work itself and
+returns a JSON-serializable result. Jobs run at least once (a retry or a reclaimed
+job repeats work), so handlers must be idempotent.
+"""
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import JobKind
+from app.services.archive_service import ArchiveService
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+JobHandler = Callable[[AsyncSession, dict], Awaitable[dict | None]]
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def handles(kind: JobKind) -> Callable[[JobHandler], JobHandler]:
+    def register(handler: JobHandler) -> JobHandler:
+        HANDLERS[kind.value] = handler
+        return handler
+    return register
+
+
+@handles(JobKind.CATEGORY_SUBTREE_ROOT)
+async def update_category_subtree_root(session: AsyncSession, payload: dict) -> dict:
+    updated = await CategoryService(session).update_subtree_root(payload["category_id"])
+    return {"updated": updated}
+
+
+@handles(JobKind.ARCHIVE_SOFT_DELETED)
+async def archive_soft_deleted(session: AsyncSession, payload: dict) -> dict:
+    return await ArchiveService(session).archive_soft_deleted()
+
+
+@handles(JobKind.PRODUCT_PRICES_DUE)
+async def apply_due_prices(session: AsyncSession, payload: dict) -> dict:
+    updated = await ProductService(session).apply_due_prices(datetime.fromisoformat(payload["valid_from"]))
+    return {"updated": updated}
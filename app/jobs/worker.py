@@ -0,0 +1,103 @@
+"""Background job worker: claims due jobs and runs their handlers.
+
+Run as a separate process: ``python -m app.jobs.worker``, or inside the API
+processes with JOBS_WORKER_IN_PROCESS=true. Any number of workers may run;
+FOR UPDATE SKIP LOCKED keeps their claims disjoint.
+"""
+import asyncio
+import logging
+import random
+from collections.abc import Mapping
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.enums import JobStatus
+from app.core.metrics import Counter
+from app.db.models.job import Job
+from app.db.session import AsyncSessionLocal
+from app.jobs.handlers import HANDLERS, JobHandler
+from app.repositories.job_repository import JobRepository
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNS = Counter("job_runs_total", "Background job attempts by kind and outcome.", ["kind", "outcome"])
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so jobs failing together do not retry together."""
+    delay = min(settings.jobs_retry_backoff * 2 ** (attempt - 1), settings.jobs_retry_backoff_max)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobWorker:
+    def __init__(
+        self,
+        handlers: Mapping[str, JobHandler] = HANDLERS,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        concurrency: int = settings.jobs_concurrency,
+        poll_interval: float = settings.jobs_poll_interval,
+    ):
+        self.handlers = handlers
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+
+    async def run_once(self) -> int:
+        """Claim and run one batch of due jobs. Returns the number claimed."""
+        async with self.session_factory() as session:
+            jobs = await JobRepository(session).claim(self.concurrency, settings.jobs_lock_timeout)
+            await session.commit()
+        await asyncio.gather(*(self._run_job(job) for job in jobs))
+        return len(jobs)
+
+    async def _run_job(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        result = error = retry_in = None
+        if handler is None:
+            status, error = JobStatus.FAILED, f"No handler for job kind {job.kind!r}"
+        elif job.attempts > job.max_attempts:
+            # Reclaimed after lock timeout on its last attempt: the worker kept dying on it.
+            status, error = JobStatus.FAILED, "Abandoned: lock timeout on the last attempt"
+        else:
+            try:
+                async with self.session_factory() as session:
+                    result = await handler(session, job.payload)
+                    await session.commit()
+                status = JobStatus.SUCCEEDED
+            except Exception as exc:
+                logger.exception("Job %s (%s) attempt %s failed", job.id, job.kind, job.attempts)
+                error = f"{type(exc).__name__}: {exc}"
+                if job.attempts < job.max_attempts:
+                    status, retry_in = JobStatus.QUEUED, retry_delay(job.attempts)
+                else:
+                    status = JobStatus.FAILED
+        JOB_RUNS.labels(job.kind, "retry" if retry_in else status.value).inc()
+        async with self.session_factory() as session:
+            if not await JobRepository(session).finish(job, status, result, error, retry_in):
+                logger.warning("Job %s was reclaimed while running; outcome discarded", job.id)
+            await session.commit()
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Work until stopped; sleeps only when no job is due."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Job claim failed; will retry")
+                claimed = 0
+            if claimed < self.concurrency:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(JobWorker().run())
+
+
+if __name__ == "__main__":
+    main()
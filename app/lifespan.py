@@ -0,0 +1,139 @@
+"""Application startup warm-up and graceful shutdown."""
+import asyncio
+import logging
+import signal
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.core import multiprocess
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.db import ids
+from app.db.invalidation import InvalidationListener
+from app.db.session import dispose_engine, get_engine, session_scope
+from app.jobs.worker import JobWorker
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_RETRY_INTERVAL = 5.0
+
+
+async def _open_connection() -> None:
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_up() -> None:
+    """Fill the pool and prime per-worker caches."""
+    # Held concurrently, so each one is a distinct pooled connection.
+    count = min(settings.db_pool_warm_connections, settings.db_pool_limits[0])
+    await asyncio.gather(*(_open_connection() for _ in range(count)))
+    async with session_scope(read_only=True) as session:
+        await CategoryService(session).get_root_categories()
+
+
+async def _warm_up_until_ready() -> None:
+    while not lifecycle.draining:
+        try:
+            await warm_up()
+        except Exception:
+            logger.exception("Warm-up failed; retrying in %.0fs", WARM_UP_RETRY_INTERVAL)
+            await asyncio.sleep(WARM_UP_RETRY_INTERVAL)
+            continue
+        lifecycle.ready = True
+        logger.info("Warm-up complete")
+        return
+
+
+async def _rebalance_stock_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.stock_rebalance_interval)
+        try:
+            async with session_scope() as session:
+                rows = await ProductService(session).rebalance_stock()
+            if rows:
+                logger.debug("Stock rebalanced: %d rows", rows)
+        except Exception:
+            logger.exception("Stock rebalance failed")
+
+
+def _install_drain_handler() -> None:
+    """Delay the server's SIGTERM handling by `shutdown_drain_delay` while readiness reports 503."""
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous) or settings.shutdown_drain_delay <= 0:
+        return
+    loop = asyncio.get_running_loop()
+
+    def handle_sigterm(sig, frame):
+        if lifecycle.draining:
+            previous(sig, frame)
+            return
+        lifecycle.draining = True
+        logger.info("SIGTERM: draining for %.1fs before shutdown", settings.shutdown_drain_delay)
+        loop.call_soon_threadsafe(loop.call_later, settings.shutdown_drain_delay, previous, sig, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+    except ValueError:
+        pass  # not the main thread (e.g. embedded in a test runner)
+
+
+def _start_periodic_tasks() -> list[asyncio.Task]:
+    tasks = []
+    if settings.stock_rebalance_interval > 0:
+        tasks.append(asyncio.create_task(_rebalance_stock_periodically()))
+    if multiprocess.enabled():
+        tasks.append(asyncio.create_task(multiprocess.write_periodically()))
+    if settings.snowflake_ids:
+        tasks.append(asyncio.create_task(ids.lease.renew_periodically(get_engine())))
+    return tasks
+
+
+async def _hand_off_process_state() -> None:
+    """Leave what other processes read behind in a final state."""
+    if multiprocess.enabled():
+        # Final values, folded into dead.json once this process has exited.
+        multiprocess.write()
+    if settings.snowflake_ids:
+        try:
+            await ids.lease.release(get_engine())
+        except Exception:
+            logger.exception("Releasing the snowflake node id lease failed; it expires on its own")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    configure_mappers()
+    _install_drain_handler()
+    background = []
+    if settings.cache_invalidation_enabled:
+        # Started first: it flushes all caches on connect, ideally before warm-up primes them.
+        background.append(asyncio.create_task(InvalidationListener().run()))
+    warm_up_task = asyncio.create_task(_warm_up_until_ready())
+    await asyncio.wait({warm_up_task}, timeout=settings.startup_warm_up_timeout)
+    background.extend(_start_periodic_tasks())
+    stop_jobs = asyncio.Event()
+    jobs_task = None
+    if settings.jobs_worker_in_process:
+        jobs_task = asyncio.create_task(JobWorker().run(stop_jobs))
+    try:
+        yield
+    finally:
+        # The server has stopped accepting and finished in-flight requests by now.
+        lifecycle.draining = True
+        lifecycle.ready = False
+        warm_up_task.cancel()
+        for task in background:
+            task.cancel()
+        if jobs_task is not None:
+            # Lets running jobs finish; an interrupted one is reclaimed after jobs_lock_timeout.
+            stop_jobs.set()
+            await asyncio.wait({jobs_task}, timeout=settings.web_graceful_timeout)
+        await _hand_off_process_state()
+        await dispose_engine()
@@ -1,23 +1,40 @@
 """Main FastAPI application entry point."""
-import uvicorn
 from fastapi import FastAPI
 
+from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
+from app.api.middleware import MetricsMiddleware, QueryStatsMiddleware
 from app.api.v1.routers import api_v1_router
+from app.core.config import settings
+from app.lifespan import lifespan
 
 
 app = FastAPI(
     title="ERP Service API",
     description="ERP system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(api_v1_router, prefix="/api/v1")
+app.include_router(health_router)
+
+if settings.query_stats_enabled:
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
+    # Added last, so outermost: measures the whole middleware stack.
+    app.add_middleware(MetricsMiddleware)
 
 
 if __name__ == "__main__":
+    # Development server; production uses `python -m app.server`.
+    import uvicorn
+
     uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        "app.main:app",
+        host=settings.web_host,
+        port=settings.web_port,
+        reload=settings.debug,
     )
@@ -0,0 +1,118 @@
+"""Moves soft-deleted rows between hot tables and their *_archive tables."""
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Row, Table, and_, delete, exists, false, func, insert, null, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.enums import ArchivedEntity
+from app.db.models.archive import archive_columns, categories_archive, clients_archive, products_archive
+from app.db.models.category import Category
+from app.db.models.client import Client
+from app.db.models.client_stats import ClientStats
+from app.db.models.product import Product
+
+TABLES: dict[ArchivedEntity, tuple[Table, Table]] = {
+    ArchivedEntity.CLIENTS: (Client.__table__, clients_archive),
+    ArchivedEntity.PRODUCTS: (Product.__table__, products_archive),
+    ArchivedEntity.CATEGORIES: (Category.__table__, categories_archive),
+}
+
+
+def _archivable(entity: ArchivedEntity) -> list[ColumnElement[bool]]:
+    """Rows still referenced through a foreign key stay in the hot table.
+
+    Order lines and stock levels reference products without a foreign key (order
+    lines carry their own snapshot; stock stays for a restore), so any product can go.
+    A category waits for its products and subcategories; a client with orders is kept,
+    going by its client_stats row (its orders may live on another shard).
+    """
+    if entity is ArchivedEntity.CLIENTS:
+        return [~exists().where(ClientStats.client_id == Client.id, ClientStats.order_count > 0)]
+    if entity is ArchivedEntity.CATEGORIES:
+        child = aliased(Category)
+        return [
+            ~exists().where(Product.category_id == Category.id),
+            ~exists().where(
+                or_(
+                    child.parent_id == Category.id,
+                    and_(child.root_category_id == Category.id, child.id != Category.id),
+                )
+            ),
+        ]
+    return []
+
+
+class ArchiveRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def archive_batch(self, entity: ArchivedEntity, deleted_before: datetime, limit: int) -> int:
+        """Move up to `limit` rows soft-deleted before `deleted_before` in one statement.
+
+        Rows locked by concurrent transactions are skipped and picked up by a later batch.
+        Returns the number of rows moved.
+        """
+        table, archive = TABLES[entity]
+        names = [column.name for column in archive_columns(table)]
+        due = (
+            select(table.c.id)
+            .where(table.c.is_deleted.is_(True), table.c.deleted_at < deleted_before, *_archivable(entity))
+            .order_by(table.c.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(table)
+            .where(table.c.id.in_(due.scalar_subquery()))
+            .returning(*(table.c[name] for name in names))
+            .cte("moved")
+        )
+        result = await self.session.execute(
+            insert(archive)
+            .from_select(names, select(*(moved.c[name] for name in names)))
+            .add_cte(moved)
+        )
+        return result.rowcount
+
+    async def get_archived(self, entity: ArchivedEntity, id: int) -> Row | None:
+        _, archive = TABLES[entity]
+        result = await self.session.execute(select(archive).where(archive.c.id == id))
+        return result.one_or_none()
+
+    async def get_archived_category_chain(self, category_id: int) -> list[int]:
+        """The category and its ancestors, as far up as they are archived (empty if it is not)."""
+        chain = (
+            select(categories_archive.c.id, categories_archive.c.parent_id)
+            .where(categories_archive.c.id == category_id)
+            .cte("chain", recursive=True)
+        )
+        chain = chain.union_all(
+            select(categories_archive.c.id, categories_archive.c.parent_id)
+            .join(chain, categories_archive.c.id == chain.c.parent_id)
+        )
+        result = await self.session.execute(select(chain.c.id))
+        return list(result.scalars().all())
+
+    async def restore(self, entity: ArchivedEntity, ids: list[int]) -> list[int]:
+        """Move archived rows back and undelete them. Returns the ids restored.
+
+        Foreign keys are checked at the end of the statement, so a category chain
+        can be restored in one call whatever the row order.
+        """
+        table, archive = TABLES[entity]
+        names = [column.name for column in archive_columns(table)]
+        overrides = {"is_deleted": false(), "deleted_at": null(), "updated_at": func.now()}
+        moved = (
+            delete(archive)
+            .where(archive.c.id.in_(ids))
+            .returning(*(archive.c[name] for name in names))
+            .cte("moved")
+        )
+        result = await self.session.execute(
+            insert(table)
+            .from_select(names, select(*(overrides.get(name, moved.c[name]) for name in names)))
+            .add_cte(moved)
+            .returning(table.c.id)
+        )
+        return list(result.scalars().all())
@@ -1,9 +1,12 @@
 """Generic repository base for CRUD and session-scoped data access."""
-from typing import Generic, TypeVar, Type
-from sqlalchemy import select
+from collections.abc import Iterable, Mapping
+from typing import Any, Generic, TypeVar, Type
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import Base
+from app.repositories.filters import ListQuery
+from app.repositories.loader import EntityLoader
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -11,21 +14,54 @@ ModelType = TypeVar("ModelType", bound=Base)
 class BaseRepository(Generic[ModelType]):
     """Async repository for a single SQLAlchemy model."""
 
+    # Whitelisted filters/sorts for get_all; None means "order by id, no filters".
+    list_query: ListQuery | None = None
+
     def __init__(self, model: Type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
 
+    @property
+    def loader(self) -> EntityLoader[ModelType]:
+        """Batching, memoizing by-id loader shared by all repositories of this model in the session."""
+        loaders = self.session.info.setdefault("loaders", {})
+        if self.model not in loaders:
+            loaders[self.model] = EntityLoader(self.session, self.model, self._select_all)
+        return loaders[self.model]
+
     async def get_by_id(self, id: int):
-        result = await self.session.execute(
-            select(self.model).where(self.model.id == id)
-        )
-        return result.scalar_one_or_none()
+        return await self.loader.load(id)
+
+    async def get_by_ids(self, ids: Iterable[int]) -> list[ModelType]:
+        """Existing entities for the given ids, in request order, without duplicates."""
+        ids = list(dict.fromkeys(ids))
+        return [obj for obj in await self.loader.load_many(ids) if obj is not None]
+
+    def _select_all(self) -> Select:
+        """Base statement for list queries; subclasses narrow it (e.g. skip soft-deleted rows)."""
+        return select(self.model)
+
+    def _apply_list_query(
+        self,
+        stmt: Select,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> Select:
+        """Compile filters/sort via list_query. Raises InvalidQueryError for anything not whitelisted."""
+        if self.list_query is None:
+            return stmt.order_by(self.model.id)
+        return self.list_query.apply(stmt, filters, sort)
 
-    async def get_all(self, offset: int = 0, limit: int = 100):
-        result = await self.session.execute(
-            select(self.model).order_by(self.model.id).offset(offset).limit(limit)
-        )
-        return result.scalars().all()
+    async def get_all(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ):
+        stmt = self._apply_list_query(self._select_all(), filters, sort)
+        result = await self.session.execute(stmt.offset(offset).limit(limit))
+        return list(result.scalars().all())
 
     async def create(self, obj: ModelType) -> ModelType:
         self.session.add(obj)
@@ -34,10 +70,13 @@ class BaseRepository(Generic[ModelType]):
         return obj
 
     async def update(self, obj: ModelType) -> ModelType:
+        # Row may stop matching _select_all (e.g. soft delete): reload next time.
+        self.loader.forget(obj.id)
         await self.session.flush()
         await self.session.refresh(obj)
         return obj
 
     async def delete(self, obj: ModelType):
+        self.loader.forget(obj.id)
         await self.session.delete(obj)
         await self.session.flush()
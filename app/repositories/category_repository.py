@@ -1,5 +1,5 @@
 """Category repository."""
-from sqlalchemy import select, text
+from sqlalchemy import Select, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -82,11 +82,8 @@ class CategoryRepository(BaseRepository[Category]):
 
         return False
 
-    async def get_by_id(self, id: int) -> Category | None:
-        result = await self.session.execute(
-            select(Category).where(Category.id == id, Category.is_deleted.is_(False))
-        )
-        return result.scalar_one_or_none()
+    def _select_all(self) -> Select:
+        return select(Category).where(Category.is_deleted.is_(False))
 
     async def get_all(self, offset: int = 0, limit: int = 100) -> list[Category]:
         result = await self.session.execute(
@@ -99,19 +96,33 @@ class CategoryRepository(BaseRepository[Category]):
         return list(result.scalars().all())
 
     async def update_root_category_id_for_subtree(
-        self, category_id: int, new_root_id: int
-    ) -> None:
-        """Set root_category_id for this category and all descendants (e.g. when parent_id changes)."""
-        await self.session.execute(
+        self, category_id: int, batch_size: int
+    ) -> int:
+        """Copy the category's root_category_id to up to batch_size descendants that differ from it.
+
+        Call repeatedly (committing in between) until it returns 0. Descendants and the root
+        are re-read on every call, so a batch never applies a stale move.
+        """
+        result = await self.session.execute(
             text("""
                 WITH RECURSIVE descendants AS (
-                    SELECT id FROM categories WHERE id = :category_id
+                    SELECT id FROM categories WHERE parent_id = :category_id
                     UNION ALL
                     SELECT c.id FROM categories c
                     JOIN descendants d ON c.parent_id = d.id
+                ),
+                target AS (
+                    SELECT root_category_id FROM categories WHERE id = :category_id
+                ),
+                batch AS (
+                    SELECT c.id FROM categories c
+                    JOIN descendants d ON d.id = c.id
+                    WHERE c.root_category_id IS DISTINCT FROM (SELECT root_category_id FROM target)
+                    LIMIT :batch_size
                 )
-                UPDATE categories SET root_category_id = :new_root_id
-                WHERE id IN (SELECT id FROM descendants)
+                UPDATE categories SET root_category_id = (SELECT root_category_id FROM target)
+                WHERE id IN (SELECT id FROM batch)
             """),
-            {"category_id": category_id, "new_root_id": new_root_id},
+            {"category_id": category_id, "batch_size": batch_size},
         )
+        return result.rowcount
@@ -1,11 +1,27 @@
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.client import Client
 from app.repositories.base import BaseRepository
+from app.repositories.filters import Filter, ListQuery
 
 
 class ClientRepository(BaseRepository[Client]):
+    # Every filter/sort column below is indexed.
+    list_query = ListQuery(
+        filters={
+            "email": Filter(Client.email),
+            "created_from": Filter(Client.created_at, "ge"),
+            "created_to": Filter(Client.created_at, "lt"),
+        },
+        sorts={
+            "full_name": Client.full_name,
+            "created_at": Client.created_at,
+        },
+        default_sort="full_name",
+        tiebreaker=Client.id,
+    )
+
     def __init__(self, session: AsyncSession):
         super().__init__(Client, session)
 
@@ -15,18 +31,5 @@ class ClientRepository(BaseRepository[Client]):
         )
         return result.scalar_one_or_none()
 
-    async def get_by_id(self, id: int) -> Client | None:
-        result = await self.session.execute(
-            select(Client).where(Client.id == id, Client.is_deleted.is_(False))
-        )
-        return result.scalar_one_or_none()
-
-    async def get_all(self, offset: int = 0, limit: int = 100) -> list[Client]:
-        result = await self.session.execute(
-            select(Client)
-            .where(Client.is_deleted.is_(False))
-            .order_by(Client.full_name)
-            .offset(offset)
-            .limit(limit)
-        )
-        return list(result.scalars().all())
+    def _select_all(self) -> Select:
+        return select(Client).where(Client.is_deleted.is_(False))
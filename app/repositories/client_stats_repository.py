@@ -0,0 +1,57 @@
+"""Client order aggregates repository."""
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.client_stats import ClientStats
+from app.repositories.base import BaseRepository
+
+
+class ClientStatsRepository(BaseRepository[ClientStats]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(ClientStats, session)
+
+    async def get_by_client_id(self, client_id: int) -> ClientStats | None:
+        result = await self.session.execute(
+            select(ClientStats).where(ClientStats.client_id == client_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def apply_delta(
+        self,
+        client_id: int,
+        orders: int = 0,
+        spend: Decimal = Decimal(0),
+        last_order_at: datetime | None = None,
+        replace_last_order: bool = False,
+    ) -> None:
+        """Atomically add deltas to the client's aggregates (upsert; row lock only on this client).
+
+        replace_last_order: set last_order_at as given (re-derived after an order was deleted;
+        orders may live on other shards, so not in this statement).
+        """
+        stmt = insert(ClientStats).values(
+            client_id=client_id,
+            order_count=orders,
+            lifetime_spend=spend,
+            last_order_at=last_order_at,
+        )
+        if replace_last_order:
+            new_last_order_at = stmt.excluded.last_order_at
+        else:
+            # GREATEST ignores NULLs.
+            new_last_order_at = func.greatest(ClientStats.last_order_at, stmt.excluded.last_order_at)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ClientStats.client_id],
+                set_={
+                    "order_count": ClientStats.order_count + stmt.excluded.order_count,
+                    "lifetime_spend": ClientStats.lifetime_spend + stmt.excluded.lifetime_spend,
+                    "last_order_at": new_last_order_at,
+                    "updated_at": func.now(),
+                },
+            )
+        )
@@ -0,0 +1,112 @@
+"""Declarative, whitelisted filters and sorting for repository list queries.
+
+Each repository declares which query parameters map to which columns and which
+sort key combinations are backed by an index; anything else is rejected instead
+of turning into a sequential scan.
+"""
+import heapq
+import operator
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidQueryError(ValueError):
+    """Requested filter or sort is not allowed for this list."""
+
+
+OPERATORS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+    "in": lambda column, value: column.in_(value),
+}
+
+
+@dataclass(frozen=True)
+class Filter:
+    """Query parameter compiled to `column <op> value`; op is a name from OPERATORS or a callable."""
+
+    column: Any
+    op: str | Callable[[Any, Any], ColumnElement[bool]] = "eq"
+
+    def compile(self, value: Any) -> ColumnElement[bool]:
+        op = OPERATORS[self.op] if isinstance(self.op, str) else self.op
+        return op(self.column, value)
+
+
+@dataclass(frozen=True)
+class ListQuery:
+    """Allowed filters and sorts for one list endpoint.
+
+    sort_indexes lists the sort key combinations (in order) that an index can serve.
+    A sort is written as comma-separated keys, "-" prefix for descending: "-created_at".
+    """
+
+    filters: Mapping[str, Filter]
+    sorts: Mapping[str, Any]
+    default_sort: str
+    sort_indexes: tuple[tuple[str, ...], ...] = field(default=())
+    tiebreaker: Any = None
+
+    def apply(
+        self, stmt: Select, params: Mapping[str, Any] | None = None, sort: str | None = None
+    ) -> Select:
+        for name, value in (params or {}).items():
+            if value is None:
+                continue
+            if name not in self.filters:
+                raise InvalidQueryError(f"Filtering by '{name}' is not supported")
+            stmt = stmt.where(self.filters[name].compile(value))
+        return stmt.order_by(*self._order_by(sort or self.default_sort))
+
+    def merge(self, pages: Iterable[list], sort: str | None, offset: int, limit: int) -> list:
+        """Rows offset..offset + limit of several lists each sorted by `sort` (one per shard,
+        each holding its first offset + limit rows), in the order the database would return."""
+        keys, descending = self._parse(sort or self.default_sort)
+        names = [self.sorts[key].key for key in keys]
+        if self.tiebreaker is not None:
+            names.append(self.tiebreaker.key)
+
+        def sort_key(row: Any) -> tuple:
+            # PostgreSQL enums sort in declaration order, not by label.
+            values = (getattr(row, name) for name in names)
+            return tuple(list(type(v)).index(v) if isinstance(v, Enum) else v for v in values)
+
+        return list(islice(heapq.merge(*pages, key=sort_key, reverse=descending[-1]), offset, offset + limit))
+
+    def _parse(self, sort: str) -> tuple[list[str], list[bool]]:
+        keys: list[str] = []
+        descending: list[bool] = []
+        for part in sort.split(","):
+            part = part.strip()
+            key = part.lstrip("-")
+            if key not in self.sorts:
+                raise InvalidQueryError(f"Sorting by '{key}' is not supported")
+            keys.append(key)
+            descending.append(part.startswith("-"))
+
+        if len(keys) > 1:
+            if tuple(keys) not in self.sort_indexes:
+                raise InvalidQueryError(f"Sort combination '{sort}' is not backed by an index")
+            if len(set(descending)) > 1:
+                raise InvalidQueryError("Mixed sort directions are not backed by an index")
+        return keys, descending
+
+    def _order_by(self, sort: str) -> list[Any]:
+        keys, descending = self._parse(sort)
+        order_by = [
+            self.sorts[key].desc() if desc else self.sorts[key].asc()
+            for key, desc in zip(keys, descending, strict=True)
+        ]
+        if self.tiebreaker is not None:
+            # Deterministic pages when sort keys are not unique.
+            order_by.append(self.tiebreaker.desc() if descending[-1] else self.tiebreaker.asc())
+        return order_by
@@ -0,0 +1,88 @@
+"""Background job repository."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import JobKind, JobStatus
+from app.db.models.job import Job
+from app.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Job, session)
+
+    async def enqueue(
+        self, kind: JobKind, payload: dict, max_attempts: int, run_after: datetime | None = None
+    ) -> Job:
+        """Stage a job in the current transaction: it becomes visible to workers only if the caller commits.
+
+        run_after (naive UTC) delays the job; by default it is due at once.
+        """
+        job = Job(kind=kind.value, payload=payload, max_attempts=max_attempts)
+        if run_after is not None:
+            job.run_after = run_after
+        return await self.create(job)
+
+    async def claim(self, limit: int, lock_timeout: float) -> list[Job]:
+        """Mark up to `limit` due jobs as running and return them.
+
+        Also reclaims running jobs whose claim is older than lock_timeout (their worker died).
+        Concurrent workers skip rows already locked by another claim.
+        """
+        now = func.clock_timestamp()
+        due = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(
+                        Job.status == JobStatus.RUNNING,
+                        Job.locked_at < now - timedelta(seconds=lock_timeout),
+                    ),
+                )
+            )
+            .order_by(Job.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_at=now,
+                started_at=func.coalesce(Job.started_at, now),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        result: dict | None = None,
+        error: str | None = None,
+        retry_in: float | None = None,
+    ) -> bool:
+        """Record the outcome of the attempt claimed at job.locked_at.
+
+        retry_in (seconds) re-queues the job instead of finishing it. Returns False when the
+        claim was lost (the job was reclaimed after lock_timeout); nothing is written then.
+        """
+        values = {"status": status, "result": result, "last_error": error, "locked_at": None}
+        if retry_in is not None:
+            values["run_after"] = func.clock_timestamp() + timedelta(seconds=retry_in)
+        else:
+            values["finished_at"] = func.clock_timestamp()
+        updated = await self.session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_at == job.locked_at)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return updated.rowcount == 1
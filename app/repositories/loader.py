@@ -0,0 +1,106 @@
+"""Request-scoped batching loader for by-id lookups."""
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import CACHE_REQUESTS
+
+ModelType = TypeVar("ModelType")
+
+
+class EntityLoader(Generic[ModelType]):  # noqa: UP046 - same form as BaseRepository
+    """Coalesces by-id loads issued in the same event-loop tick into one
+    `WHERE id = ANY(:ids)` query and memoizes results (including misses) for the session.
+
+    One loader per (session, model); obtain it via BaseRepository.loader.
+    """
+
+    def __init__(self, session: AsyncSession, model: Any, select_all: Callable[[], Select]):
+        self.session = session
+        self.model = model
+        self.select_all = select_all
+        self._memo: dict[int, ModelType | None] = {}
+        self._pending: dict[int, asyncio.Future] = {}
+        self._scheduled = False
+        # Running dispatches; the event loop keeps only weak references to tasks.
+        self._tasks: set[asyncio.Task] = set()
+        cache = f"loader:{model.__tablename__}"
+        self._hits = CACHE_REQUESTS.labels(cache, "hit")
+        self._misses = CACHE_REQUESTS.labels(cache, "miss")
+
+    async def load(self, id: int) -> ModelType | None:
+        if id in self._memo:
+            self._hits.inc()
+            return self._memo[id]
+        self._misses.inc()
+        return await self._enqueue(id)
+
+    async def load_many(self, ids: Iterable[int]) -> list[ModelType | None]:
+        """Results in the order of `ids`; None where the entity does not exist."""
+        ids = list(ids)
+        missing = {id for id in ids if id not in self._memo}
+        self._hits.inc(len(ids) - len(missing))
+        self._misses.inc(len(missing))
+        if missing:
+            await asyncio.gather(*(self._enqueue(id) for id in missing))
+        return [self._memo[id] for id in ids]
+
+    def prime(self, obj: ModelType) -> None:
+        self._memo[obj.id] = obj
+
+    def forget(self, id: int) -> None:
+        self._memo.pop(id, None)
+
+    def _enqueue(self, id: int) -> asyncio.Future:
+        future = self._pending.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[id] = future
+            if not self._scheduled:
+                # Dispatch after the current tick so concurrent loads join the batch.
+                self._scheduled = True
+                loop.call_soon(self._start_dispatch)
+        return future
+
+    def _start_dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        task = asyncio.ensure_future(self._dispatch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(lambda task: self._dispatched(task, pending))
+
+    def _dispatched(self, task: asyncio.Task, pending: dict[int, asyncio.Future]) -> None:
+        self._tasks.discard(task)
+        # Cancelled before it ran: nothing else will settle the batch.
+        for future in pending.values():
+            if not future.done():
+                future.cancel()
+
+    async def _dispatch(self, pending: dict[int, asyncio.Future]) -> None:
+        try:
+            result = await self.session.execute(
+                self.select_all().where(
+                    self.model.id == any_(
+                        bindparam("ids", list(pending), type_=ARRAY(self.model.id.type))
+                    )
+                )
+            )
+            found = {obj.id: obj for obj in result.scalars().all()}
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for id, future in pending.items():
+            self._memo[id] = found.get(id)
+            if not future.done():
+                future.set_result(self._memo[id])
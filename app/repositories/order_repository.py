@@ -1,44 +1,121 @@
 """Order and order-products repository."""
-from sqlalchemy import select
+from collections.abc import Mapping
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.order import Order, OrderProduct
 from app.repositories.base import BaseRepository
+from app.repositories.filters import Filter, ListQuery
 
 
 class OrderRepository(BaseRepository[Order]):
+    # Every filter/sort column below is indexed (see migrations 04, 07 and 09).
+    list_query = ListQuery(
+        filters={
+            "status": Filter(Order.status),
+            "client_id": Filter(Order.client_id),
+            "tenant_id": Filter(Order.tenant_id),
+            "created_from": Filter(Order.created_at, "ge"),
+            "created_to": Filter(Order.created_at, "lt"),
+            "total_from": Filter(Order.total_amount, "ge"),
+            "total_to": Filter(Order.total_amount, "lt"),
+        },
+        sorts={
+            "created_at": Order.created_at,
+            "status": Order.status,
+            "client_id": Order.client_id,
+            "tenant_id": Order.tenant_id,
+            "total_amount": Order.total_amount,
+        },
+        default_sort="-created_at",
+        sort_indexes=(("status", "created_at"), ("client_id", "created_at"), ("tenant_id", "created_at")),
+        tiebreaker=Order.id,
+    )
+
     def __init__(self, session: AsyncSession):
         super().__init__(Order, session)
 
-    async def get_by_id_with_items(self, id: int) -> Order | None:
+    async def get_by_id_with_items(self, id: int, for_update: bool = False) -> Order | None:
+        stmt = select(Order).options(selectinload(Order.order_products)).where(Order.id == id)
+        if for_update:
+            stmt = stmt.with_for_update(key_share=True).execution_options(populate_existing=True)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_for_update(self, id: int) -> Order | None:
+        """Lock the order row (FOR NO KEY UPDATE: lines can still be inserted).
+
+        Taken before the order's stock rows, by every path that changes both.
+        """
         result = await self.session.execute(
             select(Order)
-            .options(
-                selectinload(Order.order_products).selectinload(OrderProduct.product)
-            )
             .where(Order.id == id)
+            .with_for_update(key_share=True)
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
-    async def get_all_with_items(self, offset: int = 0, limit: int = 100) -> list[Order]:
+    async def get_all_with_items(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> list[Order]:
+        stmt = self._apply_list_query(
+            select(Order).options(
+                selectinload(Order.order_products),
+                selectinload(Order.client)
+            ),
+            filters,
+            sort,
+        )
+        result = await self.session.execute(stmt.offset(offset).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_by_ids_with_items(self, ids: list[int]) -> list[Order]:
+        """Orders with items for the given ids in one `id = ANY(:ids)` query, in request order."""
+        ids = list(dict.fromkeys(ids))
         result = await self.session.execute(
             select(Order)
-            .options(
-                selectinload(Order.order_products).selectinload(OrderProduct.product),
-                selectinload(Order.client)
-            )
-            .order_by(Order.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .options(selectinload(Order.order_products))
+            .where(Order.id == any_(bindparam("ids", ids, type_=ARRAY(Order.id.type))))
+        )
+        by_id = {order.id: order for order in result.scalars().all()}
+        return [by_id[id] for id in ids if id in by_id]
+
+    async def get_by_client(
+        self, client_id: int, after_id: int | None = None, limit: int = 20
+    ) -> list[Order]:
+        """Client's orders, newest first, keyset-paged by id (ix_orders_client_id)."""
+        stmt = (
+            select(Order)
+            .options(selectinload(Order.order_products))
+            .where(Order.client_id == client_id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Order.id < after_id)
+        result = await self.session.execute(stmt.order_by(Order.id.desc()).limit(limit))
         return list(result.scalars().all())
 
-    async def get_by_id(self, id: int) -> Order | None:
+    async def get_last_created_at(self, client_id: int) -> datetime | None:
         result = await self.session.execute(
-            select(Order).where(Order.id == id)
+            select(func.max(Order.created_at)).where(Order.client_id == client_id)
         )
-        return result.scalar_one_or_none()
+        return result.scalar_one()
+
+    async def add_totals(self, order: Order, item_count: int, amount: Decimal) -> Order:
+        """Add to the order's totals as `col = col + delta` in SQL, so concurrent line
+        mutations on the same order cannot lose an update."""
+        order.item_count = Order.item_count + item_count
+        order.total_amount = Order.total_amount + amount
+        return await self.update(order)
 
     async def get_order_product(
         self, order_id: int, product_id: int
@@ -0,0 +1,70 @@
+"""Transactional outbox repository."""
+from datetime import UTC, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import EventType
+from app.db.models.outbox import OutboxEvent
+from app.repositories.base import BaseRepository
+
+# pg_try_advisory_xact_lock key: the relay that assigns stream positions.
+_RELAY_LOCK = 0x0B_0C_5E
+
+
+class OutboxRepository(BaseRepository[OutboxEvent]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(OutboxEvent, session)
+
+    def add_event(
+        self, event_type: EventType, aggregate_id: int, payload: dict
+    ) -> OutboxEvent:
+        """Stage an event in the current transaction; it is flushed and committed with the mutation."""
+        event = OutboxEvent(
+            aggregate_type=event_type.aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type.value,
+            payload=payload,
+        )
+        self.session.add(event)
+        return event
+
+    async def get_after(self, after: int, limit: int = 100) -> list[OutboxEvent]:
+        """Published events with position > after, in position order."""
+        result = await self.session.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.position > after)
+            .order_by(OutboxEvent.position)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def try_lock_relay(self) -> bool:
+        """Transaction-scoped lock: one relay assigns positions at a time; False if another one does."""
+        result = await self.session.execute(select(func.pg_try_advisory_xact_lock(_RELAY_LOCK)))
+        return result.scalar_one()
+
+    async def get_unpublished(self, limit: int) -> list[OutboxEvent]:
+        """Oldest committed events not published yet, in id order."""
+        result = await self.session.execute(
+            select(OutboxEvent)
+            .where(OutboxEvent.published_at.is_(None))
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def next_positions(self, count: int) -> list[int]:
+        """`count` new stream positions, ascending."""
+        result = await self.session.execute(
+            select(func.nextval("outbox_position_seq")).select_from(func.generate_series(1, count))
+        )
+        return sorted(result.scalars().all())
+
+    async def mark_published(self, events: list[OutboxEvent], positions: list[int]) -> None:
+        """Give events (in id order) their positions and mark them published."""
+        published_at = datetime.now(UTC).replace(tzinfo=None)
+        for event, position in zip(events, positions, strict=True):
+            event.position = position
+            event.published_at = published_at
+        await self.session.flush()
@@ -0,0 +1,142 @@
+"""Effective-dated product price repository."""
+from collections.abc import Mapping
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.product import Product
+from app.db.models.product_price import ProductPrice
+from app.repositories.base import BaseRepository
+
+
+class ProductPriceRepository(BaseRepository[ProductPrice]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(ProductPrice, session)
+
+    async def get_at(self, product_id: int, at: datetime) -> ProductPrice | None:
+        """The period covering `at`, if the product had a price then."""
+        result = await self.session.execute(
+            select(ProductPrice)
+            .where(ProductPrice.product_id == product_id, ProductPrice.valid_from <= at)
+            .order_by(ProductPrice.valid_from.desc())
+            .limit(1)
+        )
+        period = result.scalar_one_or_none()
+        if period is None or (period.valid_to is not None and period.valid_to <= at):
+            return None
+        return period
+
+    async def get_starting_after(self, product_id: int, after: datetime) -> list[ProductPrice]:
+        result = await self.session.execute(
+            select(ProductPrice)
+            .where(ProductPrice.product_id == product_id, ProductPrice.valid_from > after)
+            .order_by(ProductPrice.valid_from)
+        )
+        return list(result.scalars().all())
+
+    async def get_changes(
+        self,
+        start: datetime,
+        end: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 100,
+    ) -> list[ProductPrice]:
+        """Periods of all products starting in (start, end], keyset-paged by (valid_from, id)."""
+        stmt = select(ProductPrice).where(ProductPrice.valid_from > start)
+        if end is not None:
+            stmt = stmt.where(ProductPrice.valid_from <= end)
+        if after is not None:
+            stmt = stmt.where(tuple_(ProductPrice.valid_from, ProductPrice.id) > after)
+        result = await self.session.execute(
+            stmt.order_by(ProductPrice.valid_from, ProductPrice.id).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def set_prices(self, points: Mapping[int, list[tuple[datetime, Decimal]]]) -> None:
+        """Insert price changes {product_id: [(valid_from, price), ...]} into the products' timelines.
+
+        A change applies from valid_from until the product's next change. A change at the
+        same instant as an existing one replaces it. The affected products are locked first,
+        so concurrent updates of the same products are serialized.
+        """
+        if not points:
+            return
+        product_ids = sorted(points)
+        await self.session.execute(
+            select(Product.id)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update(key_share=True)
+        )
+        since = min(valid_from for changes in points.values() for valid_from, _ in changes)
+        result = await self.session.execute(
+            select(ProductPrice.id, ProductPrice.product_id, ProductPrice.valid_from, ProductPrice.price).where(
+                ProductPrice.product_id.in_(product_ids),
+                or_(ProductPrice.valid_to.is_(None), ProductPrice.valid_to > since),
+            )
+        )
+        existing = result.all()
+
+        timelines: dict[int, dict[datetime, Decimal]] = {product_id: {} for product_id in product_ids}
+        for period in existing:
+            timelines[period.product_id][period.valid_from] = period.price
+        for product_id, changes in points.items():
+            timelines[product_id].update(changes)
+
+        rows = []
+        for product_id, timeline in timelines.items():
+            starts = sorted(timeline)
+            for valid_from, valid_to in zip(starts, [*starts[1:], None], strict=True):
+                rows.append({
+                    "product_id": product_id,
+                    "price": timeline[valid_from],
+                    "valid_from": valid_from,
+                    "valid_to": valid_to,
+                })
+        if existing:
+            await self.session.execute(
+                delete(ProductPrice)
+                .where(ProductPrice.id.in_([period.id for period in existing]))
+                .execution_options(synchronize_session=False)
+            )
+        await self.session.execute(insert(ProductPrice), rows)
+
+    async def apply_due(
+        self,
+        at: datetime,
+        product_ids: list[int] | None = None,
+        starting_at: datetime | None = None,
+    ) -> list[Product]:
+        """Copy the price in effect at `at` to products.price where it differs; returns the changed products.
+
+        starting_at: only products whose current price started at that instant (ix_product_prices_valid_from).
+        """
+        stmt = (
+            update(Product)
+            .where(
+                ProductPrice.product_id == Product.id,
+                ProductPrice.valid_from <= at,
+                or_(ProductPrice.valid_to.is_(None), ProductPrice.valid_to > at),
+                Product.price != ProductPrice.price,
+                Product.is_deleted.is_(False),
+            )
+            .values(price=ProductPrice.price)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        if product_ids is not None:
+            stmt = stmt.where(Product.id.in_(product_ids))
+        if starting_at is not None:
+            stmt = stmt.where(ProductPrice.valid_from == starting_at)
+        changed = list((await self.session.execute(stmt)).scalars().all())
+        if not changed:
+            return []
+        # Re-read rather than RETURNING the entity: RETURNING does not load the quantity
+        # column_property, and touching it afterwards would lazy-load outside the greenlet.
+        result = await self.session.execute(
+            select(Product).where(Product.id.in_(changed)).order_by(Product.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
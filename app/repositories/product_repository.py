@@ -1,15 +1,56 @@
-from sqlalchemy import select
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Numeric, Select, case, cast, exists, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.models.category import Category
 from app.db.models.product import Product
+from app.db.models.stock import StockLevel, Warehouse
 from app.repositories.base import BaseRepository
+from app.repositories.filters import Filter, ListQuery
+
+# Some unreserved stock at an active warehouse; a per-product probe of
+# uq_stock_level_product_warehouse_stripe (product_id leads), stopping at the first row.
+_in_stock = (
+    exists()
+    .where(
+        StockLevel.product_id == Product.id,
+        StockLevel.quantity > StockLevel.reserved,
+        Warehouse.id == StockLevel.warehouse_id,
+        Warehouse.is_active.is_(True),
+    )
+)
 
 
 class ProductRepository(BaseRepository[Product]):
+    # Filter/sort columns are indexed (migration 04); in_stock is the EXISTS probe above.
+    list_query = ListQuery(
+        filters={
+            "category_id": Filter(Product.category_id),
+            "price_min": Filter(Product.price, "ge"),
+            "price_max": Filter(Product.price, "le"),
+            "in_stock": Filter(_in_stock, lambda in_stock, value: in_stock if value else ~in_stock),
+        },
+        sorts={
+            "category_id": Product.category_id,
+            "name": Product.name,
+            "price": Product.price,
+            "created_at": Product.created_at,
+        },
+        default_sort="name",
+        sort_indexes=(("category_id", "name"), ("category_id", "price")),
+        tiebreaker=Product.id,
+    )
+
     def __init__(self, session: AsyncSession):
         super().__init__(Product, session)
 
+    def _select_all(self) -> Select:
+        return select(Product).where(Product.is_deleted.is_(False))
+
     async def get_by_id_with_category(self, id: int) -> Product | None:
         result = await self.session.execute(
             select(Product)
@@ -18,29 +59,79 @@ class ProductRepository(BaseRepository[Product]):
         )
         return result.scalar_one_or_none()
 
-    async def get_all_with_category(self, offset: int = 0, limit: int = 100) -> list[Product]:
+    async def get_ids_by_sku(self, skus: list[str]) -> dict[str, int]:
+        """SKU -> id of non-deleted products; unknown SKUs are left out."""
         result = await self.session.execute(
-            select(Product)
-            .options(selectinload(Product.category))
-            .where(Product.is_deleted.is_(False))
-            .order_by(Product.name)
-            .offset(offset)
-            .limit(limit)
+            select(Product.sku, Product.id).where(Product.sku.in_(skus), Product.is_deleted.is_(False))
+        )
+        return dict(result.all())
+
+    async def get_all_with_category(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> list[Product]:
+        stmt = self._apply_list_query(
+            self._select_all().options(selectinload(Product.category)), filters, sort
         )
+        result = await self.session.execute(stmt.offset(offset).limit(limit))
         return list(result.scalars().all())
 
-    async def get_by_id(self, id: int) -> Product | None:
-        result = await self.session.execute(
-            select(Product).where(Product.id == id, Product.is_deleted.is_(False))
+    async def search(
+        self,
+        q: str,
+        category_id: int | None = None,
+        root_category_id: int | None = None,
+        after: tuple[Decimal, int] | None = None,
+        limit: int = 20,
+    ) -> list[tuple[Product, Decimal]]:
+        """Ranked search by name/SKU words, fuzzy name and SKU prefix; keyset-paged by (rank, id).
+
+        Matches are served by the GIN indexes on search_vector, name and sku (pg_trgm).
+        """
+        tsquery = func.websearch_to_tsquery("simple", q)
+        sku_prefix = q.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        is_sku_prefix = Product.sku.ilike(sku_prefix, escape="/")
+        # Rounded to numeric so the keyset cursor compares exactly across requests.
+        rank = func.round(
+            cast(
+                func.ts_rank_cd(Product.search_vector, tsquery)
+                + func.similarity(Product.name, q)
+                + case((is_sku_prefix, 1.0), else_=0.0),
+                Numeric,
+            ),
+            6,
         )
-        return result.scalar_one_or_none()
 
-    async def get_all(self, offset: int = 0, limit: int = 100) -> list[Product]:
+        stmt = (
+            select(Product, rank.label("rank"))
+            .where(
+                Product.is_deleted.is_(False),
+                or_(
+                    Product.search_vector.bool_op("@@")(tsquery),
+                    Product.name.bool_op("%")(q),
+                    is_sku_prefix,
+                ),
+            )
+        )
+        if category_id is not None:
+            stmt = stmt.where(Product.category_id == category_id)
+        if root_category_id is not None:
+            stmt = stmt.where(
+                Product.category_id.in_(
+                    select(Category.id).where(
+                        Category.root_category_id == root_category_id,
+                        Category.is_deleted.is_(False),
+                    )
+                )
+            )
+        if after is not None:
+            stmt = stmt.where(tuple_(rank, Product.id) < tuple_(*after))
+
         result = await self.session.execute(
-            select(Product)
-            .where(Product.is_deleted.is_(False))
-            .order_by(Product.name)
-            .offset(offset)
-            .limit(limit)
+            stmt.order_by(rank.desc(), Product.id.desc()).limit(limit)
         )
-        return list(result.scalars().all())
+        return [(product, product_rank) for product, product_rank in result.all()]
+
@@ -0,0 +1,320 @@
+"""Per-warehouse stock levels and order reservations."""
+from collections.abc import Sequence
+
+from sqlalchemy import Row, Select, bindparam, delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.product import Product
+from app.db.models.stock import StockLevel, StockReservation, Warehouse, product_stock
+from app.repositories.base import BaseRepository
+
+_levels = StockLevel.__table__
+
+# pg_try_advisory_xact_lock key: one full rebalancing pass at a time.
+_REBALANCE_LOCK = 0x57_0C_4B
+
+
+def _spread(units: int, parts: int) -> list[int]:
+    """`units` split into `parts` near-equal shares (the first ones get the remainder)."""
+    share, remainder = divmod(units, parts)
+    return [share + (1 if i < remainder else 0) for i in range(parts)]
+
+
+def _plan_rebalance(rows: list[Row], stripes: int, quantities: dict[int, int], retired: list[int]) -> None:
+    """Targets for one product's rows at one warehouse: new quantities by id, and the retired stripes' ids."""
+    active = sorted((row for row in rows if row.stripe < stripes), key=lambda r: r.stripe)
+    if not active:
+        return
+    available = sum(row.quantity - row.reserved for row in rows)
+    targets = {row.id: row.reserved for row in rows}
+    targets.update(
+        (row.id, row.reserved + share) for row, share in zip(active, _spread(available, len(active)), strict=True)
+    )
+    for row in rows:
+        if row.stripe >= stripes and row.reserved == 0:
+            retired.append(row.id)
+        elif targets[row.id] != row.quantity:
+            quantities[row.id] = targets[row.id]
+
+
+class StockRepository(BaseRepository[StockLevel]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(StockLevel, session)
+
+    def _select_totals(self, product_id: int) -> Select:
+        return (
+            select(
+                StockLevel.warehouse_id,
+                func.sum(StockLevel.quantity).label("quantity"),
+                func.sum(StockLevel.reserved).label("reserved"),
+                func.sum(StockLevel.quantity - StockLevel.reserved).label("available"),
+                func.count().label("stripes"),
+            )
+            .where(StockLevel.product_id == product_id)
+            .group_by(StockLevel.warehouse_id)
+        )
+
+    async def get_levels(self, product_id: int) -> list[Row]:
+        """Stock per warehouse (stripes summed up)."""
+        result = await self.session.execute(self._select_totals(product_id).order_by(StockLevel.warehouse_id))
+        return list(result.all())
+
+    async def get_level(self, product_id: int, warehouse_id: int) -> Row | None:
+        result = await self.session.execute(
+            self._select_totals(product_id).where(StockLevel.warehouse_id == warehouse_id)
+        )
+        return result.one_or_none()
+
+    async def lock_stripes(self, product_id: int, warehouse_id: int) -> list[StockLevel]:
+        """Rows of a product at a warehouse, locked in id order (as reserve() locks them)."""
+        result = await self.session.execute(
+            select(StockLevel)
+            .where(StockLevel.product_id == product_id, StockLevel.warehouse_id == warehouse_id)
+            .order_by(StockLevel.id)
+            .with_for_update()
+        )
+        return list(result.scalars().all())
+
+    async def get_available(self, product_id: int) -> int:
+        """Unreserved units over all active warehouses (product_stock view)."""
+        result = await self.session.execute(
+            select(func.coalesce(
+                select(product_stock.c.available).where(product_stock.c.product_id == product_id).scalar_subquery(),
+                0,
+            ))
+        )
+        return result.scalar_one()
+
+    async def set_quantity(
+        self, product_id: int, warehouse_id: int, quantity: int, stripes: Sequence[StockLevel] = ()
+    ) -> None:
+        """Set units on hand at a warehouse, spread evenly over its locked stripes (lock_stripes).
+
+        Without stripes the first row is created. Below the reserved units violates check_stock_level_reserved.
+        """
+        if not stripes:
+            stmt = insert(StockLevel).values(product_id=product_id, warehouse_id=warehouse_id, quantity=quantity)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_stock_level_product_warehouse_stripe",
+                    set_={"quantity": stmt.excluded.quantity},
+                )
+            )
+            return
+        available = quantity - sum(level.reserved for level in stripes)
+        await self._set_quantities({
+            level.id: level.reserved + share
+            for level, share in zip(stripes, _spread(available, len(stripes)), strict=True)
+        })
+
+    async def reserve(self, product_id: int, quantity: int) -> list[tuple[int, int, int]]:
+        """Reserve units at active warehouses; returns [(warehouse_id, stripe, units)], empty if there are not enough.
+
+        First tries one random row (location or stripe) that can cover everything, skipping
+        rows other checkouts hold, so concurrent orders of a hot product land on different
+        rows. Only when none is free does it wait: it locks all rows of the product (in id
+        order) and splits the units over them, largest stock first.
+        """
+        available = StockLevel.quantity - StockLevel.reserved
+        locations = (
+            select(StockLevel.id)
+            .join(Warehouse, Warehouse.id == StockLevel.warehouse_id)
+            .where(StockLevel.product_id == product_id, Warehouse.is_active.is_(True))
+        )
+
+        pick = (
+            locations.where(available >= quantity)
+            .order_by(func.random())
+            .limit(1)
+            .with_for_update(of=StockLevel, skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(StockLevel)
+            .where(StockLevel.id == pick.scalar_subquery())
+            .values(reserved=StockLevel.reserved + quantity)
+            .returning(StockLevel.warehouse_id, StockLevel.stripe)
+            .execution_options(synchronize_session=False)
+        )
+        picked = result.one_or_none()
+        if picked is not None:
+            return [(picked.warehouse_id, picked.stripe, quantity)]
+
+        result = await self.session.execute(
+            locations.add_columns(StockLevel.warehouse_id, StockLevel.stripe, available.label("available"))
+            .order_by(StockLevel.id)
+            .with_for_update(of=StockLevel)
+        )
+        rows = sorted(result.all(), key=lambda row: row.available, reverse=True)
+        if sum(row.available for row in rows) < quantity:
+            return []
+        allocations, params, remaining = [], [], quantity
+        for row in rows:
+            units = min(remaining, row.available)
+            if units <= 0:
+                break
+            allocations.append((row.warehouse_id, row.stripe, units))
+            params.append({"level_id": row.id, "units": units})
+            remaining -= units
+        await self.session.execute(
+            update(_levels)
+            .where(_levels.c.id == bindparam("level_id"))
+            .values(reserved=_levels.c.reserved + bindparam("units")),
+            params,
+        )
+        return allocations
+
+    async def add_reservations(
+        self, order_id: int, tenant_id: int, product_id: int, allocations: list[tuple[int, int, int]]
+    ) -> None:
+        """Record reserve() allocations for an order line (adds to earlier ones on the same row)."""
+        stmt = insert(StockReservation).values([
+            {
+                "order_id": order_id,
+                "tenant_id": tenant_id,
+                "product_id": product_id,
+                "warehouse_id": warehouse_id,
+                "stripe": stripe,
+                "quantity": units,
+            }
+            for warehouse_id, stripe, units in allocations
+        ])
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_stock_reservation",
+                set_={"quantity": StockReservation.quantity + stmt.excluded.quantity},
+            )
+        )
+
+    async def release_order(self, order_id: int) -> dict[int, int]:
+        """Return an order's reserved units to stock (cancelled or deleted); {product_id: units}."""
+        return await self._settle(order_id, shipped=False)
+
+    async def ship_order(self, order_id: int) -> dict[int, int]:
+        """Take an order's reserved units off hand (completed); {product_id: units}."""
+        return await self._settle(order_id, shipped=True)
+
+    async def _settle(self, order_id: int, shipped: bool) -> dict[int, int]:
+        # The DELETE claims the reservations, so settling an order twice is a no-op.
+        result = await self.session.execute(
+            delete(StockReservation)
+            .where(StockReservation.order_id == order_id)
+            .returning(
+                StockReservation.product_id,
+                StockReservation.warehouse_id,
+                StockReservation.stripe,
+                StockReservation.quantity,
+            )
+        )
+        units_by_row = {(row.product_id, row.warehouse_id, row.stripe): row.quantity for row in result.all()}
+        if not units_by_row:
+            return {}
+        # Stock rows are locked and updated in id order, like reserve() and lock_stripes() lock them.
+        result = await self.session.execute(
+            select(StockLevel.id, StockLevel.product_id, StockLevel.warehouse_id, StockLevel.stripe)
+            .where(tuple_(StockLevel.product_id, StockLevel.warehouse_id, StockLevel.stripe).in_(list(units_by_row)))
+            .order_by(StockLevel.id)
+            .with_for_update()
+        )
+        levels = [(row.id, units_by_row[(row.product_id, row.warehouse_id, row.stripe)]) for row in result.all()]
+        values = {"reserved": _levels.c.reserved - bindparam("units")}
+        if shipped:
+            values["quantity"] = _levels.c.quantity - bindparam("units")
+        await self.session.execute(
+            update(_levels).where(_levels.c.id == bindparam("level_id")).values(values),
+            [{"level_id": level_id, "units": units} for level_id, units in levels],
+        )
+        settled: dict[int, int] = {}
+        for (product_id, _, _), units in units_by_row.items():
+            settled[product_id] = settled.get(product_id, 0) + units
+        return settled
+
+    async def try_lock_rebalance(self) -> bool:
+        """Transaction-scoped lock for a full rebalancing pass; False if another process runs one."""
+        result = await self.session.execute(select(func.pg_try_advisory_xact_lock(_REBALANCE_LOCK)))
+        return result.scalar_one()
+
+    async def rebalance(self, product_ids: list[int] | None = None) -> int:
+        """Even out the available units of striped products over their stripes, per warehouse.
+
+        Creates missing stripes and empties those beyond products.stock_stripes (deleted
+        once nothing is reserved on them). Rows held by checkouts are skipped, never waited
+        for; they catch up on a later pass. Totals do not change. Returns the rows written.
+        """
+        candidates = product_ids
+        if candidates is None:
+            # Both sides are served by partial indexes (ix_products_striped, ix_stock_levels_striped).
+            candidates = select(Product.id).where(Product.stock_stripes > 1).union(
+                select(StockLevel.product_id).where(StockLevel.stripe > 0)
+            )
+        result = await self.session.execute(
+            select(
+                StockLevel.id,
+                StockLevel.product_id,
+                StockLevel.warehouse_id,
+                StockLevel.stripe,
+                StockLevel.quantity,
+                StockLevel.reserved,
+                Product.stock_stripes,
+            )
+            .join(Product, Product.id == StockLevel.product_id)
+            .where(StockLevel.product_id.in_(candidates))
+            .order_by(StockLevel.id)
+            .with_for_update(of=StockLevel, skip_locked=True)
+        )
+        groups: dict[tuple[int, int], list[Row]] = {}
+        stripe_counts: dict[int, int] = {}
+        for row in result.all():
+            groups.setdefault((row.product_id, row.warehouse_id), []).append(row)
+            stripe_counts[row.product_id] = row.stock_stripes
+
+        created = await self._add_missing_stripes(groups, stripe_counts)
+        quantities: dict[int, int] = {}
+        retired: list[int] = []
+        for (product_id, _), rows in groups.items():
+            _plan_rebalance(rows, stripe_counts[product_id], quantities, retired)
+
+        await self._set_quantities(quantities)
+        if retired:
+            await self.session.execute(
+                delete(StockLevel)
+                .where(StockLevel.id.in_(retired))
+                .execution_options(synchronize_session=False)
+            )
+        return created + len(quantities) + len(retired)
+
+    async def _add_missing_stripes(
+        self, groups: dict[tuple[int, int], list[Row]], stripe_counts: dict[int, int]
+    ) -> int:
+        """Insert the stripes absent from the locked groups, appending them; returns the rows created."""
+        # Not among the locked rows: absent, or held by a checkout (then the insert conflicts and skips it).
+        missing = [
+            {"product_id": product_id, "warehouse_id": warehouse_id, "stripe": stripe}
+            for (product_id, warehouse_id), rows in groups.items()
+            for stripe in set(range(stripe_counts[product_id])).difference(row.stripe for row in rows)
+        ]
+        if not missing:
+            return 0
+        stmt = insert(StockLevel).values(missing).on_conflict_do_nothing(
+            constraint="uq_stock_level_product_warehouse_stripe"
+        )
+        result = await self.session.execute(
+            stmt.returning(
+                StockLevel.id, StockLevel.product_id, StockLevel.warehouse_id, StockLevel.stripe,
+                StockLevel.quantity, StockLevel.reserved,
+            )
+        )
+        created = 0
+        for row in result.all():
+            groups[(row.product_id, row.warehouse_id)].append(row)
+            created += 1
+        return created
+
+    async def _set_quantities(self, quantities: dict[int, int]) -> None:
+        """quantity by stock_levels.id, in id order."""
+        if not quantities:
+            return
+        await self.session.execute(
+            update(_levels).where(_levels.c.id == bindparam("level_id")).values(quantity=bindparam("new_quantity")),
+            [{"level_id": level_id, "new_quantity": quantity} for level_id, quantity in sorted(quantities.items())],
+        )
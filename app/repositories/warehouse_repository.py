@@ -0,0 +1,10 @@
+"""Warehouse (stock location) repository."""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.stock import Warehouse
+from app.repositories.base import BaseRepository
+
+
+class WarehouseRepository(BaseRepository[Warehouse]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Warehouse, session)
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SlowQueryResponse(BaseModel):
+    id: int = Field(..., description="Sequence number within the worker process")
+    worker: int = Field(..., description="PID of the worker process that captured the statement")
+    statement: str
+    parameters: list[str]
+    duration_ms: float
+    origin: str = Field(..., description="Repository method that issued the statement")
+    request: str = Field(..., description="Method and path of the request being served")
+    captured_at: datetime
+    plan: str | None = Field(None, description="EXPLAIN (ANALYZE, BUFFERS) output, for sampled statements")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RestoreResponse(BaseModel):
+    restored: dict[str, list[int]] = Field(
+        ..., description="Restored ids by table; includes archived parent categories restored along"
+    )
@@ -1,5 +1,10 @@
+from datetime import datetime
+from decimal import Decimal
+
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from app.schemas.common import NaiveUTCDatetime
+
 
 class ClientBase(BaseModel):
     full_name: str = Field(..., max_length=255, description="Full name or company name")
@@ -17,7 +22,24 @@ class ClientUpdate(BaseModel):
     email: EmailStr | None = None
 
 
+class ClientFilters(BaseModel):
+    """List filters for GET /clients/ (query parameters)."""
+    email: EmailStr | None = None
+    created_from: NaiveUTCDatetime | None = None
+    created_to: NaiveUTCDatetime | None = None
+
+
 class ClientResponse(ClientBase):
     id: int
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class ClientSummaryResponse(BaseModel):
+    """Precomputed order aggregates for a client."""
+    client_id: int
+    order_count: int = 0
+    lifetime_spend: Decimal = Decimal(0)
+    last_order_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,14 @@
+from datetime import UTC, datetime
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """DB timestamps are stored as naive UTC; normalize aware input to match."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+NaiveUTCDatetime = Annotated[datetime, AfterValidator(_to_naive_utc)]
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class QueryStatsResponse(BaseModel):
+    label: str = Field(..., description="Method and route of the request")
+    count: int
+    db_time_ms: float
+    repeated: dict[str, int] = Field(..., description="Statements over the N+1 threshold, with execution counts")
+    finished_at: datetime
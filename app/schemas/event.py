@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class EventResponse(BaseModel):
+    id: int
+    position: int = Field(..., description="Stream position; pass the last seen position as `after`")
+    event_type: str
+    aggregate_type: str
+    aggregate_id: int
+    payload: dict
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.core.enums import JobStatus
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    last_error: str | None
+    result: dict | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,9 +1,11 @@
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field, ConfigDict
 
 from app.core.enums import OrderStatus
 from app.db.models.order import Order
+from app.schemas.common import NaiveUTCDatetime
 
 
 class OrderProductAdd(BaseModel):
@@ -16,9 +18,21 @@ class OrderProductAddBatch(BaseModel):
     items: list[OrderProductAdd] = Field(..., min_length=1, max_length=100)
 
 
+class OrderFilters(BaseModel):
+    """List filters for GET /orders/ (query parameters)."""
+    status: OrderStatus | None = None
+    client_id: int | None = None
+    tenant_id: int | None = None
+    created_from: NaiveUTCDatetime | None = None
+    created_to: NaiveUTCDatetime | None = None
+    total_from: Decimal | None = Field(None, ge=0, description="Orders with total_amount >= this")
+    total_to: Decimal | None = Field(None, ge=0, description="Orders with total_amount < this")
+
+
 class OrderProductResponse(BaseModel):
     product_id: int
     name: str | None = None
+    sku: str | None = None
     quantity: int
     price_at_order: Decimal
     
@@ -28,7 +42,11 @@ class OrderProductResponse(BaseModel):
 class OrderResponse(BaseModel):
     id: int
     client_id: int
+    tenant_id: int
     status: OrderStatus
+    item_count: int
+    total_amount: Decimal
+    updated_at: datetime
     items: list[OrderProductResponse] = Field(alias="order_products")
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -39,11 +57,16 @@ class OrderResponse(BaseModel):
         return cls(
             id=order.id,
             client_id=order.client_id,
+            tenant_id=order.tenant_id,
             status=order.status,
+            item_count=order.item_count,
+            total_amount=order.total_amount,
+            updated_at=order.updated_at,
             order_products=[
                 OrderProductResponse(
                     product_id=op.product_id,
-                    name=op.product.name if op.product else None,
+                    name=op.product_name,
+                    sku=op.sku,
                     quantity=op.quantity,
                     price_at_order=op.price_at_order,
                 )
@@ -1,3 +1,4 @@
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -5,7 +6,9 @@ from pydantic import BaseModel, Field, ConfigDict
 
 class ProductBase(BaseModel):
     name: str = Field(..., max_length=255)
-    quantity: int = Field(..., ge=0, description="Left in stock")
+    quantity: int = Field(
+        ..., ge=0, description="Available over all warehouses; on create, units on hand at the default warehouse"
+    )
     price: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2)
     category_id: int
 
@@ -16,14 +19,70 @@ class ProductCreate(ProductBase):
 
 class ProductUpdate(BaseModel):
     name: str | None = Field(None, max_length=255)
-    quantity: int | None = Field(None, ge=0)
+    quantity: int | None = Field(
+        None,
+        ge=0,
+        description="Units on hand at the default warehouse (others: PUT /products/{id}/stock/{warehouse_id})",
+    )
     price: Decimal | None = Field(None, gt=0, max_digits=10, decimal_places=2)
     category_id: int | None = None
     sku: str | None = Field(None, max_length=50)
+    stock_stripes: int | None = Field(
+        None, ge=1, le=64, description="Stock rows per warehouse; more for hot products, 1 to turn striping off"
+    )
 
 
 class ProductResponse(ProductBase):
     id: int
     sku: str
+    stock_stripes: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductFilters(BaseModel):
+    """List filters for GET /products/ (query parameters)."""
+    category_id: int | None = None
+    price_min: Decimal | None = Field(None, ge=0)
+    price_max: Decimal | None = Field(None, ge=0)
+    in_stock: bool | None = None
+
+
+class ProductSearchPage(BaseModel):
+    """One page of ranked search results; pass next_cursor as `cursor` to continue."""
+    items: list[ProductResponse]
+    next_cursor: str | None = None
+
+
+class ProductPriceResponse(BaseModel):
+    """A price and the period it is in effect (UTC)."""
+    product_id: int
+    price: Decimal
+    valid_from: datetime
+    valid_to: datetime | None = Field(None, description="Start of the next price; null for the latest one")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductPricePage(BaseModel):
+    """Upcoming price changes of all products; pass next_cursor as `cursor` to continue."""
+    items: list[ProductPriceResponse]
+    next_cursor: str | None = None
+
+
+class PriceListItem(BaseModel):
+    sku: str = Field(..., max_length=50)
+    price: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2)
+    valid_from: datetime | None = Field(
+        None, description="When the price takes effect (UTC if no offset); now if omitted"
+    )
+
+
+class PriceListImport(BaseModel):
+    items: list[PriceListItem] = Field(..., min_length=1, max_length=10_000)
+
+
+class PriceImportResult(BaseModel):
+    imported: int = Field(..., description="Price changes written")
+    applied: int = Field(..., description="Products whose current price changed")
+    scheduled: int = Field(..., description="Changes taking effect later")
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class WarehouseCreate(BaseModel):
+    code: str = Field(..., max_length=50)
+    name: str = Field(..., max_length=255)
+
+
+class WarehouseUpdate(BaseModel):
+    name: str | None = Field(None, max_length=255)
+    is_active: bool | None = Field(None, description="Inactive warehouses take no new reservations")
+
+
+class WarehouseResponse(BaseModel):
+    id: int
+    code: str
+    name: str
+    is_active: bool
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StockLevelUpdate(BaseModel):
+    quantity: int = Field(..., ge=0, description="Units on hand at the warehouse")
+
+
+class StockLevelResponse(BaseModel):
+    warehouse_id: int
+    quantity: int = Field(..., description="Units on hand")
+    reserved: int = Field(..., description="Units held by open orders")
+    available: int
+    stripes: int = Field(..., description="Rows the warehouse's stock is split over")
+
+    model_config = ConfigDict(from_attributes=True)
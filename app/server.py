@@ -0,0 +1,59 @@
+"""Production server: N uvicorn workers with uvloop/httptools when installed.
+
+    python -m app.server
+"""
+import importlib.util
+import logging
+import os
+import tempfile
+
+import uvicorn
+
+from app.core import multiprocess
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    workers = settings.worker_count
+    # Workers are spawned processes that re-read Settings; pin the count so each one
+    # sizes its pool from the same value (see Settings.db_pool_limits).
+    os.environ["WEB_WORKERS"] = str(workers)
+    if workers > 1 or settings.metrics_multiprocess_dir:
+        # A scrape reaches one worker; it merges the others' values from this directory.
+        directory = settings.metrics_multiprocess_dir or tempfile.mkdtemp(prefix="erp-metrics-")
+        multiprocess.prepare(directory)
+        os.environ["METRICS_MULTIPROCESS_DIR"] = directory
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    pool_size, max_overflow = settings.db_pool_limits
+    per_worker = pool_size + max_overflow + settings.db_side_connections
+    logging.basicConfig(level=logging.INFO)
+    logger.info(
+        "Starting %d workers (loop=%s, http=%s), DB pool %d+%d per worker, up to %d connections per database",
+        workers, loop, http, pool_size, max_overflow, workers * per_worker,
+    )
+    if 0 < settings.db_max_connections < workers * per_worker:
+        logger.warning(
+            "DB_MAX_CONNECTIONS=%d is below one pooled and %d side connection(s) per worker; lower WEB_WORKERS",
+            settings.db_max_connections, settings.db_side_connections,
+        )
+    uvicorn.run(
+        "app.main:app",
+        host=settings.web_host,
+        port=settings.web_port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.web_backlog,
+        timeout_keep_alive=settings.web_keepalive_timeout,
+        timeout_graceful_shutdown=settings.web_graceful_timeout,
+        limit_max_requests=settings.web_max_requests or None,
+        proxy_headers=True,
+        access_log=settings.web_access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Archival of soft-deleted rows and their restore."""
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.enums import ArchivedEntity, JobKind
+from app.core.metrics import timed_methods
+from app.db.invalidation import publish
+from app.db.models.job import Job
+from app.repositories.archive_repository import ArchiveRepository
+from app.repositories.job_repository import JobRepository
+from app.services.category_service import category_tree_cache
+from app.services.client_service import client_cache
+from app.services.product_service import product_cache
+
+
+@timed_methods
+class ArchiveService:
+    """Moves long-deleted clients, products and categories out of the hot tables, and back on request."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @cached_property
+    def repository(self) -> ArchiveRepository:
+        return ArchiveRepository(self.session)
+
+    @cached_property
+    def job_repository(self) -> JobRepository:
+        return JobRepository(self.session)
+
+    async def enqueue_archival(self) -> Job:
+        job = await self.job_repository.enqueue(JobKind.ARCHIVE_SOFT_DELETED, {}, settings.jobs_max_attempts)
+        await self.session.commit()
+        return job
+
+    async def archive_soft_deleted(self) -> dict[str, int]:
+        """Move rows deleted longer than the retention window, one short transaction per batch. Idempotent.
+
+        Products go first: a category is only archived once none of its products is left.
+        Categories repeat until a pass moves nothing, so subtrees go leaves first.
+        """
+        deleted_before = (
+            datetime.now(UTC).replace(tzinfo=None)
+            - timedelta(days=settings.archive_retention_days)
+        )
+        moved = {}
+        for entity in (ArchivedEntity.PRODUCTS, ArchivedEntity.CATEGORIES, ArchivedEntity.CLIENTS):
+            moved[entity.value] = 0
+            while batch := await self.repository.archive_batch(
+                entity, deleted_before, settings.archive_batch_size
+            ):
+                await self.session.commit()
+                moved[entity.value] += batch
+        return moved
+
+    async def restore(self, entity: ArchivedEntity, id: int) -> dict[str, list[int]]:
+        """Move an archived row back into its table, undeleted, with any archived categories it needs.
+
+        Returns the restored ids by table.
+        """
+        row = await self.repository.get_archived(entity, id)
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No archived row in {entity.value} with this id"
+            )
+        category_ids: list[int] = []
+        if entity is ArchivedEntity.CATEGORIES:
+            category_ids = await self.repository.get_archived_category_chain(id)
+        elif entity is ArchivedEntity.PRODUCTS:
+            category_ids = await self.repository.get_archived_category_chain(row.category_id)
+
+        restored: dict[str, list[int]] = {}
+        try:
+            if category_ids:
+                restored[ArchivedEntity.CATEGORIES.value] = await self.repository.restore(
+                    ArchivedEntity.CATEGORIES, category_ids
+                )
+                await publish(self.session, category_tree_cache)
+            if entity is not ArchivedEntity.CATEGORIES:
+                restored[entity.value] = await self.repository.restore(entity, [id])
+                # Workers may have cached the row as not found.
+                await publish(self.session, self._entity_cache(entity), id)
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A live row already uses this SKU or email"
+            ) from None
+        if category_ids:
+            category_tree_cache.clear()
+        if entity is not ArchivedEntity.CATEGORIES:
+            self._entity_cache(entity).pop(id)
+        return restored
+
+    @staticmethod
+    def _entity_cache(entity: ArchivedEntity) -> TTLCache:
+        return product_cache if entity is ArchivedEntity.PRODUCTS else client_cache
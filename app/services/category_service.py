@@ -1,35 +1,66 @@
 """Category business logic: create, update, tree and root_category_id."""
 from datetime import datetime, timezone
+from functools import cached_property
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.enums import JobKind
+from app.core.metrics import timed_methods
+from app.db.invalidation import publish
 from app.db.models.category import Category
+from app.db.models.job import Job
 from app.repositories.category_repository import CategoryRepository
+from app.repositories.job_repository import JobRepository
 from app.schemas.category import CategoryCreate, CategoryTreeResponse
 
 
-def _build_tree(categories: list[Category], parent_id: int | None = None) -> list[CategoryTreeResponse]:
-    """Build CategoryTreeResponse tree from flat list (avoids lazy load during serialization)."""
-    nodes = [c for c in categories if c.parent_id == parent_id]
-    return [
-        CategoryTreeResponse(
-            id=c.id,
-            name=c.name,
-            parent_id=c.parent_id,
-            children=_build_tree(categories, c.id),
-        )
-        for c in sorted(nodes, key=lambda x: x.name)
-    ]
+class CategoryTree:
+    """Snapshot of all non-deleted categories with response nodes built once.
+
+    Built iteratively from the flat list (no recursion, no lazy loads), so it can be
+    cached per worker and shared by concurrent requests; treat it as read-only.
+    """
+
+    def __init__(self, categories: list[Category]):
+        self.nodes: dict[int, CategoryTreeResponse] = {
+            c.id: CategoryTreeResponse(id=c.id, name=c.name, parent_id=c.parent_id, children=[])
+            for c in categories
+        }
+        self.roots: list[CategoryTreeResponse] = []
+        for c in sorted(categories, key=lambda x: x.name):
+            node = self.nodes[c.id]
+            if c.parent_id is None:
+                self.roots.append(node)
+            elif c.parent_id in self.nodes:
+                self.nodes[c.parent_id].children.append(node)
 
 
+category_tree_cache = TTLCache(
+    "category_tree",
+    ttl=settings.category_tree_cache_ttl,
+    maxsize=1,
+    stale_ttl=settings.category_tree_cache_stale_ttl,
+)
+
+
+@timed_methods
 class CategoryService:
     """Category CRUD and hierarchy; maintains root_category_id on create/update."""
 
     def __init__(self, session: AsyncSession):
-        self.repository = CategoryRepository(session)
         self.session = session
 
+    @cached_property
+    def repository(self) -> CategoryRepository:
+        return CategoryRepository(self.session)
+
+    @cached_property
+    def job_repository(self) -> JobRepository:
+        return JobRepository(self.session)
+
     async def create_category(self, data: CategoryCreate) -> Category:
         parent = None
         if data.parent_id:
@@ -51,46 +82,56 @@ class CategoryService:
             (parent.root_category_id or parent.id) if parent else new_category.id
         )
         await self.repository.update(new_category)
+        await publish(self.session, category_tree_cache)
         await self.session.commit()
+        category_tree_cache.clear()
         return new_category
 
     async def get_category(self, category_id: int) -> CategoryTreeResponse:
-        flat = await self.repository.get_all_flat()
-        by_id = {c.id: c for c in flat}
-        if category_id not in by_id:
+        tree = await self._get_tree()
+        if category_id not in tree.nodes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
-        c = by_id[category_id]
-        return CategoryTreeResponse(
-            id=c.id,
-            name=c.name,
-            parent_id=c.parent_id,
-            children=_build_tree(flat, c.id),
-        )
+        return tree.nodes[category_id]
 
     async def get_categories(self, offset: int = 0, limit: int = 100) -> list[Category]:
         return await self.repository.get_all_with_children(offset, limit)
 
     async def get_root_categories(self) -> list[CategoryTreeResponse]:
         """Return root categories as a full tree (no lazy load during serialization)."""
-        flat = await self.repository.get_all_flat()
-        return _build_tree(flat, parent_id=None)
+        tree = await self._get_tree()
+        return tree.roots
 
     async def get_category_children(self, category_id: int) -> list[CategoryTreeResponse]:
-        flat = await self.repository.get_all_flat()
-        by_id = {c.id: c for c in flat}
-        if category_id not in by_id:
+        tree = await self._get_tree()
+        if category_id not in tree.nodes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Category not found"
             )
-        return _build_tree(flat, category_id)
+        return tree.nodes[category_id].children
+
+    async def _get_tree(self) -> CategoryTree:
+        """Cached tree; concurrent requests after an invalidation share one rebuild."""
+        try:
+            return await category_tree_cache.get_or_load("tree", self._load_tree, settings.cache_load_timeout)
+        except TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Category tree is being reloaded, retry shortly"
+            ) from None
+
+    async def _load_tree(self) -> CategoryTree:
+        return CategoryTree(await self.repository.get_all_flat())
 
     async def update_category(
         self, category_id: int, data: CategoryCreate
-    ) -> Category:
+    ) -> tuple[Category, Job | None]:
+        """Update name/parent. On a parent change the category itself is re-rooted at once;
+        its descendants are re-rooted by the returned background job.
+        """
         category = await self.repository.get_by_id(category_id)
         if not category:
             raise HTTPException(
@@ -109,6 +150,7 @@ class CategoryService:
         old_parent_id = category.parent_id
         category.parent_id = data.parent_id
 
+        job = None
         if data.parent_id != old_parent_id:
             if data.parent_id:
                 parent = await self.repository.get_by_id(data.parent_id)
@@ -116,13 +158,31 @@ class CategoryService:
             else:
                 new_root_id = category_id
             category.root_category_id = new_root_id
-            await self.repository.update_root_category_id_for_subtree(
-                category_id, new_root_id
+            # Committed with the move, so the subtree rewrite cannot be lost.
+            job = await self.job_repository.enqueue(
+                JobKind.CATEGORY_SUBTREE_ROOT,
+                {"category_id": category_id},
+                settings.jobs_max_attempts,
             )
 
         await self.repository.update(category)
+        await publish(self.session, category_tree_cache)
         await self.session.commit()
-        return category
+        category_tree_cache.clear()
+        return category, job
+
+    async def update_subtree_root(self, category_id: int) -> int:
+        """Re-root all descendants of a moved category in short batches. Idempotent.
+
+        Each batch commits on its own, so row locks on categories are held briefly.
+        """
+        updated = 0
+        while batch := await self.repository.update_root_category_id_for_subtree(
+            category_id, settings.category_subtree_batch_size
+        ):
+            await self.session.commit()
+            updated += batch
+        return updated
 
     async def delete_category(self, category_id: int) -> None:
         category = await self.repository.get_by_id(category_id)
@@ -135,4 +195,6 @@ class CategoryService:
         category.is_deleted = True
         category.deleted_at = datetime.now(timezone.utc).replace(tzinfo=None)
         await self.repository.update(category)
+        await publish(self.session, category_tree_cache)
         await self.session.commit()
+        category_tree_cache.clear()
@@ -1,22 +1,51 @@
 """Client business logic: CRUD and soft delete."""
 from datetime import datetime, timezone
+from functools import cached_property
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import timed_methods
+from app.db.invalidation import publish
 from app.db.models.client import Client
+from app.db.models.order import Order
+from app.db.session import read_other_shards, searches_all_shards
 from app.repositories.client_repository import ClientRepository
-from app.schemas.client import ClientCreate, ClientUpdate
+from app.repositories.client_stats_repository import ClientStatsRepository
+from app.repositories.filters import InvalidQueryError
+from app.repositories.order_repository import OrderRepository
+from app.schemas.client import ClientCreate, ClientFilters, ClientResponse, ClientSummaryResponse, ClientUpdate
 
+client_cache = TTLCache(
+    "client",
+    ttl=settings.client_cache_ttl,
+    maxsize=settings.client_cache_size,
+    stale_ttl=settings.client_cache_stale_ttl,
+)
 
+
+@timed_methods
 class ClientService:
     """Client CRUD; enforces unique email and soft delete."""
 
     def __init__(self, session: AsyncSession):
-        self.repository = ClientRepository(session)
         self.session = session
 
+    @cached_property
+    def repository(self) -> ClientRepository:
+        return ClientRepository(self.session)
+
+    @cached_property
+    def order_repository(self) -> OrderRepository:
+        return OrderRepository(self.session)
+
+    @cached_property
+    def stats_repository(self) -> ClientStatsRepository:
+        return ClientStatsRepository(self.session)
+
     async def create_client(self, data: ClientCreate) -> Client:
         existing = await self.repository.get_by_email(data.email)
         if existing:
@@ -28,7 +57,9 @@ class ClientService:
         new_client = Client(**data.model_dump())
         try:
             await self.repository.create(new_client)
+            await publish(self.session, client_cache, new_client.id)
             await self.session.commit()
+            client_cache.pop(new_client.id)
             return new_client
         except IntegrityError:
             await self.session.rollback()
@@ -37,17 +68,71 @@ class ClientService:
                 detail="Client with this email already exists"
             )
 
-    async def get_client(self, client_id: int) -> Client:
-        client = await self.repository.get_by_id(client_id)
-        if not client:
+    async def get_client(self, client_id: int) -> ClientResponse:
+        """Cached; concurrent requests for a client share one query."""
+        try:
+            client = await client_cache.get_or_load(
+                client_id, lambda: self._load_client(client_id), settings.cache_load_timeout
+            )
+        except TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Client is being reloaded, retry shortly"
+            ) from None
+        if client is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Client not found"
             )
         return client
 
-    async def get_clients(self, offset: int = 0, limit: int = 100) -> list[Client]:
-        return await self.repository.get_all(offset, limit)
+    async def _load_client(self, client_id: int) -> ClientResponse | None:
+        """Detached from the session so it can be cached; None (not found) is cached too."""
+        client = await self.repository.get_by_id(client_id)
+        return ClientResponse.model_validate(client) if client else None
+
+    async def get_clients(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: ClientFilters | None = None,
+        sort: str | None = None,
+    ) -> list[Client]:
+        try:
+            return await self.repository.get_all(
+                offset, limit, filters.model_dump(exclude_none=True) if filters else None, sort
+            )
+        except InvalidQueryError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            ) from exc
+
+    async def get_clients_by_ids(self, ids: list[int]) -> list[Client]:
+        """Batch lookup; unknown or deleted ids are skipped."""
+        return await self.repository.get_by_ids(ids)
+
+    async def get_client_orders(
+        self, client_id: int, after_id: int | None = None, limit: int = 20
+    ) -> list[Order]:
+        await self.get_client(client_id)
+        orders = await self.order_repository.get_by_client(client_id, after_id, limit)
+        if searches_all_shards(self.session):
+            # Snowflake ids are time-ordered across shards: merge by id.
+            for found in await read_other_shards(
+                self.session, lambda session: OrderRepository(session).get_by_client(client_id, after_id, limit)
+            ):
+                orders.extend(found)
+            orders = sorted(orders, key=lambda order: order.id, reverse=True)[:limit]
+        return orders
+
+    async def get_client_summary(self, client_id: int) -> ClientSummaryResponse:
+        """Served from client_stats; no join over orders/order_products."""
+        await self.get_client(client_id)
+        stats = await self.stats_repository.get_by_client_id(client_id)
+        if stats is None:
+            return ClientSummaryResponse(client_id=client_id)
+        return ClientSummaryResponse.model_validate(stats)
 
     async def update_client(self, client_id: int, data: ClientUpdate) -> Client:
         client = await self.repository.get_by_id(client_id)
@@ -71,7 +156,9 @@ class ClientService:
 
         try:
             await self.repository.update(client)
+            await publish(self.session, client_cache, client.id)
             await self.session.commit()
+            client_cache.pop(client.id)
             return client
         except IntegrityError:
             await self.session.rollback()
@@ -91,4 +178,6 @@ class ClientService:
         client.is_deleted = True
         client.deleted_at = datetime.now(timezone.utc).replace(tzinfo=None)
         await self.repository.update(client)
+        await publish(self.session, client_cache, client.id)
         await self.session.commit()
+        client_cache.pop(client.id)
@@ -0,0 +1,41 @@
+"""Change-event stream: incremental, long-polled reads of the outbox."""
+import asyncio
+from functools import cached_property
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.metrics import timed_methods
+from app.db.models.outbox import OutboxEvent
+from app.repositories.outbox_repository import OutboxRepository
+
+
+@timed_methods
+class EventService:
+    """Lets consumers tail order/stock changes instead of re-scanning list endpoints."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @cached_property
+    def repository(self) -> OutboxRepository:
+        return OutboxRepository(self.session)
+
+    async def get_events(
+        self, after: int = 0, limit: int = 100, wait: float = 0
+    ) -> list[OutboxEvent]:
+        """Return events after the given position; if none yet, wait up to `wait` seconds for new ones.
+
+        Only published events have a position, so the stream advances as the relay runs.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            events = await self.repository.get_after(after, limit)
+            remaining = deadline - loop.time()
+            if events or remaining <= 0 or lifecycle.draining:
+                return events
+            # End the read transaction so the pooled connection is free while we wait.
+            await self.session.rollback()
+            await asyncio.sleep(min(settings.events_poll_interval, remaining))
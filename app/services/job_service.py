@@ -0,0 +1,30 @@
+"""Background job status lookups."""
+from functools import cached_property
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import timed_methods
+from app.db.models.job import Job
+from app.repositories.job_repository import JobRepository
+
+
+@timed_methods
+class JobService:
+    """Lets clients poll jobs started by 202 responses."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @cached_property
+    def repository(self) -> JobRepository:
+        return JobRepository(self.session)
+
+    async def get_job(self, job_id: int) -> Job:
+        job = await self.repository.get_by_id(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        return job
@@ -1,22 +1,57 @@
+from functools import cached_property
 from typing import List
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.enums import OrderStatus
+from app.core.config import settings
+from app.core.enums import EventType, OrderStatus
+from app.core.metrics import STOCK_CONFLICTS, timed_methods
 from app.db.models.order import Order, OrderProduct
+from app.db.session import read_other_shards, searches_all_shards
+from app.repositories.filters import InvalidQueryError
 from app.repositories.order_repository import OrderRepository
+from app.repositories.outbox_repository import OutboxRepository
 from app.repositories.product_repository import ProductRepository
 from app.repositories.client_repository import ClientRepository
-from app.schemas.order import OrderProductAdd
+from app.repositories.client_stats_repository import ClientStatsRepository
+from app.repositories.stock_repository import StockRepository
+from app.schemas.order import OrderFilters, OrderProductAdd
+from app.services.product_service import product_cache
 
 
+# Stock of these orders is settled (shipped or released): no new items, no way back.
+_SETTLED = frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELLED})
+
+
+@timed_methods
 class OrderService:
     def __init__(self, session: AsyncSession):
-        self.repository = OrderRepository(session)
-        self.product_repository = ProductRepository(session)
-        self.client_repository = ClientRepository(session)
         self.session = session
 
+    @cached_property
+    def repository(self) -> OrderRepository:
+        return OrderRepository(self.session)
+
+    @cached_property
+    def product_repository(self) -> ProductRepository:
+        return ProductRepository(self.session)
+
+    @cached_property
+    def client_repository(self) -> ClientRepository:
+        return ClientRepository(self.session)
+
+    @cached_property
+    def client_stats_repository(self) -> ClientStatsRepository:
+        return ClientStatsRepository(self.session)
+
+    @cached_property
+    def stock_repository(self) -> StockRepository:
+        return StockRepository(self.session)
+
+    @cached_property
+    def outbox(self) -> OutboxRepository:
+        return OutboxRepository(self.session)
+
     async def create_order(self, client_id: int) -> Order:
         client = await self.client_repository.get_by_id(client_id)
         if not client:
@@ -25,12 +60,30 @@ class OrderService:
                 detail="Client not found"
             )
 
-        new_order = Order(client_id=client_id, status=OrderStatus.NEW)
+        tenant_id = self.session.info.get("tenant_id")
+        new_order = Order(
+            client_id=client_id,
+            status=OrderStatus.NEW,
+            tenant_id=settings.default_tenant_id if tenant_id is None else tenant_id,
+        )
         await self.repository.create(new_order)
+        await self.client_stats_repository.apply_delta(
+            client_id, orders=1, last_order_at=new_order.created_at
+        )
+        self.outbox.add_event(
+            EventType.ORDER_CREATED,
+            new_order.id,
+            {"order_id": new_order.id, "client_id": client_id, "status": new_order.status},
+        )
         return await self.repository.get_by_id_with_items(new_order.id)
 
     async def get_order(self, order_id: int) -> Order:
         order = await self.repository.get_by_id_with_items(order_id)
+        if not order and searches_all_shards(self.session):
+            found = await read_other_shards(
+                self.session, lambda session: OrderRepository(session).get_by_id_with_items(order_id)
+            )
+            order = next((order for order in found if order), None)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -38,18 +91,57 @@ class OrderService:
             )
         return order
 
-    async def get_orders(self, offset: int = 0, limit: int = 100) -> list[Order]:
-        return await self.repository.get_all_with_items(offset, limit)
+    async def get_orders(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: OrderFilters | None = None,
+        sort: str | None = None,
+    ) -> list[Order]:
+        params = filters.model_dump(exclude_none=True) if filters else None
+        try:
+            if not searches_all_shards(self.session):
+                return await self.repository.get_all_with_items(offset, limit, params, sort)
+            # Each shard's first offset + limit orders, merged in the requested order.
+            pages = [await self.repository.get_all_with_items(0, offset + limit, params, sort)]
+            pages += await read_other_shards(
+                self.session,
+                lambda session: OrderRepository(session).get_all_with_items(0, offset + limit, params, sort),
+            )
+            return self.repository.list_query.merge(pages, sort, offset, limit)
+        except InvalidQueryError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            ) from exc
+
+    async def get_orders_by_ids(self, ids: list[int]) -> list[Order]:
+        """Batch lookup; unknown ids are skipped."""
+        orders = await self.repository.get_by_ids_with_items(ids)
+        if not searches_all_shards(self.session) or len(orders) == len(set(ids)):
+            return orders
+        missing = list(set(ids) - {order.id for order in orders})
+        for found in await read_other_shards(
+            self.session, lambda session: OrderRepository(session).get_by_ids_with_items(missing)
+        ):
+            orders.extend(found)
+        by_id = {order.id: order for order in orders}
+        return [by_id[id] for id in dict.fromkeys(ids) if id in by_id]
 
     async def add_item_to_order(
         self, order_id: int, item_data: OrderProductAdd
     ) -> Order:
-        order = await self.repository.get_by_id(order_id)
+        order = await self.repository.get_for_update(order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
+        if order.status in _SETTLED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Order is {order.status}; items can no longer be added"
+            )
 
         product = await self.product_repository.get_by_id(item_data.product_id)
         if not product:
@@ -58,11 +150,15 @@ class OrderService:
                 detail="Product not found"
             )
 
-        if product.quantity < item_data.quantity:
+        allocations = await self.stock_repository.reserve(product.id, item_data.quantity)
+        if not allocations:
+            STOCK_CONFLICTS.labels("insufficient_stock").inc()
+            available = await self.stock_repository.get_available(product.id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Not enough stock. Available: {product.quantity}"
+                detail=f"Not enough stock. Available: {available}"
             )
+        await self.stock_repository.add_reservations(order_id, order.tenant_id, product.id, allocations)
 
         existing_item = await self.repository.get_order_product(
             order_id, item_data.product_id
@@ -73,14 +169,37 @@ class OrderService:
         else:
             new_item = OrderProduct(
                 order_id=order_id,
+                tenant_id=order.tenant_id,
                 product_id=item_data.product_id,
                 quantity=item_data.quantity,
-                price_at_order=product.price
+                price_at_order=product.price,
+                product_name=product.name,
+                sku=product.sku,
             )
             self.session.add(new_item)
 
-        product.quantity -= item_data.quantity
+        line_amount = product.price * item_data.quantity
+        await self.repository.add_totals(order, item_data.quantity, line_amount)
+        await self.client_stats_repository.apply_delta(
+            order.client_id, spend=line_amount
+        )
+        self.outbox.add_event(
+            EventType.ORDER_ITEM_ADDED,
+            order_id,
+            {
+                "order_id": order_id,
+                "product_id": product.id,
+                "quantity": item_data.quantity,
+                "price_at_order": str(product.price),
+            },
+        )
+        self._add_stock_event(
+            product.id, await self.stock_repository.get_available(product.id), -item_data.quantity
+        )
+        # No cross-worker NOTIFY here: it would serialize every checkout's commit on the
+        # notify queue lock. Other workers' cached quantity catches up within the product TTL.
         await self.session.commit()
+        product_cache.pop(product.id)
         return await self.repository.get_by_id_with_items(order_id)
 
     async def add_items_to_order(
@@ -94,29 +213,77 @@ class OrderService:
     async def update_order_status(
         self, order_id: int, new_status: OrderStatus
     ) -> Order:
-        order = await self.repository.get_by_id(order_id)
+        order = await self.repository.get_for_update(order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
 
+        previous_status = order.status
+        if previous_status in _SETTLED and new_status != previous_status:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Order is {previous_status}; its stock has been settled"
+            )
+
+        released: dict[int, int] = {}
+        if new_status == OrderStatus.COMPLETED:
+            await self.stock_repository.ship_order(order_id)
+        elif new_status == OrderStatus.CANCELLED:
+            released = await self._release_stock(order_id)
         order.status = new_status
         await self.repository.update(order)
+        self.outbox.add_event(
+            EventType.ORDER_STATUS_CHANGED,
+            order_id,
+            {"order_id": order_id, "status": new_status, "previous_status": previous_status},
+        )
+        await self.session.commit()
+        for product_id in released:
+            product_cache.pop(product_id)
         return await self.repository.get_by_id_with_items(order_id)
 
     async def delete_order(self, order_id: int) -> None:
-        order = await self.repository.get_by_id_with_items(order_id)
+        order = await self.repository.get_by_id_with_items(order_id, for_update=True)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found"
             )
 
-        for order_product in order.order_products:
-            product = await self.product_repository.get_by_id(order_product.product_id)
-            if product:
-                product.quantity += order_product.quantity
-
+        released = await self._release_stock(order_id)
+        self.outbox.add_event(EventType.ORDER_DELETED, order_id, {"order_id": order_id})
         await self.session.delete(order)
+        await self.session.flush()
+        # The client's other orders may be on any shard, whatever the tenant of this one.
+        last_created = [
+            await self.repository.get_last_created_at(order.client_id),
+            *await read_other_shards(
+                self.session, lambda session: OrderRepository(session).get_last_created_at(order.client_id)
+            ),
+        ]
+        await self.client_stats_repository.apply_delta(
+            order.client_id,
+            orders=-1,
+            spend=-order.total_amount,
+            last_order_at=max((at for at in last_created if at is not None), default=None),
+            replace_last_order=True,
+        )
         await self.session.commit()
+        for product_id in released:
+            product_cache.pop(product_id)
+
+    async def _release_stock(self, order_id: int) -> dict[int, int]:
+        """Return the order's reservations to stock, with events; the caller pops the local cache."""
+        released = await self.stock_repository.release_order(order_id)
+        for product_id, units in released.items():
+            self._add_stock_event(product_id, await self.stock_repository.get_available(product_id), units)
+        return released
+
+    def _add_stock_event(self, product_id: int, quantity: int, delta: int) -> None:
+        self.outbox.add_event(
+            EventType.PRODUCT_STOCK_CHANGED,
+            product_id,
+            {"product_id": product_id, "quantity": quantity, "delta": delta},
+        )
@@ -1,25 +1,140 @@
-"""Product business logic: CRUD, SKU generation and soft delete."""
-from datetime import datetime, timezone
+"""Product business logic: CRUD, SKU generation, search, soft delete, effective-dated prices and stock levels."""
+import base64
+import binascii
+from datetime import UTC, datetime
+from decimal import Decimal, InvalidOperation
+from functools import cached_property
 from uuid import uuid4
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.enums import EventType, JobKind
+from app.core.metrics import timed_methods
+from app.db.invalidation import publish
 from app.db.models.product import Product
+from app.db.models.product_price import ProductPrice
 from app.repositories.product_repository import ProductRepository
 from app.repositories.category_repository import CategoryRepository
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.repositories.filters import InvalidQueryError
+from app.repositories.job_repository import JobRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.product_price_repository import ProductPriceRepository
+from app.repositories.stock_repository import StockRepository
+from app.repositories.warehouse_repository import WarehouseRepository
+from app.schemas.product import (
+    PriceImportResult,
+    PriceListImport,
+    ProductCreate,
+    ProductFilters,
+    ProductPricePage,
+    ProductPriceResponse,
+    ProductResponse,
+    ProductSearchPage,
+    ProductUpdate,
+)
+from app.schemas.stock import StockLevelResponse, StockLevelUpdate
 
 
+def _product_payload(product: Product) -> dict:
+    """JSON-safe snapshot of a product for change events."""
+    return {
+        "product_id": product.id,
+        "sku": product.sku,
+        "name": product.name,
+        "price": str(product.price),
+        "quantity": product.quantity,
+        "category_id": product.category_id,
+    }
+
+
+product_cache = TTLCache(
+    "product",
+    ttl=settings.product_cache_ttl,
+    maxsize=settings.product_cache_size,
+    stale_ttl=settings.product_cache_stale_ttl,
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; an offset-less input is taken as UTC."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _encode_price_cursor(period: ProductPrice) -> str:
+    return base64.urlsafe_b64encode(f"{period.valid_from.isoformat()}|{period.id}".encode()).decode()
+
+
+def _decode_price_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        valid_from, period_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(valid_from), int(period_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from None
+
+
+def _encode_cursor(rank: Decimal, product_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{rank}:{product_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[Decimal, int]:
+    try:
+        rank, product_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return Decimal(rank), int(product_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidOperation):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from None
+
+
+@timed_methods
 class ProductService:
     """Product CRUD; validates category and generates SKU when omitted."""
 
     def __init__(self, session: AsyncSession):
-        self.repository = ProductRepository(session)
-        self.category_repository = CategoryRepository(session)
         self.session = session
 
+    @cached_property
+    def repository(self) -> ProductRepository:
+        return ProductRepository(self.session)
+
+    @cached_property
+    def category_repository(self) -> CategoryRepository:
+        return CategoryRepository(self.session)
+
+    @cached_property
+    def outbox(self) -> OutboxRepository:
+        return OutboxRepository(self.session)
+
+    @cached_property
+    def price_repository(self) -> ProductPriceRepository:
+        return ProductPriceRepository(self.session)
+
+    @cached_property
+    def job_repository(self) -> JobRepository:
+        return JobRepository(self.session)
+
+    @cached_property
+    def stock_repository(self) -> StockRepository:
+        return StockRepository(self.session)
+
+    @cached_property
+    def warehouse_repository(self) -> WarehouseRepository:
+        return WarehouseRepository(self.session)
+
     async def create_product(self, data: ProductCreate) -> Product:
         category = await self.category_repository.get_by_id(data.category_id)
         if not category:
@@ -28,7 +143,7 @@ class ProductService:
                 detail="Category not found"
             )
 
-        product_dict = data.model_dump()
+        product_dict = data.model_dump(exclude={"quantity"})
         if not product_dict.get("sku"):
             prefix = product_dict["name"][:3].upper()
             suffix = str(uuid4()).split("-")[0].upper()
@@ -37,7 +152,15 @@ class ProductService:
         new_product = Product(**product_dict)
         try:
             await self.repository.create(new_product)
+            await self.price_repository.set_prices({new_product.id: [(_utcnow(), new_product.price)]})
+            await self.stock_repository.set_quantity(new_product.id, settings.default_warehouse_id, data.quantity)
+            await self.session.refresh(new_product, ["quantity"])
+            self.outbox.add_event(
+                EventType.PRODUCT_CREATED, new_product.id, _product_payload(new_product)
+            )
+            await publish(self.session, product_cache, new_product.id)
             await self.session.commit()
+            product_cache.pop(new_product.id)
             return new_product
         except IntegrityError:
             await self.session.rollback()
@@ -46,17 +169,68 @@ class ProductService:
                 detail="Product with this SKU already exists"
             )
 
-    async def get_product(self, product_id: int) -> Product:
-        product = await self.repository.get_by_id_with_category(product_id)
-        if not product:
+    async def get_product(self, product_id: int) -> ProductResponse:
+        """Cached; concurrent requests for a product share one query."""
+        try:
+            product = await product_cache.get_or_load(
+                product_id, lambda: self._load_product(product_id), settings.cache_load_timeout
+            )
+        except TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Product is being reloaded, retry shortly"
+            ) from None
+        if product is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Product not found"
             )
         return product
 
-    async def get_products(self, offset: int = 0, limit: int = 100) -> list[Product]:
-        return await self.repository.get_all_with_category(offset, limit)
+    async def _load_product(self, product_id: int) -> ProductResponse | None:
+        """Detached from the session so it can be cached; None (not found) is cached too."""
+        product = await self.repository.get_by_id_with_category(product_id)
+        return ProductResponse.model_validate(product) if product else None
+
+    async def get_products(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: ProductFilters | None = None,
+        sort: str | None = None,
+    ) -> list[Product]:
+        try:
+            return await self.repository.get_all_with_category(
+                offset, limit, filters.model_dump(exclude_none=True) if filters else None, sort
+            )
+        except InvalidQueryError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            ) from exc
+
+    async def get_products_by_ids(self, ids: list[int]) -> list[Product]:
+        """Batch lookup; unknown or deleted ids are skipped."""
+        return await self.repository.get_by_ids(ids)
+
+    async def search_products(
+        self,
+        q: str,
+        category_id: int | None = None,
+        root_category_id: int | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> ProductSearchPage:
+        after = _decode_cursor(cursor) if cursor else None
+        rows = await self.repository.search(q, category_id, root_category_id, after, limit)
+        next_cursor = None
+        if len(rows) == limit:
+            last_product, last_rank = rows[-1]
+            next_cursor = _encode_cursor(last_rank, last_product.id)
+        return ProductSearchPage(
+            items=[ProductResponse.model_validate(product) for product, _ in rows],
+            next_cursor=next_cursor,
+        )
 
     async def update_product(
         self, product_id: int, data: ProductUpdate
@@ -77,13 +251,29 @@ class ProductService:
                 )
             product.category_id = data.category_id
 
-        update_data = data.model_dump(exclude_unset=True, exclude={"category_id"})
+        old_price, old_stripes = product.price, product.stock_stripes
+        update_data = data.model_dump(exclude_unset=True, exclude={"category_id", "quantity"})
         for field, value in update_data.items():
             setattr(product, field, value)
-
         try:
+            # Inside the try: locking the stock rows autoflushes the pending SKU change.
+            stock_delta = 0
+            if data.quantity is not None:
+                stock_delta = await self._set_stock(product.id, settings.default_warehouse_id, data.quantity)
             await self.repository.update(product)
+            if product.price != old_price:
+                # Takes effect now; later scheduled prices stay in place.
+                await self.price_repository.set_prices({product.id: [(_utcnow(), product.price)]})
+            if product.stock_stripes != old_stripes:
+                await self.stock_repository.rebalance([product.id])
+            self.outbox.add_event(
+                EventType.PRODUCT_UPDATED, product.id, _product_payload(product)
+            )
+            if stock_delta:
+                self._add_stock_event(product, settings.default_warehouse_id, stock_delta)
+            await publish(self.session, product_cache, product.id)
             await self.session.commit()
+            product_cache.pop(product.id)
             return product
         except IntegrityError:
             await self.session.rollback()
@@ -101,6 +291,183 @@ class ProductService:
             )
 
         product.is_deleted = True
-        product.deleted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        product.deleted_at = datetime.now(UTC).replace(tzinfo=None)
         await self.repository.update(product)
+        self.outbox.add_event(
+            EventType.PRODUCT_DELETED, product.id, {"product_id": product.id}
+        )
+        await publish(self.session, product_cache, product.id)
+        await self.session.commit()
+        product_cache.pop(product.id)
+
+    async def get_stock_levels(self, product_id: int) -> list[StockLevelResponse]:
+        """Stock of a product per warehouse."""
+        if not await self.repository.get_by_id(product_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        levels = await self.stock_repository.get_levels(product_id)
+        return [StockLevelResponse.model_validate(level) for level in levels]
+
+    async def set_stock_level(
+        self, product_id: int, warehouse_id: int, data: StockLevelUpdate
+    ) -> StockLevelResponse:
+        """Set units on hand at a warehouse (stock count, goods received)."""
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        if not await self.warehouse_repository.get_by_id(warehouse_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Warehouse not found"
+            )
+
+        delta = await self._set_stock(product_id, warehouse_id, data.quantity)
+        level = StockLevelResponse.model_validate(await self.stock_repository.get_level(product_id, warehouse_id))
+        if delta:
+            await self.session.refresh(product, ["quantity"])
+            self._add_stock_event(product, warehouse_id, delta)
+            await publish(self.session, product_cache, product_id)
+        await self.session.commit()
+        product_cache.pop(product_id)
+        return level
+
+    async def _set_stock(self, product_id: int, warehouse_id: int, quantity: int) -> int:
+        """Set units on hand (over all stripes); returns the change. Never below what open orders hold."""
+        stripes = await self.stock_repository.lock_stripes(product_id, warehouse_id)
+        reserved = sum(level.reserved for level in stripes)
+        if quantity < reserved:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{reserved} units are reserved by open orders at this warehouse"
+            )
+        await self.stock_repository.set_quantity(product_id, warehouse_id, quantity, stripes)
+        return quantity - sum(level.quantity for level in stripes)
+
+    async def rebalance_stock(self, product_ids: list[int] | None = None) -> int:
+        """Even out striped products' stock over their stripes; None: every striped product.
+
+        A full pass runs in one process at a time; others return 0 at once.
+        Returns the stock rows written.
+        """
+        if product_ids is None and not await self.stock_repository.try_lock_rebalance():
+            return 0
+        written = await self.stock_repository.rebalance(product_ids)
+        await self.session.commit()
+        return written
+
+    def _add_stock_event(self, product: Product, warehouse_id: int, delta: int) -> None:
+        self.outbox.add_event(
+            EventType.PRODUCT_STOCK_CHANGED,
+            product.id,
+            {"product_id": product.id, "warehouse_id": warehouse_id, "quantity": product.quantity, "delta": delta},
+        )
+
+    async def get_price_at(self, product_id: int, at: datetime | None = None) -> ProductPrice:
+        """The price in effect at `at` (default now), with its period."""
+        period = await self.price_repository.get_at(product_id, _naive_utc(at) if at else _utcnow())
+        if period is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No price for this product at that time"
+            )
+        return period
+
+    async def get_scheduled_prices(self, product_id: int) -> list[ProductPrice]:
+        """Price changes of a product that have not taken effect yet, soonest first."""
+        return await self.price_repository.get_starting_after(product_id, _utcnow())
+
+    async def get_price_changes(
+        self, until: datetime | None = None, cursor: str | None = None, limit: int = 100
+    ) -> ProductPricePage:
+        """Upcoming price changes of all products (up to `until`), soonest first."""
+        after = _decode_price_cursor(cursor) if cursor else None
+        periods = await self.price_repository.get_changes(
+            _utcnow(), _naive_utc(until) if until else None, after, limit
+        )
+        return ProductPricePage(
+            items=[ProductPriceResponse.model_validate(period) for period in periods],
+            next_cursor=_encode_price_cursor(periods[-1]) if len(periods) == limit else None,
+        )
+
+    async def import_prices(self, data: PriceListImport) -> PriceImportResult:
+        """Write a price list in one transaction; all or nothing.
+
+        Prices effective now or earlier update products at once. Later ones get a job
+        per distinct start time that copies them to products when they take effect,
+        and a product.price_scheduled event each.
+        """
+        now = _utcnow()
+        skus = list(dict.fromkeys(item.sku for item in data.items))
+        ids = await self.repository.get_ids_by_sku(skus)
+        unknown = [sku for sku in skus if sku not in ids]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown SKUs: {', '.join(unknown[:20])}"
+            )
+
+        points: dict[int, dict[datetime, Decimal]] = {}
+        for item in data.items:
+            valid_from = _naive_utc(item.valid_from) if item.valid_from else now
+            points.setdefault(ids[item.sku], {})[valid_from] = item.price
+        await self.price_repository.set_prices(
+            {product_id: list(changes.items()) for product_id, changes in points.items()}
+        )
+        changed = await self._apply_prices(now, product_ids=list(points))
+
+        scheduled = [
+            (product_id, valid_from, price)
+            for product_id, changes in points.items()
+            for valid_from, price in changes.items()
+            if valid_from > now
+        ]
+        for product_id, valid_from, price in scheduled:
+            self.outbox.add_event(
+                EventType.PRODUCT_PRICE_SCHEDULED,
+                product_id,
+                {"product_id": product_id, "price": str(price), "valid_from": valid_from.isoformat()},
+            )
+        for valid_from in sorted({valid_from for _, valid_from, _ in scheduled}):
+            await self.job_repository.enqueue(
+                JobKind.PRODUCT_PRICES_DUE,
+                {"valid_from": valid_from.isoformat()},
+                settings.jobs_max_attempts,
+                run_after=valid_from,
+            )
         await self.session.commit()
+        self._after_price_commit(changed)
+        return PriceImportResult(
+            imported=sum(len(changes) for changes in points.values()),
+            applied=len(changed),
+            scheduled=len(scheduled),
+        )
+
+    async def apply_due_prices(self, valid_from: datetime | None = None) -> int:
+        """Copy prices that have taken effect to products.price. Idempotent.
+
+        valid_from: only prices starting at that instant (what a scheduled job is for);
+        None checks every product. Returns the number of products changed.
+        """
+        changed = await self._apply_prices(_utcnow(), starting_at=valid_from)
+        await self.session.commit()
+        self._after_price_commit(changed)
+        return len(changed)
+
+    async def _apply_prices(
+        self, at: datetime, product_ids: list[int] | None = None, starting_at: datetime | None = None
+    ) -> list[Product]:
+        changed = await self.price_repository.apply_due(at, product_ids, starting_at)
+        for product in changed:
+            self.outbox.add_event(EventType.PRODUCT_UPDATED, product.id, _product_payload(product))
+            await publish(self.session, product_cache, product.id)
+        return changed
+
+    @staticmethod
+    def _after_price_commit(changed: list[Product]) -> None:
+        for product in changed:
+            product_cache.pop(product.id)
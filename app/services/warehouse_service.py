@@ -0,0 +1,60 @@
+"""Warehouse (stock location) management."""
+from functools import cached_property
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import timed_methods
+from app.db.invalidation import publish
+from app.db.models.stock import Warehouse
+from app.repositories.warehouse_repository import WarehouseRepository
+from app.schemas.stock import WarehouseCreate, WarehouseUpdate
+from app.services.product_service import product_cache
+
+
+@timed_methods
+class WarehouseService:
+    """Warehouse CRUD; deactivating one takes its stock out of every product's available quantity."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @cached_property
+    def repository(self) -> WarehouseRepository:
+        return WarehouseRepository(self.session)
+
+    async def get_warehouses(self) -> list[Warehouse]:
+        return await self.repository.get_all(limit=1000)
+
+    async def create_warehouse(self, data: WarehouseCreate) -> Warehouse:
+        try:
+            warehouse = await self.repository.create(Warehouse(**data.model_dump()))
+            await self.session.commit()
+            return warehouse
+        except IntegrityError:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Warehouse with this code already exists"
+            ) from None
+
+    async def update_warehouse(self, warehouse_id: int, data: WarehouseUpdate) -> Warehouse:
+        warehouse = await self.repository.get_by_id(warehouse_id)
+        if not warehouse:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Warehouse not found"
+            )
+
+        was_active = warehouse.is_active
+        for field, value in data.model_dump(exclude_unset=True, exclude_none=True).items():
+            setattr(warehouse, field, value)
+        await self.repository.update(warehouse)
+        # Available quantities of every product stocked there change.
+        if warehouse.is_active != was_active:
+            await publish(self.session, product_cache)
+        await self.session.commit()
+        if warehouse.is_active != was_active:
+            product_cache.clear()
+        return warehouse
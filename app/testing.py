@@ -0,0 +1,33 @@
+"""Pytest plugin with query-budget assertions.
+
+Enable it in a conftest: ``pytest_plugins = ["app.testing"]``.
+"""
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+
+from app.db import query_stats
+from app.db.query_stats import QueryStats
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, allow_repeated: bool = False) -> Iterator[QueryStats]:
+    """Fail if the block runs more than `max_queries` statements or repeats one (N+1)."""
+    with query_stats.track("budget") as stats:
+        yield stats
+    assert stats.count <= max_queries, (
+        f"Expected at most {max_queries} queries, got {stats.count}:\n"
+        + "\n".join(f"{n}x {sql}" for sql, n in stats.fingerprints.most_common())
+    )
+    if not allow_repeated:
+        repeated = stats.repeated()
+        assert not repeated, "Repeated statements (N+1):\n" + "\n".join(
+            f"{n}x {sql}" for sql, n in repeated.items()
+        )
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., AbstractContextManager[QueryStats]]:
+    """``with query_budget(3): await client.get("/api/v1/orders/1")``"""
+    return assert_query_budget
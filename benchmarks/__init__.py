@@ -0,0 +1,8 @@
+"""Benchmarks: synthetic ERP dataset seeder, service micro-benchmarks and HTTP load scenarios.
+
+Run against a disposable local database, never production:
+
+    python -m benchmarks.seed --products 2000000 --orders 1000000 --truncate
+    python -m benchmarks.micro --iterations 200
+    python -m benchmarks.load --base-url http://localhost:8000 --duration 60 --concurrency 64
+"""
@@ -0,0 +1,111 @@
+"""Concurrent checkouts of one hot product, per stock stripe count.
+
+For each stripe count a fresh product is created with plenty of stock at the default
+warehouse and split over that many stripes. Then --workers concurrent workers, each
+with its own client and order, add the product to their order for --duration seconds
+(OrderService.add_item_to_order, one session per call, like one API request). With one
+stripe every checkout waits for the same stock row; throughput should grow with stripes
+until something else (pool size, CPU, WAL) is the limit.
+
+    python -m benchmarks.checkout --stripes 1 2 4 8 16 --workers 16 --duration 10
+    python -m benchmarks.checkout --json bench_checkout.json
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from decimal import Decimal
+
+from fastapi import HTTPException
+
+from app.db.session import AsyncSessionLocal, dispose_engine, session_scope
+from app.schemas.category import CategoryCreate
+from app.schemas.client import ClientCreate
+from app.schemas.order import OrderProductAdd
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.category_service import CategoryService
+from app.services.client_service import ClientService
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from benchmarks.stats import Recorder, print_table, write_json
+
+STOCK = 1_000_000_000
+
+
+async def _new_category() -> int:
+    async with AsyncSessionLocal() as session:
+        category = await CategoryService(session).create_category(
+            CategoryCreate(name=f"Bench {uuid.uuid4().hex[:8]}", parent_id=None)
+        )
+        return category.id
+
+
+async def _new_product(category_id: int, stripes: int) -> int:
+    async with AsyncSessionLocal() as session:
+        service = ProductService(session)
+        product = await service.create_product(ProductCreate(
+            name=f"Hot product {stripes}", price=Decimal("9.99"), quantity=STOCK,
+            category_id=category_id, sku=f"HOT-{uuid.uuid4().hex[:12]}",
+        ))
+        await service.update_product(product.id, ProductUpdate(stock_stripes=stripes))
+        return product.id
+
+
+async def _new_order() -> int:
+    # create_order leaves the commit to the caller (the request session).
+    async with session_scope() as session:
+        client = await ClientService(session).create_client(ClientCreate(
+            full_name="Bench client", email=f"bench-{uuid.uuid4().hex}@bench.example"
+        ))
+        order = await OrderService(session).create_order(client.id)
+        return order.id
+
+
+async def _worker(name: str, product_id: int, order_id: int, deadline: float, recorder: Recorder) -> None:
+    item = OrderProductAdd(product_id=product_id, quantity=1)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        ok = True
+        try:
+            async with session_scope() as session:
+                await OrderService(session).add_item_to_order(order_id, item)
+        except HTTPException:
+            ok = False
+        recorder.record(name, time.perf_counter() - started, ok)
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    rows = []
+    try:
+        category_id = await _new_category()
+        for stripes in args.stripes:
+            product_id = await _new_product(category_id, stripes)
+            orders = [await _new_order() for _ in range(args.workers)]
+            name = f"checkout stripes={stripes}"
+            recorder = Recorder()
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                _worker(name, product_id, order_id, started + args.duration, recorder) for order_id in orders
+            ))
+            rows.extend(recorder.summary(elapsed=time.perf_counter() - started))
+    finally:
+        await dispose_engine()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stripes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent checkouts (keep within the pool size)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per stripe count")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args))
+    print_table(rows)
+    if args.json:
+        write_json(args.json, rows, kind="checkout", workers=args.workers, duration=args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Direct asyncpg access for benchmark setup (bypasses SQLAlchemy)."""
+import asyncpg
+
+from app.core.config import settings
+
+
+async def connect() -> asyncpg.Connection:
+    return await asyncpg.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_username,
+        password=settings.db_password,
+        database=settings.db_name,
+    )
@@ -0,0 +1,134 @@
+"""HTTP load scenario against a running API (closed-loop workers).
+
+Mix of checkout flows (create order -> batch add items -> status changes) and
+catalogue reads (lists, search, product by id, batch by ids, category tree).
+
+    python -m benchmarks.load --base-url http://localhost:8000 --duration 60 --concurrency 64 --checkout-ratio 0.2
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import replace
+
+import httpx
+
+from benchmarks.micro import Context, load_context
+from benchmarks.stats import Recorder, print_table, write_json
+
+API = "/api/v1"
+
+
+class Scenario:
+    def __init__(self, client: httpx.AsyncClient, ctx: Context, recorder: Recorder):
+        self.client = client
+        self.ctx = ctx
+        self.recorder = recorder
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(name, time.perf_counter() - started, ok=False)
+            return None
+        self.recorder.record(name, time.perf_counter() - started, ok=response.status_code < 400)
+        return response
+
+    async def checkout(self) -> None:
+        ctx = self.ctx
+        response = await self.request(
+            "POST /orders", "POST", f"{API}/orders/", params={"client_id": ctx.client()}
+        )
+        if response is None or response.status_code != 201:
+            return
+        order_id = response.json()["id"]
+        items = [
+            {"product_id": product_id, "quantity": ctx.rng.randint(1, 3)}
+            for product_id in ctx.rng.sample(ctx.product_ids, ctx.rng.randint(1, 5))
+        ]
+        await self.request(
+            "POST /orders/{id}/items/batch", "POST", f"{API}/orders/{order_id}/items/batch", json={"items": items}
+        )
+        for new_status in ("processing", "paid"):
+            await self.request(
+                "PATCH /orders/{id}/status", "PATCH", f"{API}/orders/{order_id}/status",
+                params={"status": new_status},
+            )
+
+    async def browse(self) -> None:
+        ctx = self.ctx
+        choice = ctx.rng.random()
+        if choice < 0.3:
+            await self.request("GET /products/{id}", "GET", f"{API}/products/{ctx.product()}")
+        elif choice < 0.5:
+            await self.request(
+                "GET /products (category)", "GET", f"{API}/products/",
+                params={"category_id": ctx.rng.choice(ctx.leaf_category_ids), "limit": 20},
+            )
+        elif choice < 0.7:
+            await self.request(
+                "GET /products/search", "GET", f"{API}/products/search", params={"q": ctx.rng.choice(ctx.words)}
+            )
+        elif choice < 0.85:
+            await self.request(
+                "GET /products?ids", "GET", f"{API}/products/",
+                params={"ids": ctx.rng.sample(ctx.product_ids, min(20, len(ctx.product_ids)))},
+            )
+        else:
+            await self.request("GET /categories/roots", "GET", f"{API}/categories/roots")
+
+
+async def worker(scenario: Scenario, deadline: float, checkout_ratio: float) -> None:
+    while time.perf_counter() < deadline:
+        if scenario.ctx.rng.random() < checkout_ratio:
+            await scenario.checkout()
+        else:
+            await scenario.browse()
+
+
+async def run(args: argparse.Namespace) -> tuple[Recorder, float]:
+    ctx = await load_context(args.seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup:
+            warm = Scenario(client, ctx, Recorder())
+            await asyncio.gather(*(
+                worker(warm, time.perf_counter() + args.warmup, args.checkout_ratio)
+                for _ in range(args.concurrency)
+            ))
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            # Each user gets its own RNG so runs are reproducible regardless of scheduling.
+            worker(Scenario(client, replace(ctx, rng=random.Random(args.seed + i)), recorder),
+                   deadline, args.checkout_ratio)
+            for i in range(args.concurrency)
+        ))
+        return recorder, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured warm-up seconds")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent closed-loop users")
+    parser.add_argument("--checkout-ratio", type=float, default=0.2, help="Share of iterations that place an order")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    recorder, elapsed = asyncio.run(run(args))
+    rows = recorder.summary(elapsed)
+    total = sum(len(v) for v in recorder.latencies.values())
+    print_table(rows)
+    print(f"Total: {total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s")
+    if args.json:
+        write_json(args.json, rows, kind="load", duration=elapsed, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""Micro-benchmarks for service-layer methods against a seeded database.
+
+Each call runs in its own session, like one API request. Write benchmarks create
+their own fixtures in an untimed setup step and leave the seeded data otherwise intact.
+
+    python -m benchmarks.micro --iterations 200 --json bench_micro.json
+    python -m benchmarks.micro --only OrderService
+"""
+import argparse
+import asyncio
+import inspect
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from app.core.config import settings
+from app.core.enums import ArchivedEntity, OrderStatus
+from app.db.models.archive import archive_columns
+from app.db.models.product import Product
+from app.db.session import AsyncSessionLocal, dispose_engine, ensure_id_lease
+from app.schemas.category import CategoryCreate
+from app.schemas.client import ClientCreate, ClientFilters, ClientUpdate
+from app.schemas.order import OrderFilters, OrderProductAdd
+from app.schemas.product import PriceListImport, PriceListItem, ProductCreate, ProductFilters, ProductUpdate
+from app.schemas.stock import StockLevelUpdate, WarehouseCreate, WarehouseUpdate
+from app.services.archive_service import ArchiveService
+from app.services.category_service import CategoryService
+from app.services.client_service import ClientService
+from app.services.event_service import EventService
+from app.services.job_service import JobService
+from app.services.order_service import OrderService
+from app.services.product_service import ProductService
+from app.services.warehouse_service import WarehouseService
+from benchmarks.db import connect
+from benchmarks.stats import Recorder, print_table, write_json
+
+SERVICES = (
+    ArchiveService, CategoryService, ClientService, EventService, JobService, OrderService, ProductService,
+    WarehouseService,
+)
+
+
+@dataclass
+class Context:
+    """Ids sampled from the seeded data."""
+
+    rng: random.Random
+    product_ids: list[int]
+    client_ids: list[int]
+    order_ids: list[int]
+    category_ids: list[int]
+    leaf_category_ids: list[int]
+    words: list[str]
+
+    def product(self) -> int:
+        return self.rng.choice(self.product_ids)
+
+    def client(self) -> int:
+        return self.rng.choice(self.client_ids)
+
+    def order(self) -> int:
+        return self.rng.choice(self.order_ids)
+
+    def category(self) -> int:
+        return self.rng.choice(self.category_ids)
+
+
+@dataclass
+class Case:
+    """One service method benchmark; setup (untimed) returns the argument passed to call."""
+
+    service: type
+    method: str
+    call: Callable[[Any, Context, Any], Awaitable[Any]]
+    setup: Callable[[Context], Awaitable[Any]] | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.service.__name__}.{self.method}"
+
+
+async def load_context(seed: int, sample: int = 2000) -> Context:
+    conn = await connect()
+    try:
+        async def ids(query: str) -> list[int]:
+            return [row[0] for row in await conn.fetch(query, sample)]
+
+        context = Context(
+            rng=random.Random(seed),
+            product_ids=await ids(
+                "SELECT p.id FROM products p JOIN product_stock s ON s.product_id = p.id"
+                " WHERE NOT p.is_deleted AND s.available > 100 ORDER BY random() LIMIT $1"
+            ),
+            client_ids=await ids("SELECT id FROM clients WHERE NOT is_deleted ORDER BY random() LIMIT $1"),
+            order_ids=await ids("SELECT id FROM orders ORDER BY random() LIMIT $1"),
+            category_ids=await ids("SELECT id FROM categories WHERE NOT is_deleted ORDER BY random() LIMIT $1"),
+            leaf_category_ids=await ids("""
+                SELECT c.id FROM categories c
+                WHERE NOT c.is_deleted AND NOT EXISTS (SELECT 1 FROM categories ch WHERE ch.parent_id = c.id)
+                ORDER BY random() LIMIT $1
+            """),
+            words=[row[0] for row in await conn.fetch(
+                "SELECT split_part(name, ' ', 1) FROM products ORDER BY random() LIMIT 100"
+            )],
+        )
+    finally:
+        await conn.close()
+    if not (context.product_ids and context.client_ids and context.category_ids):
+        raise SystemExit("Database looks empty: run `python -m benchmarks.seed` first.")
+    return context
+
+
+async def _in_session(service_cls: type, fn: Callable[[Any], Awaitable[Any]]) -> Any:
+    async with AsyncSessionLocal() as session:
+        result = await fn(service_cls(session))
+        await session.commit()
+        return result
+
+
+async def _new_order(ctx: Context, items: int = 0) -> int:
+    async def create(service: OrderService) -> int:
+        order = await service.create_order(ctx.client())
+        for _ in range(items):
+            await service.add_item_to_order(order.id, OrderProductAdd(product_id=ctx.product(), quantity=1))
+        return order.id
+    return await _in_session(OrderService, create)
+
+
+async def _new_product(ctx: Context, sku: str | None = None) -> int:
+    async def create(service: ProductService) -> int:
+        product = await service.create_product(ProductCreate(
+            name=f"Bench {uuid.uuid4().hex[:8]}", quantity=10, price=Decimal("9.99"),
+            category_id=ctx.rng.choice(ctx.leaf_category_ids), sku=sku,
+        ))
+        return product.id
+    return await _in_session(ProductService, create)
+
+
+async def _new_product_sku(ctx: Context) -> str:
+    sku = f"BENCH-{uuid.uuid4().hex[:12]}"
+    await _new_product(ctx, sku)
+    return sku
+
+
+async def _new_client(ctx: Context) -> int:
+    async def create(service: ClientService) -> int:
+        client = await service.create_client(ClientCreate(
+            full_name="Bench client", email=f"bench-{uuid.uuid4().hex}@bench.example"
+        ))
+        return client.id
+    return await _in_session(ClientService, create)
+
+
+async def _new_category(ctx: Context) -> int:
+    async def create(service: CategoryService) -> int:
+        category = await service.create_category(CategoryCreate(
+            name=f"Bench {uuid.uuid4().hex[:8]}", parent_id=ctx.rng.choice(ctx.leaf_category_ids)
+        ))
+        return category.id
+    return await _in_session(CategoryService, create)
+
+
+async def _new_job(ctx: Context) -> int:
+    category_id = await _new_category(ctx)
+
+    async def move(service: CategoryService) -> int:
+        _, job = await service.update_category(category_id, CategoryCreate(name="Bench moved", parent_id=None))
+        return job.id
+    return await _in_session(CategoryService, move)
+
+
+async def _new_striped_product(ctx: Context) -> int:
+    product_id = await _new_product(ctx)
+    await _in_session(ProductService, lambda service: service.update_product(
+        product_id, ProductUpdate(stock_stripes=4)))
+    return product_id
+
+
+async def _new_warehouse(ctx: Context) -> int:
+    async def create(service: WarehouseService) -> int:
+        warehouse = await service.create_warehouse(
+            WarehouseCreate(code=f"bench-{uuid.uuid4().hex[:12]}", name="Bench warehouse")
+        )
+        return warehouse.id
+    return await _in_session(WarehouseService, create)
+
+
+async def _archived_product(ctx: Context) -> int:
+    """A fresh deleted product moved straight to the archive (retention does not apply)."""
+    product_id = await _new_product(ctx)
+    await _in_session(ProductService, lambda service: service.delete_product(product_id))
+    columns = ", ".join(column.name for column in archive_columns(Product.__table__))
+    conn = await connect()
+    try:
+        await conn.execute(f"""
+            WITH moved AS (DELETE FROM products WHERE id = $1 RETURNING {columns})
+            INSERT INTO products_archive ({columns}) SELECT {columns} FROM moved
+        """, product_id)
+    finally:
+        await conn.close()
+    return product_id
+
+
+CASES: list[Case] = [
+    # Archive
+    Case(ArchiveService, "archive_soft_deleted", lambda s, ctx, _: s.archive_soft_deleted()),
+    Case(ArchiveService, "enqueue_archival", lambda s, ctx, _: s.enqueue_archival()),
+    Case(ArchiveService, "restore", lambda s, ctx, id: s.restore(ArchivedEntity.PRODUCTS, id), _archived_product),
+    # Categories
+    Case(CategoryService, "create_category", lambda s, ctx, _: s.create_category(
+        CategoryCreate(name=f"Bench {uuid.uuid4().hex[:8]}", parent_id=ctx.category()))),
+    Case(CategoryService, "get_category", lambda s, ctx, _: s.get_category(ctx.category())),
+    Case(CategoryService, "get_categories", lambda s, ctx, _: s.get_categories(0, 100)),
+    Case(CategoryService, "get_root_categories", lambda s, ctx, _: s.get_root_categories()),
+    Case(CategoryService, "get_category_children", lambda s, ctx, _: s.get_category_children(ctx.category())),
+    Case(CategoryService, "update_category", lambda s, ctx, id: s.update_category(
+        id, CategoryCreate(name=f"Bench {uuid.uuid4().hex[:8]}", parent_id=ctx.category())), _new_category),
+    Case(CategoryService, "delete_category", lambda s, ctx, id: s.delete_category(id), _new_category),
+    Case(CategoryService, "update_subtree_root", lambda s, ctx, _: s.update_subtree_root(ctx.category())),
+    # Clients
+    Case(ClientService, "create_client", lambda s, ctx, _: s.create_client(
+        ClientCreate(full_name="Bench client", email=f"bench-{uuid.uuid4().hex}@bench.example"))),
+    Case(ClientService, "get_client", lambda s, ctx, _: s.get_client(ctx.client())),
+    Case(ClientService, "get_clients", lambda s, ctx, _: s.get_clients(0, 100, ClientFilters())),
+    Case(ClientService, "get_clients_by_ids", lambda s, ctx, _: s.get_clients_by_ids(
+        ctx.rng.sample(ctx.client_ids, min(50, len(ctx.client_ids))))),
+    Case(ClientService, "get_client_orders", lambda s, ctx, _: s.get_client_orders(ctx.client())),
+    Case(ClientService, "get_client_summary", lambda s, ctx, _: s.get_client_summary(ctx.client())),
+    Case(ClientService, "update_client", lambda s, ctx, id: s.update_client(
+        id, ClientUpdate(address="Updated by benchmark")), _new_client),
+    Case(ClientService, "delete_client", lambda s, ctx, id: s.delete_client(id), _new_client),
+    # Events
+    Case(EventService, "get_events", lambda s, ctx, _: s.get_events(0, 100, 0)),
+    # Jobs
+    Case(JobService, "get_job", lambda s, ctx, id: s.get_job(id), _new_job),
+    # Orders
+    Case(OrderService, "create_order", lambda s, ctx, _: s.create_order(ctx.client())),
+    Case(OrderService, "get_order", lambda s, ctx, _: s.get_order(ctx.order())),
+    Case(OrderService, "get_orders", lambda s, ctx, _: s.get_orders(0, 100, OrderFilters())),
+    Case(OrderService, "get_orders_by_ids", lambda s, ctx, _: s.get_orders_by_ids(
+        ctx.rng.sample(ctx.order_ids, min(50, len(ctx.order_ids))))),
+    Case(OrderService, "add_item_to_order", lambda s, ctx, id: s.add_item_to_order(
+        id, OrderProductAdd(product_id=ctx.product(), quantity=1)), _new_order),
+    Case(OrderService, "add_items_to_order", lambda s, ctx, id: s.add_items_to_order(
+        id, [OrderProductAdd(product_id=p, quantity=1) for p in ctx.rng.sample(ctx.product_ids, 5)]), _new_order),
+    Case(OrderService, "update_order_status", lambda s, ctx, id: s.update_order_status(
+        id, OrderStatus.CANCELLED), lambda ctx: _new_order(ctx, items=3)),
+    Case(OrderService, "delete_order", lambda s, ctx, id: s.delete_order(id),
+         lambda ctx: _new_order(ctx, items=3)),
+    # Products
+    Case(ProductService, "create_product", lambda s, ctx, _: s.create_product(ProductCreate(
+        name=f"Bench {uuid.uuid4().hex[:8]}", quantity=10, price=Decimal("9.99"),
+        category_id=ctx.rng.choice(ctx.leaf_category_ids)))),
+    Case(ProductService, "get_product", lambda s, ctx, _: s.get_product(ctx.product())),
+    Case(ProductService, "get_products", lambda s, ctx, _: s.get_products(
+        0, 100, ProductFilters(category_id=ctx.rng.choice(ctx.leaf_category_ids)))),
+    Case(ProductService, "get_products_by_ids", lambda s, ctx, _: s.get_products_by_ids(
+        ctx.rng.sample(ctx.product_ids, min(50, len(ctx.product_ids))))),
+    Case(ProductService, "get_price_at", lambda s, ctx, _: s.get_price_at(ctx.product())),
+    Case(ProductService, "get_scheduled_prices", lambda s, ctx, _: s.get_scheduled_prices(ctx.product())),
+    Case(ProductService, "get_price_changes", lambda s, ctx, _: s.get_price_changes()),
+    Case(ProductService, "import_prices", lambda s, ctx, sku: s.import_prices(PriceListImport(items=[
+        PriceListItem(sku=sku, price=Decimal("8.99")),
+        PriceListItem(sku=sku, price=Decimal("9.99"), valid_from=datetime.now(UTC) + timedelta(days=1)),
+    ])), _new_product_sku),
+    Case(ProductService, "apply_due_prices", lambda s, ctx, _: s.apply_due_prices()),
+    Case(ProductService, "search_products", lambda s, ctx, _: s.search_products(ctx.rng.choice(ctx.words))),
+    Case(ProductService, "update_product", lambda s, ctx, id: s.update_product(
+        id, ProductUpdate(price=Decimal("10.49"))), _new_product),
+    Case(ProductService, "delete_product", lambda s, ctx, id: s.delete_product(id), _new_product),
+    Case(ProductService, "get_stock_levels", lambda s, ctx, _: s.get_stock_levels(ctx.product())),
+    Case(ProductService, "set_stock_level", lambda s, ctx, id: s.set_stock_level(
+        id, settings.default_warehouse_id, StockLevelUpdate(quantity=20)), _new_product),
+    Case(ProductService, "rebalance_stock", lambda s, ctx, id: s.rebalance_stock([id]), _new_striped_product),
+    # Warehouses
+    Case(WarehouseService, "get_warehouses", lambda s, ctx, _: s.get_warehouses()),
+    Case(WarehouseService, "create_warehouse", lambda s, ctx, _: s.create_warehouse(
+        WarehouseCreate(code=f"bench-{uuid.uuid4().hex[:12]}", name="Bench warehouse"))),
+    Case(WarehouseService, "update_warehouse", lambda s, ctx, id: s.update_warehouse(
+        id, WarehouseUpdate(name="Bench renamed")), _new_warehouse),
+]
+
+
+def uncovered_methods() -> list[str]:
+    """Public async service methods without a benchmark case (keeps the suite complete)."""
+    covered = {case.name for case in CASES}
+    missing = []
+    for service in SERVICES:
+        for name, _ in inspect.getmembers(service, inspect.iscoroutinefunction):
+            if not name.startswith("_") and f"{service.__name__}.{name}" not in covered:
+                missing.append(f"{service.__name__}.{name}")
+    return missing
+
+
+async def run(args: argparse.Namespace) -> Recorder:
+    ctx = await load_context(args.seed)
+    recorder = Recorder()
+    cases = [c for c in CASES if not args.only or any(part in c.name for part in args.only)]
+    for case in cases:
+        for i in range(args.warmup + args.iterations):
+            await ensure_id_lease()
+            arg = await case.setup(ctx) if case.setup else None
+            async with AsyncSessionLocal() as session:
+                service = case.service(session)
+                started = time.perf_counter()
+                ok = True
+                try:
+                    await case.call(service, ctx, arg)
+                    await session.commit()
+                except Exception:
+                    ok = False
+                    await session.rollback()
+                elapsed = time.perf_counter() - started
+            if i >= args.warmup:
+                recorder.record(case.name, elapsed, ok)
+    await dispose_engine()
+    return recorder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="Run cases whose name contains any of these substrings")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    missing = uncovered_methods()
+    if missing:
+        print("WARNING: service methods without a benchmark:", ", ".join(missing))
+
+    recorder = asyncio.run(run(args))
+    rows = recorder.summary()
+    print_table(rows)
+    if args.json:
+        write_json(args.json, rows, kind="micro", iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Fast synthetic ERP dataset seeder (COPY-based).
+
+Skew is deliberate so benchmarks see production-like access patterns:
+- category trees are deep and unbalanced (new categories tend to nest under recent ones);
+- product popularity in orders is Zipf-distributed (a few hot SKUs take most lines);
+- a minority of clients places most orders.
+
+    python -m benchmarks.seed --categories 5000 --products 2000000 --clients 200000 --orders 1000000 --truncate
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from array import array
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from benchmarks.db import connect
+
+CHUNK = 50_000
+STATUSES = ["new", "processing", "paid", "completed", "cancelled"]
+STATUS_WEIGHTS = [10, 10, 20, 55, 5]
+WORDS = (
+    "steel wooden smart compact premium classic mini pro ultra eco wireless portable "
+    "lamp chair table drill kettle laptop monitor cable router filter pump valve panel "
+    "sensor fridge washer heater fan speaker camera printer scanner tablet phone"
+).split()
+
+TABLES = (
+    "order_products", "orders", "client_stats", "products", "clients", "categories", "outbox", "jobs",
+    "products_archive", "clients_archive", "categories_archive", "product_prices",
+    "stock_reservations", "stock_levels", "warehouses",
+)
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _chunks(iterable, size: int = CHUNK):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def zipf_cum_weights(n: int, s: float) -> list[float]:
+    """Cumulative weights for rank-frequency 1/k^s over n items (for random.choices)."""
+    total = 0.0
+    cum = []
+    for k in range(1, n + 1):
+        total += 1.0 / k ** s
+        cum.append(total)
+    return cum
+
+
+def gen_categories(rng: random.Random, count: int, roots: int, max_depth: int, deep_bias: float):
+    """Yield category rows: `roots` top-level trees, nested up to max_depth."""
+    now = _now()
+    depth: dict[int, int] = {}
+    root_of: dict[int, int] = {}
+    ids: list[int] = []
+    for id in range(1, count + 1):
+        if id <= roots:
+            parent_id = None
+            root_of[id] = id
+            depth[id] = 0
+        else:
+            # Prefer nesting under a recent category: long, narrow branches.
+            candidate = ids[-1] if rng.random() < deep_bias else rng.choice(ids)
+            while depth[candidate] >= max_depth:
+                candidate = rng.choice(ids[:roots])
+            parent_id = candidate
+            root_of[id] = root_of[candidate]
+            depth[id] = depth[candidate] + 1
+        ids.append(id)
+        yield (id, f"Category {id}", parent_id, root_of[id], now, now, False, None)
+
+
+def _sku(product_id: int) -> str:
+    return f"SKU-{product_id:08d}"
+
+
+def gen_products(rng, count, category_ids, deleted_ratio, prices: array, names: list[str]):
+    now = _now()
+    for id in range(1, count + 1):
+        price_cents = int(rng.lognormvariate(8, 1.2)) + 100
+        prices.append(price_cents)
+        deleted = rng.random() < deleted_ratio
+        created = now - timedelta(days=rng.randint(0, 1000))
+        name = " ".join(rng.sample(WORDS, 3)).capitalize() + f" {id}"
+        names.append(name)
+        yield (
+            id, _sku(id), name, Decimal(price_cents) / 100,
+            rng.choice(category_ids), created, created, deleted, now if deleted else None,
+        )
+
+
+def gen_warehouses(count):
+    now = _now()
+    for id in range(1, count + 1):
+        yield (id, "default" if id == 1 else f"wh-{id}", f"Warehouse {id}", True, now)
+
+
+def gen_stock_levels(rng, products, warehouses):
+    """Every product at the default warehouse, and at each other one with probability 1/2."""
+    for product_id in range(1, products + 1):
+        for warehouse_id in range(1, warehouses + 1):
+            if warehouse_id == 1 or rng.random() < 0.5:
+                yield (product_id, warehouse_id, rng.randint(0, 2500), 0)
+
+
+def gen_clients(rng, count):
+    now = _now()
+    for id in range(1, count + 1):
+        created = now - timedelta(days=rng.randint(0, 1000))
+        yield (id, f"Client {id}", f"{id} Bench street", f"client{id}@bench.example", created, created, False, None)
+
+
+def gen_orders(rng, count, client_cum, days):
+    now = _now()
+    clients = range(1, len(client_cum) + 1)
+    for id, client_id, status in zip(
+        range(1, count + 1),
+        _flatten(rng.choices(clients, cum_weights=client_cum, k=min(CHUNK, count)) for _ in itertools.count()),
+        _flatten(rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=CHUNK) for _ in itertools.count()),
+        strict=False,  # the random streams are endless; the ids bound the loop
+    ):
+        created = now - timedelta(seconds=rng.randint(0, days * 86400))
+        yield (id, client_id, status, created, created)
+
+
+def gen_order_products(rng, order_count, max_items, product_cum, prices: array, names: list[str]):
+    products = range(1, len(product_cum) + 1)
+    id = 0
+    for order_id in range(1, order_count + 1):
+        n = rng.randint(1, max_items)
+        for product_id in set(rng.choices(products, cum_weights=product_cum, k=n)):
+            id += 1
+            yield (
+                id, order_id, product_id, rng.randint(1, 5), Decimal(prices[product_id - 1]) / 100,
+                names[product_id - 1], _sku(product_id),
+            )
+
+
+def _flatten(chunks):
+    for chunk in chunks:
+        yield from chunk
+
+
+async def copy(conn, table: str, columns: list[str], rows) -> int:
+    started = time.perf_counter()
+    total = 0
+    for chunk in _chunks(rows):
+        await conn.copy_records_to_table(table, records=chunk, columns=columns)
+        total += len(chunk)
+    print(f"  {table}: {total} rows in {time.perf_counter() - started:.1f}s")
+    return total
+
+
+async def seed(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    conn = await connect()
+    try:
+        if args.truncate:
+            await conn.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+
+        roots = max(1, args.categories // 100)
+        await copy(
+            conn, "categories",
+            ["id", "name", "parent_id", "root_category_id", "created_at", "updated_at", "is_deleted", "deleted_at"],
+            gen_categories(rng, args.categories, roots, args.max_depth, args.deep_bias),
+        )
+        prices = array("q")
+        names: list[str] = []
+        await copy(
+            conn, "products",
+            ["id", "sku", "name", "price", "category_id",
+             "created_at", "updated_at", "is_deleted", "deleted_at"],
+            gen_products(rng, args.products, range(1, args.categories + 1), args.deleted_ratio, prices, names),
+        )
+        await copy(
+            conn, "warehouses", ["id", "code", "name", "is_active", "created_at"], gen_warehouses(args.warehouses)
+        )
+        await copy(
+            conn, "stock_levels",
+            ["product_id", "warehouse_id", "quantity", "reserved"],
+            gen_stock_levels(rng, args.products, args.warehouses),
+        )
+        await copy(
+            conn, "clients",
+            ["id", "full_name", "address", "email", "created_at", "updated_at", "is_deleted", "deleted_at"],
+            gen_clients(rng, args.clients),
+        )
+        await copy(
+            conn, "orders",
+            ["id", "client_id", "status", "created_at", "updated_at"],
+            gen_orders(rng, args.orders, zipf_cum_weights(args.clients, 0.8), args.days),
+        )
+        await copy(
+            conn, "order_products",
+            ["id", "order_id", "product_id", "quantity", "price_at_order", "product_name", "sku"],
+            gen_order_products(
+                rng, args.orders, args.max_items, zipf_cum_weights(args.products, args.hot_skew), prices, names
+            ),
+        )
+        await finalize(conn)
+    finally:
+        await conn.close()
+
+
+async def finalize(conn) -> None:
+    """Align sequences with explicit ids, rebuild derived tables, refresh planner stats."""
+    for table in ("categories", "products", "warehouses", "clients", "orders", "order_products"):
+        await conn.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+        )
+    await conn.execute("""
+        UPDATE orders AS o SET item_count = t.item_count, total_amount = t.total_amount
+        FROM (
+            SELECT order_id, SUM(quantity) AS item_count, SUM(quantity * price_at_order) AS total_amount
+            FROM order_products GROUP BY order_id
+        ) AS t
+        WHERE o.id = t.order_id
+    """)
+    await conn.execute("TRUNCATE product_prices")
+    await conn.execute("""
+        INSERT INTO product_prices (product_id, price, valid_from)
+        SELECT id, price, created_at FROM products
+    """)
+    await conn.execute("TRUNCATE client_stats")
+    await conn.execute("""
+        INSERT INTO client_stats (client_id, order_count, lifetime_spend, last_order_at)
+        SELECT client_id, COUNT(*), SUM(total_amount), MAX(created_at)
+        FROM orders
+        GROUP BY client_id
+    """)
+    await conn.execute("ANALYZE")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=2_000)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--warehouses", type=int, default=4, help="Stock locations")
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--max-items", type=int, default=6, help="Max lines per order")
+    parser.add_argument("--max-depth", type=int, default=8, help="Max category nesting depth")
+    parser.add_argument("--deep-bias", type=float, default=0.6, help="Probability to nest under the latest category")
+    parser.add_argument("--hot-skew", type=float, default=1.1, help="Zipf exponent of product popularity")
+    parser.add_argument("--deleted-ratio", type=float, default=0.1, help="Share of soft-deleted products")
+    parser.add_argument("--days", type=int, default=365, help="Order dates spread over this many days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Empty all tables first")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    asyncio.run(seed(args))
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Cold-start measurement: import-time breakdown of `app.main` and a startup budget check.
+
+Each run is a fresh interpreter (`python -X importtime`), like a new pod. With --lifespan
+the app's startup (pool warm-up, cache priming) is included, which needs the database.
+
+    python -m benchmarks.startup --runs 5 --top 25
+    python -m benchmarks.startup --budget-ms 1500        # exits 1 when the median is over budget
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+if {lifespan}:
+    import asyncio
+    from app.lifespan import lifespan
+
+    async def start():
+        async with lifespan(app.main.app):
+            return time.perf_counter()
+
+    ready = asyncio.run(start())
+else:
+    ready = imported
+print(json.dumps({{"import_ms": (imported - started) * 1000, "ready_ms": (ready - started) * 1000}}),
+      file=sys.stdout)
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[float, float]]:
+    """{module: (self_ms, cumulative_ms)} from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return modules
+
+
+def run_once(lifespan: bool) -> tuple[dict, dict[str, tuple[float, float]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(lifespan=lifespan)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to list (by self time)")
+    parser.add_argument("--lifespan", action="store_true", help="Include app startup (needs the database)")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median time to ready exceeds this")
+    args = parser.parse_args()
+
+    timings = []
+    breakdown: dict[str, list[tuple[float, float]]] = {}
+    for _ in range(args.runs):
+        timing, modules = run_once(args.lifespan)
+        timings.append(timing)
+        for name, value in modules.items():
+            breakdown.setdefault(name, []).append(value)
+
+    import_ms = statistics.median(t["import_ms"] for t in timings)
+    ready_ms = statistics.median(t["ready_ms"] for t in timings)
+    print(f"import app.main: {import_ms:.0f} ms (median of {args.runs})")
+    if args.lifespan:
+        print(f"ready (import + lifespan startup): {ready_ms:.0f} ms")
+
+    medians = {
+        name: (statistics.median(v[0] for v in values), statistics.median(v[1] for v in values))
+        for name, values in breakdown.items()
+    }
+    print(f"\n{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (self_ms, cumulative_ms) in sorted(medians.items(), key=lambda i: -i[1][0])[:args.top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:9.1f}  {name}")
+
+    if args.budget_ms is not None and ready_ms > args.budget_ms:
+        print(f"\nFAIL: cold start {ready_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Latency aggregation and reporting shared by the benchmark runners."""
+import json
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Recorder:
+    """Collects latencies (seconds) and errors per operation name."""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        self.latencies[name].append(seconds)
+        if not ok:
+            self.errors[name] += 1
+
+    def summary(self, elapsed: float | None = None) -> list[dict]:
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows.append({
+                "name": name,
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "throughput_rps": round(len(values) / elapsed, 1) if elapsed else None,
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            })
+        return rows
+
+
+def print_table(rows: list[dict]) -> None:
+    columns = ["name", "count", "errors", "throughput_rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) if rows else len(c) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def write_json(path: str, rows: list[dict], **meta) -> None:
+    """Machine-readable results, for comparing runs and catching regressions."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": rows}, f, indent=2)
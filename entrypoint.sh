@@ -7,8 +7,24 @@ while ! nc -z db 5432; do
 done
 echo "Postgres has started."
 
-echo "Applying migrations..."
-alembic upgrade head
+# MIGRATE_ON_START: auto (default) migrates only when the schema is behind, always, or never.
+MIGRATE_ON_START=${MIGRATE_ON_START:-auto}
+if [ "$MIGRATE_ON_START" = "always" ] || { [ "$MIGRATE_ON_START" = "auto" ] && ! python -m app.db.revision; }; then
+  echo "Applying migrations..."
+  alembic upgrade head
+  for shard in $(python -c "from app.core.config import settings; print(*settings.db_shards)"); do
+    echo "Applying migrations to shard $shard..."
+    alembic -x shard="$shard" upgrade head
+  done
+else
+  echo "Skipping migrations."
+fi
+
+# Other processes of the image (job worker, outbox relay) are passed as arguments.
+if [ "$#" -gt 0 ]; then
+  echo "Starting $*..."
+  exec "$@"
+fi
 
 echo "Starting application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python -m app.server
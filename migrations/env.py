@@ -30,6 +30,12 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def database_url() -> str:
+    """The DB_* database, or a DB_SHARDS one with `alembic -x shard=<name> upgrade head`."""
+    shard = context.get_x_argument(as_dictionary=True).get("shard", "default")
+    return settings.database_url if shard == "default" else settings.db_shards[shard]
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -42,7 +48,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = settings.database_url
+    url = database_url()
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -67,7 +73,7 @@ async def run_async_migrations() -> None:
 
     """
     section = config.get_section(config.config_ini_section, {})
-    section["sqlalchemy.url"] = settings.database_url
+    section["sqlalchemy.url"] = database_url()
 
     connectable = async_engine_from_config(
         section,
@@ -0,0 +1,48 @@
+"""Transactional outbox
+
+Revision ID: 02
+Revises: 01
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '02'
+down_revision: str | Sequence[str] | None = '01'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.BigInteger(), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.Column('published_at', sa.DateTime(), nullable=True),
+    sa.Column('position', sa.BigInteger(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_outbox_unpublished', 'outbox', ['id'], unique=False,
+        postgresql_where=sa.text('published_at IS NULL')
+    )
+    # Stream positions, assigned by the relay in publish order.
+    op.execute('CREATE SEQUENCE outbox_position_seq')
+    op.create_index('ix_outbox_position', 'outbox', ['position'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_position', table_name='outbox')
+    op.execute('DROP SEQUENCE outbox_position_seq')
+    op.drop_index('ix_outbox_unpublished', table_name='outbox', postgresql_where=sa.text('published_at IS NULL'))
+    op.drop_table('outbox')
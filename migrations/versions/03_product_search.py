@@ -0,0 +1,46 @@
+"""Product full-text and trigram search
+
+Revision ID: 03
+Revises: 02
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '03'
+down_revision: str | Sequence[str] | None = '02'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('products', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(sku, ''))", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_products_name_trgm', 'products', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_products_sku_trgm', 'products', ['sku'], unique=False,
+        postgresql_using='gin', postgresql_ops={'sku': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_sku_trgm', table_name='products')
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
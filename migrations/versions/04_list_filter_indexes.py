@@ -0,0 +1,44 @@
+"""Indexes for list filters and sorts
+
+Revision ID: 04
+Revises: 03
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '04'
+down_revision: str | Sequence[str] | None = '03'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_name', 'products', ['name'], unique=False)
+    op.create_index('ix_products_price', 'products', ['price'], unique=False)
+    op.create_index('ix_products_category_id_name', 'products', ['category_id', 'name'], unique=False)
+    op.create_index('ix_products_category_id_price', 'products', ['category_id', 'price'], unique=False)
+    op.create_index(
+        'ix_products_in_stock_name', 'products', ['name'], unique=False,
+        postgresql_where=sa.text('quantity > 0')
+    )
+    op.create_index('ix_clients_full_name', 'clients', ['full_name'], unique=False)
+    op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'], unique=False)
+    op.create_index('ix_orders_client_id_created_at', 'orders', ['client_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_client_id_created_at', table_name='orders')
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
+    op.drop_index('ix_clients_full_name', table_name='clients')
+    op.drop_index('ix_products_in_stock_name', table_name='products')
+    op.drop_index('ix_products_category_id_price', table_name='products')
+    op.drop_index('ix_products_category_id_name', table_name='products')
+    op.drop_index('ix_products_price', table_name='products')
+    op.drop_index('ix_products_name', table_name='products')
@@ -0,0 +1,49 @@
+"""Client order aggregates
+
+Revision ID: 05
+Revises: 04
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '05'
+down_revision: str | Sequence[str] | None = '04'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('client_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('lifetime_spend', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('last_order_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('client_id')
+    )
+    # Backfill from existing orders (same aggregate as sql/2.1_client_order_totals.sql).
+    op.execute("""
+        INSERT INTO client_stats (client_id, order_count, lifetime_spend, last_order_at)
+        SELECT
+            o.client_id,
+            COUNT(DISTINCT o.id),
+            COALESCE(SUM(op.quantity * op.price_at_order), 0),
+            MAX(o.created_at)
+        FROM orders AS o
+        LEFT JOIN order_products AS op ON o.id = op.order_id
+        GROUP BY o.client_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('client_stats')
@@ -0,0 +1,55 @@
+"""Background jobs
+
+Revision ID: 06
+Revises: 05
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '06'
+down_revision: str | Sequence[str] | None = '05'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('kind', sa.String(length=100), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'succeeded', 'failed', name='job_status'),
+              server_default='queued', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_jobs_queued_run_after', 'jobs', ['run_after'], unique=False,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'ix_jobs_running_locked_at', 'jobs', ['locked_at'], unique=False,
+        postgresql_where=sa.text("status = 'running'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_running_locked_at', table_name='jobs', postgresql_where=sa.text("status = 'running'"))
+    op.drop_index('ix_jobs_queued_run_after', table_name='jobs', postgresql_where=sa.text("status = 'queued'"))
+    op.drop_table('jobs')
+    sa.Enum(name='job_status').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""Order totals
+
+Revision ID: 07
+Revises: 06
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '07'
+down_revision: str | Sequence[str] | None = '06'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('orders', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column(
+        'orders', sa.Column('total_amount', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False)
+    )
+    # Backfill from existing lines; updated_at is left alone (the order itself did not change).
+    op.execute("""
+        UPDATE orders AS o
+        SET item_count = t.item_count, total_amount = t.total_amount
+        FROM (
+            SELECT order_id, SUM(quantity) AS item_count, SUM(quantity * price_at_order) AS total_amount
+            FROM order_products
+            GROUP BY order_id
+        ) AS t
+        WHERE o.id = t.order_id
+    """)
+    op.create_index('ix_orders_total_amount', 'orders', ['total_amount'], unique=False)
+    op.create_index('ix_orders_created_at_total_amount', 'orders', ['created_at', 'total_amount'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_created_at_total_amount', table_name='orders')
+    op.drop_index('ix_orders_total_amount', table_name='orders')
+    op.drop_column('orders', 'total_amount')
+    op.drop_column('orders', 'item_count')
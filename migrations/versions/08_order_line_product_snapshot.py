@@ -0,0 +1,38 @@
+"""Order line product snapshot
+
+Revision ID: 08
+Revises: 07
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '08'
+down_revision: str | Sequence[str] | None = '07'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_products', sa.Column('product_name', sa.String(length=255), nullable=True))
+    op.add_column('order_products', sa.Column('sku', sa.String(length=50), nullable=True))
+    # Existing lines get the product's current name/SKU: the best record there is.
+    op.execute("""
+        UPDATE order_products AS op
+        SET product_name = p.name, sku = p.sku
+        FROM products AS p
+        WHERE p.id = op.product_id
+    """)
+    op.alter_column('order_products', 'product_name', nullable=False)
+    op.alter_column('order_products', 'sku', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('order_products', 'sku')
+    op.drop_column('order_products', 'product_name')
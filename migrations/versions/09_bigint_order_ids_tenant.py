@@ -0,0 +1,58 @@
+"""64-bit order ids, snowflake node leases, tenant key and shard-local orders
+
+Revision ID: 09
+Revises: 08
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '09'
+down_revision: str | Sequence[str] | None = '08'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites both tables (and their indexes) once; schedule on large databases.
+    op.alter_column('order_products', 'order_id', type_=sa.BigInteger(), existing_nullable=False)
+    op.alter_column('order_products', 'id', type_=sa.BigInteger(), existing_nullable=False)
+    op.alter_column('orders', 'id', type_=sa.BigInteger(), existing_nullable=False)
+    op.execute("ALTER SEQUENCE orders_id_seq AS bigint")
+    op.execute("ALTER SEQUENCE order_products_id_seq AS bigint")
+    # Node ids for app.db.ids, leased per process (used on the default database only).
+    op.create_table('id_node_leases',
+    sa.Column('id', sa.SmallInteger(), autoincrement=False, nullable=False),
+    sa.Column('holder', sa.String(length=255), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # clients exist on the default shard only; on any other shard this key would reject every order.
+    op.drop_constraint('orders_client_id_fkey', 'orders', type_='foreignkey')
+    # Constant default: metadata-only, no rewrite.
+    op.add_column('orders', sa.Column('tenant_id', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('order_products', sa.Column('tenant_id', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_orders_tenant_id_created_at', 'orders', ['tenant_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_tenant_id_created_at', table_name='orders')
+    op.drop_column('order_products', 'tenant_id')
+    op.drop_column('orders', 'tenant_id')
+    # Fails on a shard holding orders of clients it does not have (every shard but the default).
+    op.create_foreign_key(
+        'orders_client_id_fkey', 'orders', 'clients', ['client_id'], ['id'], ondelete='RESTRICT'
+    )
+    op.drop_table('id_node_leases')
+    # Fails if snowflake ids were issued (they do not fit in integer).
+    op.execute("ALTER SEQUENCE order_products_id_seq AS integer")
+    op.execute("ALTER SEQUENCE orders_id_seq AS integer")
+    op.alter_column('orders', 'id', type_=sa.Integer(), existing_nullable=False)
+    op.alter_column('order_products', 'id', type_=sa.Integer(), existing_nullable=False)
+    op.alter_column('order_products', 'order_id', type_=sa.Integer(), existing_nullable=False)
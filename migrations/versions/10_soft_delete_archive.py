@@ -0,0 +1,71 @@
+"""Archive tables for soft-deleted rows
+
+Revision ID: 10
+Revises: 09
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '10'
+down_revision: str | Sequence[str] | None = '09'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('clients_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('products_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('sku', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('categories_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('root_category_id', sa.Integer(), nullable=True),
+    *_timestamps(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Order lines snapshot price, name and SKU, so they no longer need the product row.
+    op.drop_constraint('order_products_product_id_fkey', 'order_products', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while order lines reference archived products; restore those first.
+    op.create_foreign_key(
+        'order_products_product_id_fkey', 'order_products', 'products',
+        ['product_id'], ['id'], ondelete='RESTRICT'
+    )
+    op.drop_table('categories_archive')
+    op.drop_table('products_archive')
+    op.drop_table('clients_archive')
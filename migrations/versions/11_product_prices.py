@@ -0,0 +1,59 @@
+"""Effective-dated product prices
+
+Revision ID: 11
+Revises: 10
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '11'
+down_revision: str | Sequence[str] | None = '10'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Integer equality in the GiST exclusion constraint below.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_table('product_prices',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('valid_from', sa.DateTime(), nullable=False),
+    sa.Column('valid_to', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('price > 0', name='check_product_price_positive'),
+    sa.CheckConstraint('valid_to IS NULL OR valid_to > valid_from', name='check_product_price_period'),
+    postgresql.ExcludeConstraint(
+        ('product_id', '='),
+        (sa.text('tsrange(valid_from, valid_to)'), '&&'),
+        name='excl_product_prices_overlap',
+        using='gist',
+    ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Current prices become the first period: known from creation, the best record there is.
+    op.execute("""
+        INSERT INTO product_prices (product_id, price, valid_from)
+        SELECT id, price, created_at FROM products
+        UNION ALL
+        SELECT id, price, created_at FROM products_archive
+    """)
+    op.create_index(
+        'ix_product_prices_product_id_valid_from', 'product_prices', ['product_id', 'valid_from'], unique=True
+    )
+    op.create_index('ix_product_prices_valid_from', 'product_prices', ['valid_from'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_prices_valid_from', table_name='product_prices')
+    op.drop_index('ix_product_prices_product_id_valid_from', table_name='product_prices')
+    op.drop_table('product_prices')
@@ -0,0 +1,109 @@
+"""Per-warehouse stock levels and order reservations
+
+Revision ID: 12
+Revises: 11
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '12'
+down_revision: str | Sequence[str] | None = '11'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+PRODUCT_STOCK_VIEW = """
+    CREATE VIEW product_stock AS
+    SELECT s.product_id,
+           SUM(s.quantity)::integer AS quantity,
+           SUM(s.reserved)::integer AS reserved,
+           SUM(s.quantity - s.reserved)::integer AS available
+    FROM stock_levels s
+    JOIN warehouses w ON w.id = s.warehouse_id
+    WHERE w.is_active
+    GROUP BY s.product_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('warehouses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), server_default='true', nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('code')
+    )
+    op.execute("INSERT INTO warehouses (code, name) VALUES ('default', 'Default warehouse')")
+    # No foreign key to products: stock (and what open orders reserved) outlives archiving a product.
+    op.create_table('stock_levels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reserved', sa.Integer(), server_default='0', nullable=False),
+    sa.CheckConstraint('reserved >= 0 AND reserved <= quantity', name='check_stock_level_reserved'),
+    sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('product_id', 'warehouse_id', name='uq_stock_level_product_warehouse')
+    )
+    op.create_index(op.f('ix_stock_levels_warehouse_id'), 'stock_levels', ['warehouse_id'], unique=False)
+    # Reservations rewrite these rows constantly; free space per page keeps the updates HOT
+    # (no indexed column changes), so they touch no index.
+    op.execute('ALTER TABLE stock_levels SET (fillfactor = 80)')
+    op.create_table('stock_reservations',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('order_id', sa.BigInteger(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('warehouse_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('quantity > 0', name='check_stock_reservation_quantity_positive'),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_id', 'product_id', 'warehouse_id', name='uq_stock_reservation')
+    )
+
+    # Current stock moves to the default warehouse, unreserved: products.quantity was
+    # already net of existing orders, which therefore hold no reservations.
+    op.execute("""
+        INSERT INTO stock_levels (product_id, warehouse_id, quantity)
+        SELECT id, (SELECT id FROM warehouses WHERE code = 'default'), quantity FROM products
+    """)
+    op.execute(PRODUCT_STOCK_VIEW)
+    op.drop_index('ix_products_in_stock_name', table_name='products')
+    op.drop_constraint('check_product_quantity_positive', 'products', type_='check')
+    op.drop_column('products', 'quantity')
+    op.drop_column('products_archive', 'quantity')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('products_archive', sa.Column('quantity', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('products', sa.Column('quantity', sa.Integer(), server_default='0', nullable=False))
+    # Reserved units count as sold again, as before reservations existed.
+    op.execute("""
+        UPDATE products p SET quantity = s.available
+        FROM (SELECT product_id, SUM(quantity - reserved) AS available FROM stock_levels GROUP BY product_id) s
+        WHERE s.product_id = p.id
+    """)
+    op.alter_column('products', 'quantity', server_default=None)
+    op.alter_column('products_archive', 'quantity', server_default=None)
+    op.create_check_constraint('check_product_quantity_positive', 'products', 'quantity >= 0')
+    op.create_index(
+        'ix_products_in_stock_name', 'products', ['name'], unique=False,
+        postgresql_where=sa.text('quantity > 0')
+    )
+    op.execute('DROP VIEW product_stock')
+    op.drop_table('stock_reservations')
+    op.drop_index(op.f('ix_stock_levels_warehouse_id'), table_name='stock_levels')
+    op.drop_table('stock_levels')
+    op.drop_table('warehouses')
@@ -0,0 +1,93 @@
+"""Striped stock levels for hot products
+
+Revision ID: 13
+Revises: 12
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '13'
+down_revision: str | Sequence[str] | None = '12'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('stock_stripes', sa.SmallInteger(), server_default='1', nullable=False))
+    op.add_column(
+        'products_archive', sa.Column('stock_stripes', sa.SmallInteger(), server_default='1', nullable=False)
+    )
+    op.create_check_constraint('check_product_stock_stripes_positive', 'products', 'stock_stripes >= 1')
+    op.create_index(
+        'ix_products_striped', 'products', ['id'], unique=False,
+        postgresql_where=sa.text('stock_stripes > 1')
+    )
+
+    # Existing rows become stripe 0, the only stripe of an unstriped product.
+    op.add_column('stock_levels', sa.Column('stripe', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('uq_stock_level_product_warehouse', 'stock_levels', type_='unique')
+    op.create_unique_constraint(
+        'uq_stock_level_product_warehouse_stripe', 'stock_levels', ['product_id', 'warehouse_id', 'stripe']
+    )
+    op.create_index(
+        'ix_stock_levels_striped', 'stock_levels', ['product_id'], unique=False,
+        postgresql_where=sa.text('stripe > 0')
+    )
+    op.add_column('stock_reservations', sa.Column('stripe', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('uq_stock_reservation', 'stock_reservations', type_='unique')
+    op.create_unique_constraint(
+        'uq_stock_reservation', 'stock_reservations', ['order_id', 'product_id', 'warehouse_id', 'stripe']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fold every stripe back into stripe 0.
+    op.execute("""
+        UPDATE stock_levels s SET quantity = t.quantity, reserved = t.reserved
+        FROM (
+            SELECT product_id, warehouse_id, SUM(quantity) AS quantity, SUM(reserved) AS reserved
+            FROM stock_levels GROUP BY product_id, warehouse_id
+        ) t
+        WHERE s.product_id = t.product_id AND s.warehouse_id = t.warehouse_id AND s.stripe = 0
+    """)
+    op.execute("""
+        INSERT INTO stock_levels (product_id, warehouse_id, quantity, reserved)
+        SELECT product_id, warehouse_id, SUM(quantity), SUM(reserved) FROM stock_levels
+        GROUP BY product_id, warehouse_id HAVING MIN(stripe) > 0
+    """)
+    op.execute('DELETE FROM stock_levels WHERE stripe > 0')
+    op.execute("""
+        INSERT INTO stock_reservations (order_id, tenant_id, product_id, warehouse_id, quantity, created_at, stripe)
+        SELECT order_id, MIN(tenant_id), product_id, warehouse_id, SUM(quantity), MIN(created_at), -1
+        FROM stock_reservations GROUP BY order_id, product_id, warehouse_id HAVING COUNT(*) > 1
+    """)
+    op.execute("""
+        DELETE FROM stock_reservations r
+        WHERE r.stripe >= 0 AND EXISTS (
+            SELECT 1 FROM stock_reservations m
+            WHERE m.stripe = -1 AND m.order_id = r.order_id
+              AND m.product_id = r.product_id AND m.warehouse_id = r.warehouse_id
+        )
+    """)
+    op.drop_constraint('uq_stock_reservation', 'stock_reservations', type_='unique')
+    op.drop_column('stock_reservations', 'stripe')
+    op.create_unique_constraint(
+        'uq_stock_reservation', 'stock_reservations', ['order_id', 'product_id', 'warehouse_id']
+    )
+    op.drop_index('ix_stock_levels_striped', table_name='stock_levels')
+    op.drop_constraint('uq_stock_level_product_warehouse_stripe', 'stock_levels', type_='unique')
+    op.drop_column('stock_levels', 'stripe')
+    op.create_unique_constraint(
+        'uq_stock_level_product_warehouse', 'stock_levels', ['product_id', 'warehouse_id']
+    )
+    op.drop_index('ix_products_striped', table_name='products')
+    op.drop_constraint('check_product_stock_stripes_positive', 'products', type_='check')
+    op.drop_column('products_archive', 'stock_stripes')
+    op.drop_column('products', 'stock_stripes')
@@ -0,0 +1,105 @@
+"""Tests run against the database configured by the DB_* settings, migrated to head.
+
+They are skipped when the settings are missing or the database is unreachable.
+"""
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+# Fixtures create data faster than the per-client write limit allows.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+try:
+    from app.core.config import settings  # noqa: F401
+except ValidationError:
+    SETTINGS_MISSING = True
+    pytest_plugins = []
+else:
+    SETTINGS_MISSING = False
+    pytest_plugins = ["app.testing"]
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+
+
+async def _ping() -> None:
+    from app.db.session import dispose_engine, get_engine
+
+    try:
+        async with get_engine().connect():
+            pass
+    finally:
+        await dispose_engine()
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    if SETTINGS_MISSING:
+        for item in items:
+            item.add_marker(pytest.mark.skip(reason="DB_* settings are not configured"))
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    try:
+        asyncio.run(_ping())
+    except OSError as exc:
+        pytest.skip(f"Database is unreachable: {exc}")
+
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+
+@pytest.fixture
+async def client(database) -> AsyncIterator:
+    import httpx
+
+    from app.core.cache import clear_all
+    from app.db.session import dispose_engine
+    from app.main import app
+
+    clear_all()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    # The pool belongs to this test's event loop.
+    await dispose_engine()
+
+
+@pytest.fixture
+async def catalogue(client) -> dict:
+    """A category with three products in stock."""
+    response = await client.post("/api/v1/categories/", json={"name": f"Test {uuid.uuid4().hex[:8]}"})
+    category = response.raise_for_status().json()
+    products = []
+    for i in range(3):
+        response = await client.post("/api/v1/products/", json={
+            "name": f"Test product {i}", "price": "2.50", "quantity": 100,
+            "category_id": category["id"], "sku": f"TEST-{uuid.uuid4().hex[:12]}",
+        })
+        products.append(response.raise_for_status().json())
+    return {"category": category, "products": products}
+
+
+@pytest.fixture
+async def orders(client, catalogue) -> dict:
+    """A client with three orders of three lines each."""
+    response = await client.post("/api/v1/clients/", json={
+        "full_name": "Test client", "email": f"test-{uuid.uuid4().hex}@example.com"
+    })
+    owner = response.raise_for_status().json()
+    order_ids = []
+    for _ in range(3):
+        response = await client.post("/api/v1/orders/", params={"client_id": owner["id"]})
+        order_id = response.raise_for_status().json()["id"]
+        for product in catalogue["products"]:
+            response = await client.post(
+                f"/api/v1/orders/{order_id}/items", json={"product_id": product["id"], "quantity": 1}
+            )
+            response.raise_for_status()
+        order_ids.append(order_id)
+    return {"client": owner, "order_ids": order_ids}
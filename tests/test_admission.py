@@ -0,0 +1,46 @@
+"""Per-client rate limits."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+
+def _request(api_key: str | None = None, host: str = "10.0.0.1") -> Request:
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/v1/products/", "headers": headers, "client": (host, 40000)
+    })
+
+
+@pytest.fixture
+def admission(monkeypatch):
+    # Imported here: app modules need the DB_* settings, which conftest skips without.
+    from app.api import admission
+    from app.core.config import settings
+    from app.core.ratelimit import InMemoryBackend, Limit
+
+    monkeypatch.setattr(admission, "_backend", InMemoryBackend())
+    monkeypatch.setattr(admission, "_limits", {"read": Limit(rate=0.001, burst=2)})
+    monkeypatch.setattr(settings, "rate_limit_api_keys", ["known-key"])
+    return admission
+
+
+async def test_rotating_unknown_keys_share_the_ip_bucket(admission):
+    for _ in range(2):
+        await admission.rate_limit(_request(uuid.uuid4().hex))
+    with pytest.raises(HTTPException) as exc:
+        await admission.rate_limit(_request(uuid.uuid4().hex))
+    assert exc.value.status_code == 429
+
+
+async def test_non_ascii_key_is_limited_by_ip(admission):
+    assert admission._client_key(_request("ключ".encode().decode("latin-1"))) == "ip:10.0.0.1"
+
+
+async def test_known_key_has_its_own_bucket(admission):
+    for _ in range(2):
+        await admission.rate_limit(_request())
+    await admission.rate_limit(_request("known-key"))
+    with pytest.raises(HTTPException):
+        await admission.rate_limit(_request())
@@ -0,0 +1,140 @@
+"""TTLCache and SingleFlight: coalesced loads, stale-while-revalidate, LRU eviction."""
+import asyncio
+import uuid
+
+import pytest
+
+
+def _cache(**kwargs):
+    # Imported here: app modules need the DB_* settings, which conftest skips without.
+    from app.core.cache import TTLCache
+
+    return TTLCache(f"test-{uuid.uuid4().hex[:8]}", **kwargs)
+
+
+class _Loader:
+    """Counts calls; each call waits for `release` and returns the next value."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = _cache(ttl=60)
+    load = _Loader("value")
+    callers = [asyncio.create_task(cache.get_or_load("key", load)) for _ in range(10)]
+    await load.started.wait()
+    load.release.set()
+    assert await asyncio.gather(*callers) == ["value"] * 10
+    assert load.calls == 1
+    assert cache.get("key") == "value"
+
+
+async def test_failed_load_reaches_every_waiter_and_caches_nothing():
+    from app.core.cache import MISSING
+
+    cache = _cache(ttl=60)
+    load = _Loader(RuntimeError("boom"))
+    callers = [asyncio.create_task(cache.get_or_load("key", load)) for _ in range(3)]
+    await load.started.wait()
+    load.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert load.calls == 1
+    assert cache.get("key") is MISSING
+
+
+async def test_stale_value_is_served_while_one_caller_refreshes():
+    cache = _cache(ttl=0.01, stale_ttl=60)
+    cache.set("key", "old")
+    await asyncio.sleep(0.02)
+    cache.ttl = 60  # the refreshed entry stays fresh for the asserts
+
+    load = _Loader("new")
+    refresher = asyncio.create_task(cache.get_or_load("key", load))
+    await load.started.wait()
+    # Others do not wait for the reload.
+    assert await cache.get_or_load("key", load) == "old"
+    load.release.set()
+    assert await refresher == "new"
+    assert load.calls == 1
+    assert cache.get("key") == "new"
+
+
+async def test_stale_value_is_served_when_the_refresh_fails():
+    cache = _cache(ttl=0.01, stale_ttl=60)
+    cache.set("key", "old")
+    await asyncio.sleep(0.02)
+
+    load = _Loader(RuntimeError("database down"))
+    load.release.set()
+    assert await cache.get_or_load("key", load) == "old"
+
+
+async def test_load_started_before_pop_is_not_stored():
+    from app.core.cache import MISSING
+
+    cache = _cache(ttl=60)
+    load = _Loader("before write")
+    caller = asyncio.create_task(cache.get_or_load("key", load))
+    await load.started.wait()
+    cache.pop("key")
+    load.release.set()
+    assert await caller == "before write"
+    assert cache.get("key") is MISSING
+
+
+def test_least_recently_used_entry_is_evicted_at_maxsize():
+    from app.core.cache import MISSING
+
+    cache = _cache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+async def test_follower_takes_over_when_the_leader_is_cancelled():
+    from app.core.singleflight import SingleFlight
+
+    flight = SingleFlight(f"test-{uuid.uuid4().hex[:8]}")
+    first, second = _Loader("leader"), _Loader("follower")
+    second.release.set()
+    leader = asyncio.create_task(flight.do("key", first))
+    await first.started.wait()
+    follower = asyncio.create_task(flight.do("key", second))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == "follower"
+    assert not flight.in_flight("key")
+
+
+async def test_follower_timeout_does_not_interrupt_the_leader():
+    from app.core.singleflight import SingleFlight
+
+    flight = SingleFlight(f"test-{uuid.uuid4().hex[:8]}")
+    load = _Loader("value")
+    leader = asyncio.create_task(flight.do("key", load))
+    await load.started.wait()
+    with pytest.raises(TimeoutError):
+        await flight.do("key", load, timeout=0.01)
+    load.release.set()
+    assert await leader == "value"
+    assert load.calls == 1
@@ -0,0 +1,115 @@
+"""ListQuery: whitelisted filters and sorts, cross-shard page merging."""
+import enum
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, Enum, Integer, MetaData, Numeric, Table, select
+
+from app.repositories.filters import Filter, InvalidQueryError, ListQuery
+
+
+class Status(enum.Enum):
+    # Declaration order differs from label order, like OrderStatus.
+    PENDING = "pending"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+orders = Table(
+    "orders", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("client_id", Integer),
+    Column("status", Enum(Status)),
+    Column("total", Numeric),
+    Column("created_at", DateTime),
+)
+
+QUERY = ListQuery(
+    filters={
+        "client_id": Filter(orders.c.client_id),
+        "min_total": Filter(orders.c.total, "ge"),
+        "statuses": Filter(orders.c.status, "in"),
+    },
+    sorts={"created_at": orders.c.created_at, "status": orders.c.status, "total": orders.c.total},
+    default_sort="-created_at",
+    sort_indexes=(("status", "created_at"),),
+    tiebreaker=orders.c.id,
+)
+
+
+def _sql(**kwargs) -> str:
+    return str(QUERY.apply(select(orders.c.id), **kwargs)).replace("\n", " ")
+
+
+def test_whitelisted_filters_compile_and_none_is_skipped():
+    sql = _sql(params={"client_id": 7, "min_total": 10, "statuses": None})
+    assert "WHERE orders.client_id = :client_id_1 AND orders.total >= :total_1" in sql
+    assert "status IN" not in sql
+
+
+def test_unknown_filter_is_rejected():
+    with pytest.raises(InvalidQueryError, match="Filtering by 'email'"):
+        _sql(params={"email": "a@example.com"})
+
+
+def test_default_sort_gets_the_tiebreaker_in_the_same_direction():
+    assert _sql().endswith("ORDER BY orders.created_at DESC, orders.id DESC")
+    assert _sql(sort="total").endswith("ORDER BY orders.total ASC, orders.id ASC")
+
+
+def test_indexed_sort_combination_is_allowed():
+    sql = _sql(sort="-status,-created_at")
+    assert sql.endswith("ORDER BY orders.status DESC, orders.created_at DESC, orders.id DESC")
+
+
+@pytest.mark.parametrize(("sort", "message"), [
+    ("email", "Sorting by 'email'"),
+    ("-id", "Sorting by 'id'"),
+    ("created_at,status", "not backed by an index"),
+    ("total,created_at", "not backed by an index"),
+    ("status,-created_at", "Mixed sort directions"),
+])
+def test_unsupported_sort_is_rejected(sort, message):
+    with pytest.raises(InvalidQueryError, match=message):
+        _sql(sort=sort)
+
+
+def _rows(count: int, seed: int) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=id, status=rng.choice(list(Status)), total=rng.randint(1, 5), created_at=rng.randint(0, 20)
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def _database_order(rows, names: list[str], descending: bool) -> list:
+    def key(row):
+        return tuple(list(Status).index(v) if isinstance(v, Status) else v for v in (getattr(row, n) for n in names))
+
+    return sorted(rows, key=key, reverse=descending)
+
+
+@pytest.mark.parametrize(("sort", "names", "descending"), [
+    ("-created_at", ["created_at", "id"], True),
+    ("total", ["total", "id"], False),
+    ("status,created_at", ["status", "created_at", "id"], False),
+])
+@pytest.mark.parametrize(("offset", "limit"), [(0, 10), (7, 5), (35, 10), (60, 5)])
+def test_merge_of_shard_pages_matches_one_sorted_query(sort, names, descending, offset, limit):
+    rows = _rows(60, seed=offset * 100 + limit)
+    shards = [rows[0::3], rows[1::3], rows[2::3]]
+    # Each shard returns its own first offset + limit rows in the requested order.
+    pages = [_database_order(shard, names, descending)[:offset + limit] for shard in shards]
+
+    merged = QUERY.merge(pages, sort, offset, limit)
+
+    expected = _database_order(rows, names, descending)[offset:offset + limit]
+    assert [row.id for row in merged] == [row.id for row in expected]
+
+
+def test_merge_rejects_unsupported_sort():
+    with pytest.raises(InvalidQueryError):
+        QUERY.merge([[], []], "email", 0, 10)
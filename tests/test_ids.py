@@ -0,0 +1,75 @@
+"""SnowflakeGenerator: ordering within a millisecond, sequence overflow, clock steps."""
+import pytest
+
+
+class _Clock:
+    """Stands in for the time module; time_ns() returns what the test sets."""
+
+    def __init__(self, ms: int):
+        self.ms = ms
+
+    def time_ns(self) -> int:
+        return self.ms * 1_000_000
+
+
+@pytest.fixture
+def ids(monkeypatch):
+    # Imported here: app modules need the DB_* settings, which conftest skips without.
+    from app.db import ids
+
+    monkeypatch.setattr(ids, "time", _Clock(ids.EPOCH_MS + 1_000))
+    return ids
+
+
+def _parts(ids, value: int) -> tuple[int, int, int]:
+    return (
+        (value >> (ids.NODE_BITS + ids.SEQUENCE_BITS)) + ids.EPOCH_MS,
+        (value >> ids.SEQUENCE_BITS) & ids.MAX_NODE_ID,
+        value & ids.SEQUENCE_MASK,
+    )
+
+
+def test_ids_within_one_millisecond_increase(ids):
+    generator = ids.SnowflakeGenerator(node_id=5)
+    issued = [generator.next_id() for _ in range(100)]
+    assert issued == sorted(set(issued))
+    assert [_parts(ids, value) for value in issued[:3]] == [
+        (ids.time.ms, 5, 0), (ids.time.ms, 5, 1), (ids.time.ms, 5, 2)
+    ]
+
+
+def test_sequence_overflow_borrows_the_next_millisecond(ids):
+    generator = ids.SnowflakeGenerator(node_id=1)
+    issued = [generator.next_id() for _ in range(ids.SEQUENCE_MASK + 2)]
+    assert issued == sorted(set(issued))
+    assert _parts(ids, issued[-2]) == (ids.time.ms, 1, ids.SEQUENCE_MASK)
+    assert _parts(ids, issued[-1]) == (ids.time.ms + 1, 1, 0)
+
+    # Once the clock catches up, the borrowed millisecond is not issued twice.
+    ids.time.ms += 1
+    assert generator.next_id() > issued[-1]
+
+
+def test_clock_going_backwards_never_reissues_or_reorders(ids):
+    generator = ids.SnowflakeGenerator(node_id=2)
+    before = [generator.next_id() for _ in range(3)]
+    ids.time.ms -= 50
+    after = [generator.next_id() for _ in range(3)]
+    assert before + after == sorted(set(before + after))
+    assert {_parts(ids, value)[0] for value in after} == {ids.time.ms + 50}
+
+    ids.time.ms += 100
+    assert _parts(ids, generator.next_id()) == (ids.time.ms, 2, 0)
+
+
+def test_nodes_do_not_collide_in_the_same_millisecond(ids):
+    first, second = ids.SnowflakeGenerator(node_id=0), ids.SnowflakeGenerator(node_id=ids.MAX_NODE_ID)
+    issued = [generator.next_id() for generator in (first, second) for _ in range(10)]
+    assert len(set(issued)) == 20
+
+
+def test_node_id_out_of_range_is_rejected(ids):
+    with pytest.raises(ValueError):
+        ids.SnowflakeGenerator(node_id=ids.MAX_NODE_ID + 1)
+    with pytest.raises(ValueError):
+        ids.SnowflakeGenerator(node_id=-1)
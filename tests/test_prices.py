@@ -0,0 +1,38 @@
+"""Price list import and scheduled price application."""
+import asyncio
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+
+async def test_import_current_price(client, catalogue):
+    product = catalogue["products"][0]
+    response = await client.post("/api/v1/products/prices/import", json={
+        "items": [{"sku": product["sku"], "price": "3.00"}]
+    })
+    assert response.status_code == 200
+    assert response.json() == {"imported": 1, "applied": 1, "scheduled": 0}
+
+    response = await client.get(f"/api/v1/products/{product['id']}")
+    assert Decimal(response.json()["price"]) == Decimal("3.00")
+    assert response.json()["quantity"] == 100
+
+
+async def test_apply_due_price(client, catalogue):
+    from app.db.session import session_scope
+    from app.jobs.handlers import apply_due_prices
+
+    product = catalogue["products"][1]
+    valid_from = datetime.now(UTC).replace(microsecond=0) + timedelta(seconds=1)
+    response = await client.post("/api/v1/products/prices/import", json={
+        "items": [{"sku": product["sku"], "price": "4.00", "valid_from": valid_from.isoformat()}]
+    })
+    assert response.json() == {"imported": 1, "applied": 0, "scheduled": 1}
+
+    await asyncio.sleep((valid_from - datetime.now(UTC)).total_seconds() + 0.1)
+    # What the PRODUCT_PRICES_DUE job runs.
+    async with session_scope() as session:
+        result = await apply_due_prices(session, {"valid_from": valid_from.replace(tzinfo=None).isoformat()})
+    assert result == {"updated": 1}
+
+    response = await client.get(f"/api/v1/products/{product['id']}")
+    assert Decimal(response.json()["price"]) == Decimal("4.00")
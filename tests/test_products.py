@@ -0,0 +1,8 @@
+"""Product writes."""
+
+
+async def test_update_with_taken_sku_and_stock(client, catalogue):
+    first, second = catalogue["products"][:2]
+    response = await client.patch(f"/api/v1/products/{second['id']}", json={"sku": first["sku"], "quantity": 5})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Product with this SKU already exists"
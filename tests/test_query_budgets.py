@@ -0,0 +1,45 @@
+"""Statement budgets of the main read endpoints: a fixed count, whatever the page size (no N+1)."""
+
+
+async def test_get_order(client, orders, query_budget):
+    with query_budget(2):  # order, its lines (selectinload)
+        response = await client.get(f"/api/v1/orders/{orders['order_ids'][0]}")
+    assert response.status_code == 200
+    assert len(response.json()["order_products"]) == 3
+
+
+async def test_list_orders(client, orders, query_budget):
+    with query_budget(3):  # orders, their lines, their clients
+        response = await client.get("/api/v1/orders/", params={"client_id": orders["client"]["id"]})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+async def test_get_orders_by_ids(client, orders, query_budget):
+    with query_budget(2):  # orders by id = ANY(:ids), their lines
+        response = await client.get("/api/v1/orders/", params={"ids": orders["order_ids"]})
+    assert response.status_code == 200
+    assert [order["id"] for order in response.json()] == orders["order_ids"]
+
+
+async def test_client_order_history(client, orders, query_budget):
+    with query_budget(3):  # client, orders, their lines
+        response = await client.get(f"/api/v1/clients/{orders['client']['id']}/orders")
+    assert response.status_code == 200
+    assert [order["id"] for order in response.json()] == orders["order_ids"][::-1]
+
+
+async def test_get_product(client, catalogue, query_budget):
+    product_id = catalogue["products"][0]["id"]
+    with query_budget(2):  # product with its stock, category
+        response = await client.get(f"/api/v1/products/{product_id}")
+    assert response.status_code == 200
+    with query_budget(0):  # product cache
+        await client.get(f"/api/v1/products/{product_id}")
+
+
+async def test_list_products(client, catalogue, query_budget):
+    with query_budget(2):  # products with their stock, categories
+        response = await client.get("/api/v1/products/", params={"category_id": catalogue["category"]["id"]})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
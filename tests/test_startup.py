@@ -0,0 +1,23 @@
+"""Cold start budget: importing app.main in a fresh interpreter, like a new pod."""
+import os
+import statistics
+
+from benchmarks.startup import run_once
+
+RUNS = 3
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "2000"))
+
+
+def test_import_within_budget():
+    timings = [run_once(lifespan=False) for _ in range(RUNS)]
+    import_ms = statistics.median(timing["import_ms"] for timing, _ in timings)
+    modules = timings[-1][1]
+    slowest = sorted(modules.items(), key=lambda item: -item[1][0])[:10]
+    report = "\n".join(f"{self_ms:8.1f} ms  {name}" for name, (self_ms, _) in slowest)
+    assert import_ms <= BUDGET_MS, f"import app.main took {import_ms:.0f} ms (budget {BUDGET_MS:.0f} ms):\n{report}"
+
+
+def test_import_defers_the_driver():
+    # asyncpg loads with the first connection (engine, listener), not with the app.
+    _, modules = run_once(lifespan=False)
+    assert "asyncpg" not in modules
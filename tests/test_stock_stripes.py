@@ -0,0 +1,82 @@
+"""Stripe rebalancing plan: totals are kept and reserved units never move."""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def stock():
+    # Imported here: app modules need the DB_* settings, which conftest skips without.
+    from app.repositories import stock_repository
+
+    return stock_repository
+
+
+def _row(id: int, stripe: int, quantity: int, reserved: int) -> SimpleNamespace:
+    return SimpleNamespace(id=id, stripe=stripe, quantity=quantity, reserved=reserved)
+
+
+def _apply(stock, rows, stripes):
+    """Rows after the plan is written, and the ids it deletes."""
+    quantities, retired = {}, []
+    stock._plan_rebalance(rows, stripes, quantities, retired)
+    after = [_row(row.id, row.stripe, quantities.get(row.id, row.quantity), row.reserved)
+             for row in rows if row.id not in retired]
+    return after, retired
+
+
+def _check(rows, after, retired, stripes):
+    assert sum(row.quantity for row in after) == sum(row.quantity for row in rows)
+    before = {row.id: row for row in rows}
+    for row in after:
+        assert row.reserved == before[row.id].reserved
+        assert row.quantity >= row.reserved
+    assert all(before[id].stripe >= stripes and before[id].reserved == 0 for id in retired)
+    available = [row.quantity - row.reserved for row in after if row.stripe < stripes]
+    assert max(available) - min(available) <= 1
+    assert all(row.quantity == row.reserved for row in after if row.stripe >= stripes)
+
+
+@pytest.mark.parametrize(("units", "parts"), [(0, 1), (10, 3), (2, 5), (4096, 16), (7, 7)])
+def test_spread_keeps_the_total_and_evens_out(stock, units, parts):
+    shares = stock._spread(units, parts)
+    assert len(shares) == parts
+    assert sum(shares) == units
+    assert max(shares) - min(shares) <= 1
+
+
+def test_uneven_stripes_are_evened_out_around_reservations(stock):
+    rows = [_row(1, 0, 100, 30), _row(2, 1, 0, 0), _row(3, 2, 10, 10)]
+    after, retired = _apply(stock, rows, stripes=3)
+    assert retired == []
+    assert {row.id: row.quantity for row in after} == {1: 54, 2: 23, 3: 33}
+    _check(rows, after, retired, stripes=3)
+
+
+def test_shrinking_keeps_reserved_units_on_retired_stripes(stock):
+    rows = [_row(1, 0, 10, 0), _row(2, 1, 50, 5), _row(3, 2, 40, 0), _row(4, 3, 7, 7)]
+    after, retired = _apply(stock, rows, stripes=1)
+    # Stripe 2 holds nothing reserved: deleted. Stripes 1 and 3 keep exactly what is reserved on them.
+    assert retired == [3]
+    assert {row.id: row.quantity for row in after} == {1: 95, 2: 5, 4: 7}
+    _check(rows, after, retired, stripes=1)
+
+
+def test_balanced_stripes_are_left_alone(stock):
+    rows = [_row(1, 0, 10, 2), _row(2, 1, 9, 1)]
+    quantities, retired = {}, []
+    stock._plan_rebalance(rows, 2, quantities, retired)
+    assert (quantities, retired) == ({}, [])
+
+
+def test_random_plans_keep_totals_and_reservations(stock):
+    rng = random.Random(7)
+    for _ in range(500):
+        rows = []
+        for stripe in range(rng.randint(1, 8)):
+            reserved = rng.choice([0, 0, rng.randint(0, 50)])
+            rows.append(_row(stripe + 1, stripe, reserved + rng.randint(0, 200), reserved))
+        stripes = rng.randint(1, 8)
+        after, retired = _apply(stock, rows, stripes)
+        _check(rows, after, retired, stripes)